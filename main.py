@@ -9,7 +9,7 @@ import schedule
 import time
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -20,6 +20,9 @@ from src.collectors.rss_parser import RSSParser
 from src.generators.claude_generator import ClaudeGenerator
 from src.publishers.wordpress_client import WordPressClient
 
+# 週間の値動き（7日間の変化率・高値・安値）を記事に載せるのに必要な履歴の長さ（日）
+WEEKLY_HISTORY_MIN_DAYS = 6
+
 def setup_logging():
     """ログ設定"""
     logging.basicConfig(
@@ -40,13 +43,26 @@ def generate_weekly_summary():
         config = Config()
         db_manager = DatabaseManager(config.DB_PATH)
         api_client = CryptoAPIClient(config)
-        rss_parser = RSSParser(config)
+        rss_parser = RSSParser(config, db_manager)
         generator = ClaudeGenerator(config)
         wp_client = WordPressClient(config)
         
-        # ニュース収集
-        news_data = rss_parser.collect_weekly_news()
+        # 収集済みのニュースから週間の上位ストーリーを組み立てる（なければフィードから取得）
+        news_data = rss_parser.assemble_weekly_news() or rss_parser.collect_weekly_news()
         crypto_data = api_client.get_market_data()
+        db_manager.save_market_data(crypto_data)
+        
+        # 週間の値動きを市場データの履歴から付与（定期取得の履歴がほぼ1週間分ある通貨のみ）
+        history = db_manager.get_market_history([coin['symbol'] for coin in crypto_data], hours=7 * 24)
+        covered_since = (datetime.utcnow() - timedelta(days=WEEKLY_HISTORY_MIN_DAYS)).strftime('%Y-%m-%d %H:%M:%S')
+        for coin in crypto_data:
+            week = history.get(coin['symbol'])
+            if not week or week['points'] < 2 or week['start'] > covered_since:
+                continue
+            if not coin.get('price_change_percentage_7d'):
+                coin['price_change_percentage_7d'] = week['change_percentage']
+            coin['week_high'] = week['high']
+            coin['week_low'] = week['low']
         
         # 記事生成
         article = generator.generate_weekly_summary(news_data, crypto_data)
@@ -62,6 +78,57 @@ def generate_weekly_summary():
     except Exception as e:
         logger.error(f"週刊まとめ記事生成エラー: {e}")
 
+def collect_news():
+    """ニュース定期収集（差分のみ）"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        config = Config()
+        db_manager = DatabaseManager(config.DB_PATH)
+        rss_parser = RSSParser(config, db_manager)
+        
+        # 更新されたフィードのみ取得して保存
+        news_items = rss_parser.collect_latest_news(incremental=True)
+        saved_count = db_manager.save_news_data(news_items)
+        
+        logger.info(f"ニュース定期収集完了: 新規 {saved_count}件")
+        
+    except Exception as e:
+        logger.error(f"ニュース定期収集エラー: {e}")
+
+def collect_market_data():
+    """市場データ定期取得（週間の値動き・トレンド用の履歴を蓄積）"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        config = Config()
+        db_manager = DatabaseManager(config.DB_PATH)
+        api_client = CryptoAPIClient(config)
+        
+        crypto_data = api_client.get_market_data()
+        db_manager.save_market_data(crypto_data)
+        
+        logger.info(f"市場データ定期取得完了: {len(crypto_data)}通貨")
+        
+    except Exception as e:
+        logger.error(f"市場データ定期取得エラー: {e}")
+
+def cleanup_database():
+    """古いデータの削除（市場データは生データを短期間だけ残しロールアップを保持）"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        config = Config()
+        db_manager = DatabaseManager(config.DB_PATH)
+        db_manager.cleanup_old_data(
+            days=config.DATA_RETENTION_DAYS,
+            market_raw_hours=config.MARKET_RAW_RETENTION_HOURS,
+            archive_dir=config.ARCHIVE_DIR or None
+        )
+        
+    except Exception as e:
+        logger.error(f"データクリーンアップエラー: {e}")
+
 def generate_daily_news():
     """日次ニュース記事生成"""
     logger = logging.getLogger(__name__)
@@ -70,12 +137,12 @@ def generate_daily_news():
     try:
         config = Config()
         db_manager = DatabaseManager(config.DB_PATH)
-        rss_parser = RSSParser(config)
+        rss_parser = RSSParser(config, db_manager)
         generator = ClaudeGenerator(config)
         wp_client = WordPressClient(config)
         
-        # 最新ニュース収集
-        news_items = rss_parser.collect_latest_news()
+        # 最新ニュース収集（同一ストーリーは代表記事のみ）
+        news_items = rss_parser.select_canonical_stories(rss_parser.collect_latest_news())
         
         # 重要ニュースを選定して記事生成
         for news_item in news_items[:3]:  # 上位3つのニュース
@@ -90,16 +157,36 @@ def generate_daily_news():
     except Exception as e:
         logger.error(f"日次ニュース記事生成エラー: {e}")
 
+def enable_incremental_vacuum():
+    """既存のデータベースを auto_vacuum = INCREMENTAL に切り替える（一度だけ手動で実行）"""
+    logger = logging.getLogger(__name__)
+    
+    config = Config()
+    db_manager = DatabaseManager(config.DB_PATH)
+    if db_manager.enable_incremental_vacuum():
+        logger.info("auto_vacuum を INCREMENTAL に切り替えました")
+    else:
+        logger.info("auto_vacuum はすでに INCREMENTAL です")
+
 def main():
     """メイン処理"""
     setup_logging()
     logger = logging.getLogger(__name__)
     
+    if "--enable-incremental-vacuum" in sys.argv[1:]:
+        # スケジューラーは起動せず、保守作業のみ行う
+        enable_incremental_vacuum()
+        return
+    
     logger.info("仮想通貨メディア自動記事生成システム開始")
     
     # スケジュール設定
+    config = Config()
+    schedule.every(config.NEWS_POLL_INTERVAL_MINUTES).minutes.do(collect_news)
+    schedule.every(config.MARKET_SNAPSHOT_INTERVAL_MINUTES).minutes.do(collect_market_data)
     schedule.every().monday.at("09:00").do(generate_weekly_summary)
     schedule.every().day.at("10:00").do(generate_daily_news)
+    schedule.every().day.at("03:00").do(cleanup_database)
     
     # スケジューラー実行
     while True:
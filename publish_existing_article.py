@@ -14,6 +14,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from src.utils.config import Config
 from src.generators.image_generator import ImageGenerator
 from src.publishers.wordpress_client import WordPressClient
+from src.database.db_manager import DatabaseManager
 
 def setup_logging():
     """ログ設定"""
@@ -172,16 +173,9 @@ def publish_existing_article():
                 'importance_score': article_data.get('importance_score')
             }
             
-            try:
-                with open('publish_history.json', 'r', encoding='utf-8') as f:
-                    publish_history = json.load(f)
-            except:
-                publish_history = []
-            
-            publish_history.append(history)
-            
-            with open('publish_history.json', 'w', encoding='utf-8') as f:
-                json.dump(publish_history, f, ensure_ascii=False, indent=2)
+            # 履歴は追記のみ（既存の履歴を読み直さない）
+            db_manager = DatabaseManager(config.DB_PATH)
+            db_manager.save_artifact("publish_history", history, name=history['title'])
             
         else:
             logger.error("WordPress投稿失敗")
@@ -8,23 +8,38 @@ import urllib.request
 import base64
 import glob
 import sys
+import os
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config import Config
+
 # WordPress設定
 WP_URL = "https://crypto-dictionary.net"
 WP_USERNAME = "MaRu"
 WP_PASSWORD = "3sMS 8JWd xS8k OkOZ qhX2 3u4z"
 
-def publish_article_to_wordpress(status='draft'):
-    """生成記事をWordPressに投稿"""
+def load_latest_article():
+    """最新の記事を読み込み（データベースの selected_article を優先し、なければ記事ファイル）"""
+    try:
+        artifact = DatabaseManager(Config().DB_PATH).get_latest_artifact("selected_article")
+    except Exception as e:
+        print(f"⚠️ データベース読み込みエラー: {e}")
+        artifact = None
+    
+    if artifact:
+        print(f"📄 記事を読み込み: selected_article #{artifact['id']} ({artifact['created_at']})")
+        return artifact['payload']
     
-    # 最新の記事ファイルを探す（複数パターン対応）
+    # 以前の記事ファイルを探す（複数パターン対応）
     article_files = glob.glob("selected_article_*.json") + glob.glob("test_article_*.json")
     
     if not article_files:
-        print("❌ 記事ファイルが見つかりません")
-        print("先に記事を生成してください")
-        return
+        print("❌ 記事が見つかりません")
+        print("先に run_selected_article_generator.py で記事を生成してください")
+        return None
     
     # 最新の記事を読み込み（selected_article を優先）
     selected_files = [f for f in article_files if f.startswith('selected_article_')]
@@ -33,11 +48,20 @@ def publish_article_to_wordpress(status='draft'):
     else:
         latest_file = max(article_files, key=lambda x: x)
     
+    with open(latest_file, 'r', encoding='utf-8') as f:
+        article = json.load(f)
+    
+    print(f"📄 記事を読み込み: {latest_file}")
+    return article
+
+def publish_article_to_wordpress(status='draft'):
+    """生成記事をWordPressに投稿"""
+    
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            article = json.load(f)
+        article = load_latest_article()
+        if not article:
+            return
         
-        print(f"📄 記事を読み込み: {latest_file}")
         print(f"📝 タイトル: {article['title']}")
         print(f"📊 文字数: {article['word_count']}字")
         if 'focus_keyword' in article:
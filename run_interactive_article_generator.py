@@ -3,29 +3,32 @@
 対話型記事生成システム（親しみやすい日本語版）
 """
 
-import json
 import sys
-import glob
 import os
 from datetime import datetime
 import re
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config import Config
+
+# 段階間の受け渡しデータを保存するデータベース（main.py と同じく .env の DB_PATH）
+DB_PATH = Config().DB_PATH
+
 def load_latest_news():
     """最新のニュースデータを読み込み"""
-    news_files = glob.glob("collected_news_*.json")
-    
-    if not news_files:
-        print("❌ ニュースデータが見つかりません")
-        print("まず run_news_collection.py を実行してください")
-        return None
-    
-    latest_file = max(news_files, key=os.path.getctime)
-    
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        artifact = DatabaseManager(DB_PATH).get_latest_artifact("collected_news")
         
-        print(f"📰 ニュースデータを読み込みました: {latest_file}")
+        if not artifact:
+            print("❌ ニュースデータが見つかりません")
+            print("まず run_news_collection.py を実行してください")
+            return None
+        
+        data = artifact['payload']
+        
+        print(f"📰 ニュースデータを読み込みました: collected_news #{artifact['id']} ({artifact['created_at']})")
         print(f"📊 合計{data['total_count']}件のニュースがあります\n")
         
         return data['news_items']
@@ -270,19 +273,15 @@ def generate_friendly_article(news_item, japanese_title):
     return article
 
 def save_article(article):
-    """記事をJSONファイルに保存"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"generated_article_{article['article_type']}_{timestamp}.json"
+    """記事をデータベースに保存"""
+    artifact_id = DatabaseManager(DB_PATH).save_artifact("generated_article", article, name=article.get('title'))
     
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(article, f, ensure_ascii=False, indent=2)
-        
-        print(f"💾 記事を保存しました: {filename}")
-        return filename
-    except Exception as e:
-        print(f"❌ 記事保存エラー: {e}")
+    if artifact_id is None:
+        print("❌ 記事保存エラー")
         return None
+        
+    print(f"💾 記事を保存しました: generated_article #{artifact_id}")
+    return artifact_id
 
 def main():
     """メイン実行"""
@@ -4,9 +4,17 @@
 """
 
 import sys
-import json
+import os
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config import Config
+
+# 段階間の受け渡しデータを保存するデータベース（main.py と同じく .env の DB_PATH）
+DB_PATH = Config().DB_PATH
+
 # 最小限のRSSパーサー（依存関係なし）
 try:
     import urllib.request
@@ -199,23 +207,19 @@ def collect_crypto_news():
     return all_news
 
 def save_news_data(news_items):
-    """ニュースデータをJSONファイルに保存"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"collected_news_{timestamp}.json"
+    """ニュースデータをデータベースに保存"""
+    artifact_id = DatabaseManager(DB_PATH).save_artifact("collected_news", {
+        'timestamp': datetime.now().isoformat(),
+        'total_count': len(news_items),
+        'news_items': news_items
+    })
     
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': datetime.now().isoformat(),
-                'total_count': len(news_items),
-                'news_items': news_items
-            }, f, ensure_ascii=False, indent=2)
-        
-        print(f"💾 ニュースデータを保存: {filename}")
-        return filename
-    except Exception as e:
-        print(f"❌ ファイル保存エラー: {e}")
+    if artifact_id is None:
+        print("❌ ニュースデータ保存エラー")
         return None
+        
+    print(f"💾 ニュースデータを保存: collected_news #{artifact_id}")
+    return artifact_id
 
 if __name__ == "__main__":
     try:
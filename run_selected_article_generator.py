@@ -3,29 +3,30 @@
 選択された候補で記事を生成
 """
 
-import json
 import sys
-import glob
 import os
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config import Config
+
+# 段階間の受け渡しデータを保存するデータベース（main.py と同じく .env の DB_PATH）
+DB_PATH = Config().DB_PATH
+
 def load_latest_candidates():
     """最新の候補データを読み込み"""
-    candidate_files = glob.glob("article_candidates_*.json")
-    
-    if not candidate_files:
-        print("❌ 候補データが見つかりません")
-        print("まず show_article_candidates.py を実行してください")
-        return None
-    
-    latest_file = max(candidate_files, key=os.path.getctime)
-    
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        artifact = DatabaseManager(DB_PATH).get_latest_artifact("article_candidates")
+        
+        if not artifact:
+            print("❌ 候補データが見つかりません")
+            print("まず show_article_candidates.py を実行してください")
+            return None
         
-        print(f"📄 候補データを読み込みました: {latest_file}")
-        return data['candidates']
+        print(f"📄 候補データを読み込みました: article_candidates #{artifact['id']} ({artifact['created_at']})")
+        return artifact['payload']['candidates']
     except Exception as e:
         print(f"❌ 候補データ読み込みエラー: {e}")
         return None
@@ -452,19 +453,15 @@ def determine_main_category(categories):
     return 'ニュース解説'
 
 def save_article(article):
-    """記事をJSONファイルに保存"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"selected_article_{timestamp}.json"
+    """記事をデータベースに保存"""
+    artifact_id = DatabaseManager(DB_PATH).save_artifact("selected_article", article, name=article.get('title'))
     
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(article, f, ensure_ascii=False, indent=2)
-        
-        print(f"💾 記事を保存しました: {filename}")
-        return filename
-    except Exception as e:
-        print(f"❌ 記事保存エラー: {e}")
+    if artifact_id is None:
+        print("❌ 記事保存エラー")
         return None
+        
+    print(f"💾 記事を保存しました: selected_article #{artifact_id}")
+    return artifact_id
 
 def main():
     """メイン実行"""
@@ -7,9 +7,16 @@ import json
 import sys
 import urllib.request
 import base64
-import glob
 import os
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config import Config
+
+# 段階間の受け渡しデータを保存するデータベース（main.py と同じく .env の DB_PATH）
+DB_PATH = Config().DB_PATH
+
 # WordPress設定
 WP_URL = "https://crypto-dictionary.net"
 WP_USERNAME = "MaRu"
@@ -17,23 +24,17 @@ WP_PASSWORD = "3sMS 8JWd xS8k OkOZ qhX2 3u4z"
 
 def load_latest_article():
     """最新の記事データを読み込み"""
-    
-    # generated_article_*.jsonファイルを探す
-    article_files = glob.glob("generated_article_*.json")
-    
-    if not article_files:
-        print("❌ 生成された記事が見つかりません")
-        print("まず run_article_generation.py を実行してください")
-        return None
-    
-    # 最新のファイルを取得
-    latest_file = max(article_files, key=os.path.getctime)
-    
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            article = json.load(f)
+        artifact = DatabaseManager(DB_PATH).get_latest_artifact("generated_article")
+        
+        if not artifact:
+            print("❌ 生成された記事が見つかりません")
+            print("まず run_article_generation.py を実行してください")
+            return None
         
-        print(f"📄 記事データを読み込み: {latest_file}")
+        article = artifact['payload']
+        
+        print(f"📄 記事データを読み込み: generated_article #{artifact['id']}")
         print(f"📝 タイトル: {article['title']}")
         print(f"📊 文字数: {article['word_count']}字")
         print(f"🏷️ カテゴリ: {article['category']}")
@@ -159,30 +160,29 @@ def publish_article_to_wordpress(article):
         print(f"❌ 投稿エラー: {e}")
         return None
 
-def list_available_articles():
-    """利用可能な記事一覧を表示"""
-    article_files = glob.glob("generated_article_*.json")
+def list_available_articles(limit=20):
+    """利用可能な記事一覧を表示（新しい順に limit 件）"""
+    try:
+        artifacts = list(DatabaseManager(DB_PATH).iter_artifacts("generated_article", limit=limit))
+    except Exception as e:
+        print(f"❌ 記事一覧取得エラー: {e}")
+        return []
     
-    if not article_files:
+    if not artifacts:
         print("❌ 生成された記事がありません")
         return []
     
     print("\n📄 利用可能な記事:")
     articles = []
     
-    for i, file_path in enumerate(sorted(article_files, key=os.path.getctime, reverse=True), 1):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                article = json.load(f)
+    for i, artifact in enumerate(artifacts, 1):
+        article = artifact['payload']
             
-            print(f"{i}. {article['title'][:60]}{'...' if len(article['title']) > 60 else ''}")
-            print(f"   タイプ: {article['article_type']} | 文字数: {article['word_count']}字")
-            print(f"   ファイル: {file_path}")
+        print(f"{i}. {article['title'][:60]}{'...' if len(article['title']) > 60 else ''}")
+        print(f"   タイプ: {article['article_type']} | 文字数: {article['word_count']}字")
+        print(f"   ID: generated_article #{artifact['id']} ({artifact['created_at']})")
             
-            articles.append((file_path, article))
-            
-        except Exception as e:
-            print(f"   ❌ エラー: {e}")
+        articles.append((artifact['id'], article))
     
     return articles
 
@@ -199,7 +199,7 @@ def main():
         return
     
     # 最新の記事を自動選択
-    latest_file, latest_article = articles[0]
+    latest_id, latest_article = articles[0]
     
     print(f"\n📝 最新の記事を投稿します:")
     print(f"タイトル: {latest_article['title']}")
@@ -236,25 +236,12 @@ def save_publish_history(article, wp_result):
         'status': wp_result.get('status')
     }
     
-    try:
-        # 既存の履歴を読み込み
-        try:
-            with open('publish_history.json', 'r', encoding='utf-8') as f:
-                all_history = json.load(f)
-        except FileNotFoundError:
-            all_history = []
-        
-        # 新しい履歴を追加
-        all_history.append(history)
-        
-        # 履歴を保存
-        with open('publish_history.json', 'w', encoding='utf-8') as f:
-            json.dump(all_history, f, ensure_ascii=False, indent=2)
-        
-        print(f"📋 投稿履歴を保存しました")
+    # 履歴は追記のみ（既存の履歴を読み直さない）
+    if DatabaseManager(DB_PATH).save_artifact("publish_history", history, name=article['title']) is None:
+        print("⚠️ 履歴保存エラー")
+        return
         
-    except Exception as e:
-        print(f"⚠️ 履歴保存エラー: {e}")
+    print(f"📋 投稿履歴を保存しました")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
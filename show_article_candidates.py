@@ -3,29 +3,32 @@
 記事候補提示システム（選択式）
 """
 
-import json
 import sys
-import glob
 import os
 from datetime import datetime
 import re
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config import Config
+
+# 段階間の受け渡しデータを保存するデータベース（main.py と同じく .env の DB_PATH）
+DB_PATH = Config().DB_PATH
+
 def load_latest_news():
     """最新のニュースデータを読み込み"""
-    news_files = glob.glob("collected_news_*.json")
-    
-    if not news_files:
-        print("❌ ニュースデータが見つかりません")
-        print("まず run_news_collection.py を実行してください")
-        return None
-    
-    latest_file = max(news_files, key=os.path.getctime)
-    
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        artifact = DatabaseManager(DB_PATH).get_latest_artifact("collected_news")
         
-        print(f"📰 ニュースデータを読み込みました: {latest_file}")
+        if not artifact:
+            print("❌ ニュースデータが見つかりません")
+            print("まず run_news_collection.py を実行してください")
+            return None
+        
+        data = artifact['payload']
+        
+        print(f"📰 ニュースデータを読み込みました: collected_news #{artifact['id']} ({artifact['created_at']})")
         print(f"📊 合計{data['total_count']}件のニュースがあります\n")
         
         return data['news_items']
@@ -337,22 +340,18 @@ def display_article_candidates(news_items, limit=10):
 
 def save_selected_candidates(candidates):
     """候補データを保存"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"article_candidates_{timestamp}.json"
-    
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': datetime.now().isoformat(),
-                'total_candidates': len(candidates),
-                'candidates': candidates
-            }, f, ensure_ascii=False, indent=2)
-        
-        print(f"\n💾 候補データを保存しました: {filename}")
-        return filename
-    except Exception as e:
-        print(f"❌ 候補データ保存エラー: {e}")
+    artifact_id = DatabaseManager(DB_PATH).save_artifact("article_candidates", {
+        'timestamp': datetime.now().isoformat(),
+        'total_candidates': len(candidates),
+        'candidates': candidates
+    })
+    
+    if artifact_id is None:
+        print("❌ 候補データ保存エラー")
         return None
+        
+    print(f"\n💾 候補データを保存しました: article_candidates #{artifact_id}")
+    return artifact_id
 
 def main():
     """メイン実行"""
@@ -4,11 +4,29 @@
 
 import requests
 import logging
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
 
+from src.utils.rate_limiter import get_rate_limiter, parse_retry_after
+from src.utils.response_cache import get_response_cache
+
+# 429 のときの再試行回数と、Retry-After がない場合の待ち時間（秒）
+RATE_LIMIT_RETRIES = 2
+DEFAULT_RETRY_AFTER = 60
+
+# エンドポイントごとのキャッシュ (有効期間, 期限切れ後も古い値を返して裏で更新する期間)（秒）
+CACHE_TTLS = {
+    "coingecko_markets": (60, 240),
+    "coingecko_trending": (600, 1800),
+    # 恐怖貪欲指数は1日1回の更新。time_until_update があればそれまで有効
+    "fear_greed": (3600, 3600)
+}
+
 class CryptoAPIClient:
     """仮想通貨API統合クライアント"""
     
@@ -27,32 +45,62 @@ class CryptoAPIClient:
         self.coinmarketcap_base_url = config.COINMARKETCAP_BASE_URL
         self.cryptocompare_base_url = config.CRYPTOCOMPARE_BASE_URL
         
-        # レート制限管理
-        self.last_request_time = {}
-        self.rate_limit_delay = 60 / config.API_RATE_LIMIT  # requests per minute to seconds per request
+        # レート制限管理（APIごとのトークンバケット。状態はデータベースで全プロセスと共有）
+        self.rate_limiter = get_rate_limiter(config)
         
         # セッション設定
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'CryptoMediaSystem/1.0'
         })
+        
+        # レスポンスキャッシュ（プロセス内で共有。RESPONSE_CACHE_DIR があればディスクにも保存）
+        self.cache = get_response_cache(config.RESPONSE_CACHE_DIR or None)
+        
+        # 直近の get_market_data でのAPIごとの結果（"ok" / "empty" / "timeout" / "error: ..."）
+        self.last_provider_status: Dict[str, str] = {}
+        
+        # get_market_data のワーカーごとの取得期限（time.monotonic() の値）
+        self._deadline = threading.local()
+    
+    def _remaining_time(self) -> Optional[float]:
+        """取得期限までの残り秒数（期限なしの場合は None）"""
+        deadline_at = getattr(self._deadline, "at", None)
+        if deadline_at is None:
+            return None
+        return deadline_at - time.monotonic()
+    
+    def _rate_limit_check(self, api_name: str) -> bool:
+        """
+        レート制限チェック（全プロセス共有のトークンバケットから取得できるまで待つ）
+        
+        取得期限がある場合は期限までしか待たない。共有ストアのデータベースエラー時は
+        共有の制限なしで続行する。
+        
+        Returns:
+            bool: リクエストしてよいかどうか
+        """
+        try:
+            return self.rate_limiter.acquire(api_name, timeout=self._remaining_time())
+        except sqlite3.Error as e:
+            self.logger.warning(f"{api_name} のレート制限を共有できません（制限なしで続行）: {e}")
+            return True
     
-    def _rate_limit_check(self, api_name: str):
-        """レート制限チェック"""
-        current_time = time.time()
-        if api_name in self.last_request_time:
-            time_since_last = current_time - self.last_request_time[api_name]
-            if time_since_last < self.rate_limit_delay:
-                sleep_time = self.rate_limit_delay - time_since_last
-                time.sleep(sleep_time)
-        
-        self.last_request_time[api_name] = current_time
+    def _rate_limit_block(self, api_name: str, seconds: float):
+        """429 の Retry-After の間、全プロセスでAPIの呼び出しを止める（データベースエラーは無視）"""
+        try:
+            self.rate_limiter.block(api_name, seconds)
+        except sqlite3.Error as e:
+            self.logger.warning(f"{api_name} の待機を共有できません: {e}")
     
     def _make_request(self, url: str, params: Optional[Dict] = None, 
                      headers: Optional[Dict] = None, api_name: str = "unknown") -> Optional[Dict]:
         """
         APIリクエストを実行
         
+        429 の場合は Retry-After の間そのAPIへのリクエストを止め、RATE_LIMIT_RETRIES 回まで再試行する。
+        get_market_data の取得期限までに Retry-After が明けない場合は再試行せずに諦める。
+        
         Args:
             url: リクエストURL
             params: パラメータ
@@ -62,38 +110,55 @@ class CryptoAPIClient:
         Returns:
             Dict: レスポンスデータ
         """
-        self._rate_limit_check(api_name)
+        request_headers = self.session.headers.copy()
+        if headers:
+            request_headers.update(headers)
         
-        try:
-            start_time = time.time()
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if not self._rate_limit_check(api_name):
+                self.logger.warning(f"{api_name} API 取得期限までにレート制限が解除されないため中止")
+                return None
             
-            request_headers = self.session.headers.copy()
-            if headers:
-                request_headers.update(headers)
+            try:
+                start_time = time.time()
             
-            response = self.session.get(url, params=params, headers=request_headers, timeout=30)
-            response_time = time.time() - start_time
+                response = self.session.get(url, params=params, headers=request_headers, timeout=30)
+                response_time = time.time() - start_time
             
-            # API使用状況をログに記録
-            self.logger.debug(f"{api_name} API リクエスト: {url} - {response.status_code} - {response_time:.2f}s")
+                # API使用状況をログに記録
+                self.logger.debug(f"{api_name} API リクエスト: {url} - {response.status_code} - {response_time:.2f}s")
             
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
-                self.logger.warning(f"Rate limit exceeded for {api_name}")
-                time.sleep(60)  # 1分待機
-                return None
-            else:
-                self.logger.error(f"{api_name} API エラー: {response.status_code} - {response.text}")
+                if response.status_code == 200:
+                    return response.json()
+                elif response.status_code == 429:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is None:
+                        retry_after = DEFAULT_RETRY_AFTER
+                    self._rate_limit_block(api_name, retry_after)
+                    remaining = self._remaining_time()
+                    if remaining is not None and remaining < retry_after:
+                        self.logger.warning(
+                            f"Rate limit exceeded for {api_name}（Retry-After {retry_after:.0f}秒が取得期限を超えるため中止）"
+                        )
+                        return None
+                    if attempt < RATE_LIMIT_RETRIES:
+                        self.logger.warning(
+                            f"Rate limit exceeded for {api_name}（{retry_after:.0f}秒後に再試行 {attempt + 1}/{RATE_LIMIT_RETRIES}）"
+                        )
+                else:
+                    self.logger.error(f"{api_name} API エラー: {response.status_code} - {response.text}")
+                    return None
+            
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"{api_name} API リクエスト例外: {e}")
                 return None
                 
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"{api_name} API リクエスト例外: {e}")
-            return None
+        self.logger.error(f"{api_name} API レート制限のため再試行を中止")
+        return None
     
     def get_coingecko_market_data(self, vs_currency: str = "usd", limit: int = 100) -> List[Dict[str, Any]]:
         """
-        CoinGeckoから市場データを取得
+        CoinGeckoから市場データを取得（CACHE_TTLS["coingecko_markets"] の間キャッシュ）
         
         Args:
             vs_currency: 比較通貨
@@ -102,6 +167,15 @@ class CryptoAPIClient:
         Returns:
             List[Dict]: 市場データ
         """
+        ttl, stale_ttl = CACHE_TTLS["coingecko_markets"]
+        return self.cache.get_or_fetch(
+            f"coingecko_markets:{vs_currency}:{limit}",
+            lambda: self._fetch_coingecko_market_data(vs_currency, limit),
+            ttl, stale_ttl
+        )
+    
+    def _fetch_coingecko_market_data(self, vs_currency: str, limit: int) -> List[Dict[str, Any]]:
+        """CoinGeckoから市場データを取得（キャッシュなし）"""
         url = f"{self.coingecko_base_url}/coins/markets"
         params = {
             "vs_currency": vs_currency,
@@ -241,54 +315,88 @@ class CryptoAPIClient:
         
         return []
     
-    def get_market_data(self) -> List[Dict[str, Any]]:
+    def get_market_data(self, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
         """
-        全てのAPIから市場データを取得
+        全てのAPIから市場データを並列に取得
+        
+        期限までに応答したAPIの結果だけを統合する。期限切れ・失敗したAPIは
+        ログに出し、last_provider_status に記録する。
+        
+        Args:
+            deadline: 全体の待ち時間の上限（秒、省略時は MARKET_DATA_DEADLINE）
         
         Returns:
             List[Dict]: 統合された市場データ
         """
-        all_market_data = []
-        
-        # CoinGeckoデータを取得
-        try:
-            coingecko_data = self.get_coingecko_market_data()
-            all_market_data.extend(coingecko_data)
-        except Exception as e:
-            self.logger.error(f"CoinGeckoデータ取得エラー: {e}")
+        if deadline is None:
+            deadline = self.config.MARKET_DATA_DEADLINE
+        
+        # 統合時の優先順（同じ通貨は先のAPIのデータを残す）
+        providers = [
+            ("coingecko", self.get_coingecko_market_data),
+            ("coinmarketcap", self.get_coinmarketcap_data),
+            ("cryptocompare", self.get_cryptocompare_data)
+        ]
+        
+        deadline_at = time.monotonic() + deadline
+        
+        def run(fetch):
+            # 429 の待ちやレート制限の待ちを取得期限までに抑える
+            self._deadline.at = deadline_at
+            try:
+                return fetch()
+            finally:
+                self._deadline.at = None
+        
+        executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="market-data")
+        futures = {executor.submit(run, fetch): name for name, fetch in providers}
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        status: Dict[str, str] = {}
         
-        # CoinMarketCapデータを取得
         try:
-            coinmarketcap_data = self.get_coinmarketcap_data()
-            all_market_data.extend(coinmarketcap_data)
-        except Exception as e:
-            self.logger.error(f"CoinMarketCapデータ取得エラー: {e}")
-        
-        # CryptoCompareデータを取得
-        try:
-            cryptocompare_data = self.get_cryptocompare_data()
-            all_market_data.extend(cryptocompare_data)
-        except Exception as e:
-            self.logger.error(f"CryptoCompareデータ取得エラー: {e}")
-        
-        # 重複を削除（同じ通貨の最新データを保持）
+            done, pending = wait(futures, timeout=deadline)
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                    status[name] = "ok" if results[name] else "empty"
+                except Exception as e:
+                    self.logger.error(f"{name}データ取得エラー: {e}")
+                    status[name] = f"error: {e}"
+        
+            for future in pending:
+                status[futures[future]] = "timeout"
+            if pending:
+                timed_out = sorted(futures[future] for future in pending)
+                self.logger.warning(f"取得期限 {deadline}秒 を超過したAPIをスキップ: {timed_out}")
+        finally:
+            # 期限切れのリクエストは待たない（各リクエストのタイムアウトで終了する）
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self.last_provider_status = status = {name: status[name] for name, _ in providers}
+        
+        # 重複を削除（同じ通貨は優先順の先のAPIのデータを保持）
         unique_data = {}
-        for item in all_market_data:
-            symbol = item["symbol"]
-            if symbol not in unique_data or item["source"] == "coingecko":  # CoinGeckoを優先
-                unique_data[symbol] = item
+        for name, _ in providers:
+            for item in results.get(name, []):
+                unique_data.setdefault(item["symbol"], item)
         
         result = list(unique_data.values())
-        self.logger.info(f"統合市場データ {len(result)}件を取得")
+        self.logger.info(f"統合市場データ {len(result)}件を取得（{status}）")
         return result
     
     def get_trending_coins(self) -> List[Dict[str, Any]]:
         """
-        トレンド通貨を取得
+        トレンド通貨を取得（CACHE_TTLS["coingecko_trending"] の間キャッシュ）
         
         Returns:
             List[Dict]: トレンド通貨データ
         """
+        ttl, stale_ttl = CACHE_TTLS["coingecko_trending"]
+        return self.cache.get_or_fetch("coingecko_trending", self._fetch_trending_coins, ttl, stale_ttl)
+    
+    def _fetch_trending_coins(self) -> List[Dict[str, Any]]:
+        """トレンド通貨を取得（キャッシュなし）"""
         url = f"{self.coingecko_base_url}/search/trending"
         
         headers = {}
@@ -318,11 +426,21 @@ class CryptoAPIClient:
     
     def get_fear_greed_index(self) -> Optional[Dict[str, Any]]:
         """
-        恐怖貪欲指数を取得
+        恐怖貪欲指数を取得（次の更新まで、不明なら CACHE_TTLS["fear_greed"] の間キャッシュ）
         
         Returns:
             Dict: 恐怖貪欲指数データ
         """
+        ttl, stale_ttl = CACHE_TTLS["fear_greed"]
+        
+        def until_update(index: Dict[str, Any]) -> float:
+            seconds = str(index.get("time_until_update") or "")
+            return float(seconds) if seconds.isdigit() and int(seconds) > 0 else ttl
+        
+        return self.cache.get_or_fetch("fear_greed", self._fetch_fear_greed_index, until_update, stale_ttl)
+    
+    def _fetch_fear_greed_index(self) -> Optional[Dict[str, Any]]:
+        """恐怖貪欲指数を取得（キャッシュなし）"""
         try:
             # Alternative.meのFear & Greed Index API（無料）
             url = "https://api.alternative.me/fng/"
@@ -0,0 +1,198 @@
+"""
+記事本文抽出モジュール
+"""
+
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional
+
+from src.collectors.host_throttle import HostThrottle
+
+# 記事コンテナの候補（優先順）。("tag", 名前) または ("class", クラス名)
+CONTENT_SELECTORS = [
+    ("tag", "article"),
+    ("class", "article-content"),
+    ("class", "post-content"),
+    ("class", "entry-content"),
+    ("class", "content"),
+    ("tag", "main")
+]
+
+# テキストとして扱わない要素
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+# 抽出する最大文字数
+MAX_CONTENT_LENGTH = 1000
+
+def _selector_ranks(element) -> List[int]:
+    """要素が一致するセレクタの優先順位を返す"""
+    tag = element.tag
+    classes = (element.get("class") or "").split()
+    ranks = []
+    for rank, (kind, value) in enumerate(CONTENT_SELECTORS):
+        if (kind == "tag" and tag == value) or (kind == "class" and value in classes):
+            ranks.append(rank)
+    return ranks
+
+def _collect_text(element, parts: List[str]):
+    """script等を除いた要素内のテキストを収集"""
+    if not isinstance(element.tag, str) or element.tag in SKIP_TAGS:
+        return
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+def _element_text(element) -> str:
+    """BeautifulSoupの get_text(strip=True) 相当のテキストを返す"""
+    parts = []
+    _collect_text(element, parts)
+    return "".join(part.strip() for part in parts if part.strip())
+
+class ContentExtractor:
+    """記事ページから本文を抽出するクラス"""
+    
+    def __init__(self, http_fetcher, max_workers: int = 16,
+                 per_domain_concurrency: int = 2, domain_delay: float = 0.5,
+                 deadline: float = 120.0):
+        """
+        本文抽出クラスを初期化
+        
+        Args:
+            http_fetcher: HTTPFetcher インスタンス
+            max_workers: 並列ワーカー数
+            per_domain_concurrency: ドメインごとの最大同時接続数
+            domain_delay: 同一ドメインへのリクエスト間隔（秒）
+            deadline: 一括抽出全体の制限時間（秒）
+        """
+        self.http_fetcher = http_fetcher
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.domain_throttle = HostThrottle(
+            max_concurrency=per_domain_concurrency,
+            min_interval=domain_delay
+        )
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def extract_text(html: bytes) -> str:
+        """
+        HTMLから記事本文を抽出
+        
+        lxmlでストリーム解析し、最優先の article 要素が閉じた時点で
+        残りの文書は解析しない。
+        
+        Args:
+            html: HTMLのバイト列
+        
+        Returns:
+            str: 抽出されたコンテンツ（最大1000文字）
+        """
+        from lxml import etree
+        
+        candidates: Dict[int, Any] = {}
+        paragraphs: List[str] = []
+        content = ""
+        
+        try:
+            for event, element in etree.iterparse(io.BytesIO(html), events=("start", "end"),
+                                                  html=True, recover=True, no_network=True):
+                if not isinstance(element.tag, str):
+                    continue
+                
+                if event == "start":
+                    for rank in _selector_ranks(element):
+                        candidates.setdefault(rank, element)
+                    continue
+                
+                if element is candidates.get(0):
+                    # article 要素が見つかった時点で解析を打ち切る
+                    content = _element_text(element)
+                    break
+                
+                if element.tag == "p" and len(paragraphs) < 5:
+                    paragraphs.append(_element_text(element))
+        except etree.XMLSyntaxError:
+            # 空文書などは取得できた範囲で判定する
+            pass
+        
+        if not content and candidates:
+            # 最も優先度の高いセレクタに最初に一致した要素を使う
+            content = _element_text(candidates[min(candidates)])
+        
+        if not content:
+            # フォールバック: pタグから内容を抽出
+            content = " ".join(paragraphs)
+        
+        return content[:MAX_CONTENT_LENGTH]
+    
+    def extract(self, url: str) -> str:
+        """
+        URLから記事内容を抽出
+        
+        Args:
+            url: 記事URL
+        
+        Returns:
+            str: 抽出されたコンテンツ（失敗時は空文字）
+        """
+        try:
+            with self.domain_throttle.slot(url):
+                response = self.http_fetcher.fetch(url)
+            
+            if response['status_code'] == 200:
+                return self.extract_text(response['content'])
+        
+        except Exception as e:
+            self.logger.warning(f"コンテンツ抽出エラー ({url}): {e}")
+        
+        return ""
+    
+    def extract_many(self, urls: List[str]) -> Dict[str, str]:
+        """
+        複数URLの記事内容を並列に抽出
+        
+        制限時間内に終わらなかったURLは結果に含めない。
+        
+        Args:
+            urls: 記事URLのリスト
+        
+        Returns:
+            Dict[str, str]: URL → 抽出されたコンテンツ
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(unique_urls))),
+            thread_name_prefix="article-extract"
+        )
+        futures = {executor.submit(self.extract, url): url for url in unique_urls}
+        pending = set(futures)
+        deadline = time.monotonic() + self.deadline
+        results: Dict[str, str] = {}
+        
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    content = future.result()
+                    if content:
+                        results[futures[future]] = content
+            
+            if pending:
+                self.logger.warning(f"本文抽出の制限時間を超過: {len(pending)}件をスキップ")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self.logger.info(f"本文抽出完了: {len(results)}/{len(unique_urls)}件")
+        return results
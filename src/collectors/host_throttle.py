@@ -0,0 +1,74 @@
+"""
+ホスト別アクセス制御モジュール
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlparse
+
+class HostThrottle:
+    """ホスト単位の同時接続数とリクエスト間隔を制御するクラス"""
+    
+    def __init__(self, max_concurrency: int = 1, min_interval: float = 1.0):
+        """
+        ホストスロットルを初期化
+        
+        Args:
+            max_concurrency: ホストごとの最大同時接続数
+            min_interval: 同一ホストへのリクエスト間隔（秒）
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = max(0.0, min_interval)
+        
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._next_allowed: Dict[str, float] = {}
+    
+    @staticmethod
+    def host_of(url: str) -> str:
+        """
+        URLからホスト名を取得
+        
+        Args:
+            url: 対象URL
+        
+        Returns:
+            str: ホスト名（小文字）
+        """
+        return (urlparse(url).hostname or "").lower()
+    
+    def _semaphore_for(self, host: str) -> threading.Semaphore:
+        """ホスト用のセマフォを取得（なければ作成）"""
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.max_concurrency)
+                self._semaphores[host] = semaphore
+            return semaphore
+    
+    def _reserve_start_time(self, host: str) -> float:
+        """次にリクエストを開始してよい時刻を予約"""
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = start_at + self.min_interval
+            return start_at
+    
+    @contextmanager
+    def slot(self, url: str):
+        """
+        URLのホストに対するアクセス枠を確保するコンテキストマネージャー
+        
+        Args:
+            url: アクセスするURL
+        """
+        host = self.host_of(url)
+        semaphore = self._semaphore_for(host)
+        
+        with semaphore:
+            wait_time = self._reserve_start_time(host) - time.monotonic()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            yield
@@ -0,0 +1,148 @@
+"""
+HTTP取得モジュール
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+def _supported_encodings() -> str:
+    """urllib3が展開できるContent-Encodingの一覧を返す"""
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
+
+# 直前に新しく張った接続の所要時間（リクエストは呼び出し元のスレッドで行われる）
+_connect_timing = threading.local()
+
+class _TimedHTTPConnection(HTTPConnection):
+    """接続（名前解決・TCP）にかかった時間を記録するHTTP接続"""
+    
+    def connect(self):
+        start_time = time.monotonic()
+        super().connect()
+        _connect_timing.elapsed = time.monotonic() - start_time
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """接続（名前解決・TCP・TLSハンドシェイク）にかかった時間を記録するHTTPS接続"""
+    
+    def connect(self):
+        start_time = time.monotonic()
+        super().connect()
+        _connect_timing.elapsed = time.monotonic() - start_time
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """新しく張った接続の所要時間を計測するアダプター（再利用した接続では計測しない）"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+class ResponseTooLargeError(Exception):
+    """レスポンスサイズが上限を超えた場合の例外"""
+
+class HTTPFetcher:
+    """接続を再利用するタイムアウト付きHTTP取得クラス"""
+    
+    def __init__(self, user_agent: str, connect_timeout: float = 5.0,
+                 read_timeout: float = 20.0, max_bytes: int = 5 * 1024 * 1024,
+                 pool_size: int = 10):
+        """
+        HTTP取得クラスを初期化
+        
+        Args:
+            user_agent: User-Agentヘッダー
+            connect_timeout: 接続タイムアウト（秒）
+            read_timeout: 読み取りタイムアウト（秒）。本文全体の受信にも同じ上限を適用
+            max_bytes: 受信する本文の最大バイト数
+            pool_size: ホストごとに保持するKeep-Alive接続数
+        """
+        self.logger = logging.getLogger(__name__)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_bytes = max_bytes
+        
+        self.session = requests.Session()
+        adapter = _TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': _supported_encodings()
+        })
+    
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        URLを取得
+        
+        Args:
+            url: 取得するURL
+            headers: 追加のリクエストヘッダー
+        
+        Returns:
+            Dict: status_code, headers（小文字キー）, content, url, elapsed,
+                bytes（展開後の本文）, wire_bytes（圧縮されたままの受信バイト数）,
+                timings（connect: 新しい接続の確立 / ttfb: ヘッダー受信まで / transfer: 本文受信）。
+                Keep-Alive で接続を再利用した場合 connect は None
+        
+        Raises:
+            requests.exceptions.RequestException: 接続・タイムアウトエラー
+            ResponseTooLargeError: 本文がサイズ上限を超えた場合
+        """
+        start_time = time.monotonic()
+        _connect_timing.elapsed = None
+        
+        with self.session.get(url, headers=headers, stream=True,
+                              timeout=(self.connect_timeout, self.read_timeout)) as response:
+            headers_received = time.monotonic()
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+                raise ResponseTooLargeError(f"{url}: Content-Length {content_length} bytes")
+            
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                received += len(chunk)
+                if received > self.max_bytes:
+                    raise ResponseTooLargeError(f"{url}: {self.max_bytes} bytes を超過")
+                if time.monotonic() - start_time > self.connect_timeout + self.read_timeout:
+                    raise requests.exceptions.ReadTimeout(f"{url}: 本文の受信が時間内に完了しません")
+                chunks.append(chunk)
+            
+            return {
+                'status_code': response.status_code,
+                'headers': {key.lower(): value for key, value in response.headers.items()},
+                'content': b"".join(chunks),
+                'url': response.url,
+                'elapsed': time.monotonic() - start_time,
+                'bytes': received,
+                'wire_bytes': response.raw.tell(),
+                'timings': {
+                    'connect': _connect_timing.elapsed,
+                    'ttfb': headers_received - start_time,
+                    'transfer': time.monotonic() - headers_received
+                }
+            }
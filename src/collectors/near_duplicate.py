@@ -0,0 +1,188 @@
+"""
+類似記事検出モジュール
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import List, Dict, Optional, Set, Tuple
+
+class NearDuplicateIndex:
+    """MinHash + LSH による類似記事（同一ストーリー）インデックスクラス"""
+    
+    def __init__(self, num_bins: int = 64, bands: int = 16, shingle_size: int = 5,
+                 threshold: float = 0.5, max_items: int = 10000):
+        """
+        類似記事インデックスを初期化
+        
+        Args:
+            num_bins: MinHash署名の長さ
+            bands: LSHのバンド数（num_bins を割り切れること）
+            shingle_size: 文字シングルの長さ
+            threshold: 同一ストーリーとみなす推定Jaccard類似度
+            max_items: 保持する最大記事数（古いものから削除）
+        """
+        if num_bins % bands:
+            raise ValueError("num_bins は bands で割り切れる必要があります")
+        
+        self.num_bins = num_bins
+        self.bands = bands
+        self.rows = num_bins // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.max_items = max_items
+        
+        # doc_id → (署名, ストーリーID)
+        self._items: "OrderedDict[str, Tuple[Tuple[int, ...], str]]" = OrderedDict()
+        # (バンド番号, バンド値) → doc_id の集合
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        比較用にテキストを正規化
+        
+        Args:
+            text: 元のテキスト
+        
+        Returns:
+            str: 全角半角・大文字小文字・記号の差をならしたテキスト
+        """
+        text = unicodedata.normalize("NFKC", text).lower()
+        text = re.sub(r"[^\w\s]", " ", text)
+        return re.sub(r"\s+", " ", text).strip()
+    
+    def _shingles(self, text: str) -> Set[str]:
+        """文字シングルの集合を作成"""
+        normalized = self.normalize(text)
+        if len(normalized) <= self.shingle_size:
+            return {normalized} if normalized else set()
+        return {
+            normalized[i:i + self.shingle_size]
+            for i in range(len(normalized) - self.shingle_size + 1)
+        }
+    
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """
+        MinHash署名を計算
+        
+        各シングルを1回だけハッシュし、ハッシュ値で振り分けたビンごとの
+        最小値を取る（One Permutation Hashing）。空のビンは隣のビンで埋める。
+        
+        Args:
+            text: 対象テキスト
+        
+        Returns:
+            Optional[Tuple[int, ...]]: 署名（テキストが空の場合は None）
+        """
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        
+        bins: List[Optional[int]] = [None] * self.num_bins
+        for shingle in shingles:
+            value = int.from_bytes(
+                hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+            )
+            index = value % self.num_bins
+            value //= self.num_bins
+            if bins[index] is None or value < bins[index]:
+                bins[index] = value
+        
+        # 空のビンは右隣（循環）の値で埋める
+        filled = list(bins)
+        for index in range(self.num_bins):
+            offset = 1
+            while filled[index] is None:
+                filled[index] = bins[(index + offset) % self.num_bins]
+                offset += 1
+        return tuple(filled)
+    
+    def similarity(self, signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+        """
+        署名から推定Jaccard類似度を計算
+        
+        Args:
+            signature_a: 署名A
+            signature_b: 署名B
+        
+        Returns:
+            float: 推定類似度 (0-1)
+        """
+        matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+        return matches / self.num_bins
+    
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        """署名をバンドに分割したバケットキーを返す"""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+    
+    def _evict_oldest(self):
+        """最も古い記事をインデックスから削除"""
+        doc_id, (signature, _) = self._items.popitem(last=False)
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self._buckets[key]
+    
+    def add(self, doc_id: str, text: str) -> str:
+        """
+        記事をインデックスに追加し、所属するストーリーIDを返す
+        
+        LSHバケットで候補を絞り込み、閾値以上で最も類似した既存記事と
+        同じストーリーに入れる。該当がなければ doc_id が新しいストーリーIDになる。
+        
+        Args:
+            doc_id: 記事ID（URLハッシュなど）
+            text: 比較するテキスト（タイトル + 概要）
+        
+        Returns:
+            str: ストーリーID
+        """
+        if doc_id in self._items:
+            return self._items[doc_id][1]
+        
+        signature = self.signature(text)
+        if signature is None:
+            return doc_id
+        
+        band_keys = self._band_keys(signature)
+        candidates: Set[str] = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+        
+        story_id = doc_id
+        best_similarity = self.threshold
+        for candidate in candidates:
+            candidate_signature, candidate_story = self._items[candidate]
+            similarity = self.similarity(signature, candidate_signature)
+            if similarity >= best_similarity:
+                best_similarity = similarity
+                story_id = candidate_story
+        
+        self._items[doc_id] = (signature, story_id)
+        for key in band_keys:
+            self._buckets.setdefault(key, set()).add(doc_id)
+        
+        while len(self._items) > self.max_items:
+            self._evict_oldest()
+        
+        return story_id
+    
+    def story_of(self, doc_id: str) -> Optional[str]:
+        """
+        記事のストーリーIDを取得
+        
+        Args:
+            doc_id: 記事ID
+        
+        Returns:
+            Optional[str]: ストーリーID（未登録の場合は None）
+        """
+        item = self._items.get(doc_id)
+        return item[1] if item else None
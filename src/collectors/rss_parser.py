@@ -3,7 +3,6 @@ RSSフィードパーサーモジュール
 """
 
 import feedparser
-import requests
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -11,49 +10,111 @@ import time
 import re
 from urllib.parse import urlparse
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.collectors.host_throttle import HostThrottle
+from src.collectors.http_fetcher import HTTPFetcher
+from src.collectors.content_extractor import ContentExtractor
+from src.collectors.near_duplicate import NearDuplicateIndex
+from src.collectors.trending_engine import TrendingEngine
+from src.utils.keyword_matcher import KEYWORD_TABLES, get_keyword_matcher
+from src.utils.top_k import TopK
+
+def feed_version_of(etag: Optional[str], last_modified: Optional[str]) -> Optional[str]:
+    """
+    検証子からフィードの版を表す文字列を作る
+    
+    Args:
+        etag: ETagヘッダー値
+        last_modified: Last-Modifiedヘッダー値
+    
+    Returns:
+        Optional[str]: 版（検証子がない場合は None）
+    """
+    if not etag and not last_modified:
+        return None
+    return f"{etag or ''}|{last_modified or ''}"
 
 class RSSParser:
     """RSSフィードパーサークラス"""
     
-    def __init__(self, config):
+    def __init__(self, config, db_manager=None):
         """
         RSSパーサーを初期化
         
         Args:
             config: 設定オブジェクト
+            db_manager: データベースマネージャー（差分収集時のキャッシュ保存先）
         """
         self.config = config
+        self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
         
         # RSS フィード URL
         self.rss_feeds = config.RSS_FEEDS
         
         # キーワードリスト（日本語と英語）
-        self.crypto_keywords = {
-            "bitcoin": ["bitcoin", "btc", "ビットコイン"],
-            "ethereum": ["ethereum", "eth", "イーサリアム", "イーサ"],
-            "crypto": ["crypto", "cryptocurrency", "仮想通貨", "暗号資産", "デジタル通貨"],
-            "blockchain": ["blockchain", "ブロックチェーン"],
-            "defi": ["defi", "decentralized finance", "分散金融"],
-            "nft": ["nft", "non-fungible token", "エヌエフティー"],
-            "mining": ["mining", "マイニング", "採掘"],
-            "trading": ["trading", "取引", "トレード"],
-            "exchange": ["exchange", "取引所"],
-            "wallet": ["wallet", "ウォレット"]
-        }
+        self.crypto_keywords = KEYWORD_TABLES["crypto"]
+        
+        # 全キーワード表をまとめて照合する共有マッチャー
+        self.keyword_matcher = get_keyword_matcher()
         
         # ユーザーエージェント
         self.headers = {
             'User-Agent': 'CryptoMediaSystem/1.0 (+https://example.com/bot)'
         }
         
+        # 共有HTTPセッション（Keep-Alive・圧縮・タイムアウト・サイズ上限）
+        self.http_fetcher = HTTPFetcher(
+            user_agent=self.headers['User-Agent'],
+            connect_timeout=config.HTTP_CONNECT_TIMEOUT,
+            read_timeout=config.HTTP_READ_TIMEOUT,
+            max_bytes=config.HTTP_MAX_BYTES,
+            pool_size=config.HTTP_POOL_SIZE
+        )
+        
+        # 記事本文の一括抽出
+        self.content_extractor = ContentExtractor(
+            self.http_fetcher,
+            max_workers=config.ARTICLE_EXTRACT_WORKERS,
+            per_domain_concurrency=config.ARTICLE_PER_DOMAIN_CONCURRENCY,
+            domain_delay=config.ARTICLE_DOMAIN_DELAY,
+            deadline=config.ARTICLE_EXTRACT_DEADLINE
+        )
+        
+        # フィードの本文がこの文字数未満の記事は記事ページから補完（0 で無効）
+        self.enrich_min_length = config.ARTICLE_ENRICH_MIN_LENGTH
+        
         # 除外キーワード
-        self.exclude_keywords = [
-            "advertisement", "sponsored", "ad:", "pr:",
-            "広告", "スポンサー", "提供"
-        ]
+        self.exclude_keywords = KEYWORD_TABLES["exclude"]["exclude"]
+        
+        # 複数ソースにまたがる同一ストーリーの検出
+        self.story_index = NearDuplicateIndex(threshold=config.STORY_SIMILARITY_THRESHOLD)
+        
+        # 時間減衰付きのトレンド集計（記事の到着ごとに更新）
+        self.trending_engine = TrendingEngine(
+            db_manager=db_manager,
+            half_life_hours=config.TREND_HALF_LIFE_HOURS,
+            window_hours=config.TREND_WINDOW_HOURS
+        )
+        
+        # 差分収集の状態（結果の利用後に保存）
+        self.seen_hash_limit = config.RSS_SEEN_HASH_LIMIT
+        self._pending_feed_state: Dict[str, Dict[str, Any]] = {}
+        self._feed_state_lock = threading.Lock()
+        
+        # 並列取得設定
+        self.max_workers = config.RSS_MAX_WORKERS
+        self.collection_deadline = config.RSS_COLLECTION_DEADLINE
+        self.host_throttle = HostThrottle(
+            max_concurrency=config.RSS_PER_HOST_CONCURRENCY,
+            min_interval=config.RSS_HOST_DELAY
+        )
     
-    def _calculate_importance_score(self, title: str, content: str, source: str) -> float:
+    def _calculate_importance_score(self, title: str, content: str, source: str,
+                                    hits: Optional[Dict[str, Dict[str, set]]] = None,
+                                    title_hits: Optional[Dict[str, Dict[str, set]]] = None) -> float:
         """
         記事の重要度スコアを計算
         
@@ -61,32 +122,25 @@ class RSSParser:
             title: タイトル
             content: 内容
             source: ソース
+            hits: 照合済みのキーワード（keyword_matcher.match_title_and_content の結果）
+            title_hits: 照合済みのタイトルのキーワード（同上）
             
         Returns:
             float: 重要度スコア (0-100)
         """
         score = 0.0
-        text_lower = (title + " " + content).lower()
+        if hits is None or title_hits is None:
+            hits, title_hits = self.keyword_matcher.match_title_and_content(title, content)
         
         # キーワードマッチング
-        for category, keywords in self.crypto_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    if category in ["bitcoin", "ethereum"]:
-                        score += 10  # 主要通貨は高スコア
-                    else:
-                        score += 5
+        for category, keywords in hits.get("crypto", {}).items():
+            if category in ["bitcoin", "ethereum"]:
+                score += 10 * len(keywords)  # 主要通貨は高スコア
+            else:
+                score += 5 * len(keywords)
         
         # タイトルに重要キーワードがある場合はボーナス
-        title_lower = title.lower()
-        important_title_keywords = [
-            "breaking", "urgent", "alert", "crash", "surge", "pump",
-            "速報", "緊急", "急騰", "暴落", "高騰"
-        ]
-        
-        for keyword in important_title_keywords:
-            if keyword in title_lower:
-                score += 15
+        score += 15 * len(title_hits.get("title_alert", {}).get("alert", ()))
         
         # ソースによる重み付け
         source_weights = {
@@ -100,10 +154,8 @@ class RSSParser:
         score *= source_weight
         
         # 除外キーワードがある場合はペナルティ
-        for exclude_word in self.exclude_keywords:
-            if exclude_word in text_lower:
-                score *= 0.5
-                break
+        if "exclude" in hits:
+            score *= 0.5
         
         return min(score, 100.0)  # 最大100点
     
@@ -117,63 +169,149 @@ class RSSParser:
         Returns:
             str: 抽出されたコンテンツ
         """
-        try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # 一般的な記事コンテンツのタグを探す
-                content_selectors = [
-                    'article',
-                    '.article-content',
-                    '.post-content',
-                    '.entry-content',
-                    '.content',
-                    'main'
-                ]
-                
-                content = ""
-                for selector in content_selectors:
-                    elements = soup.select(selector)
-                    if elements:
-                        content = elements[0].get_text(strip=True)
-                        break
-                
-                if not content:
-                    # フォールバック: pタグから内容を抽出
-                    paragraphs = soup.find_all('p')
-                    content = ' '.join([p.get_text(strip=True) for p in paragraphs[:5]])
-                
-                return content[:1000]  # 最初の1000文字まで
+        return self.content_extractor.extract(url)
+    
+    def extract_contents(self, urls: List[str]) -> Dict[str, str]:
+        """
+        複数URLの記事内容をドメイン別の同時接続制限付きで並列抽出
+        
+        Args:
+            urls: 記事URLのリスト
             
-        except Exception as e:
-            self.logger.warning(f"コンテンツ抽出エラー ({url}): {e}")
+        Returns:
+            Dict[str, str]: URL → 抽出されたコンテンツ
+        """
+        return self.content_extractor.extract_many(urls)
+    
+    def enrich_articles(self, articles: List[Dict[str, Any]], min_length: Optional[int] = None) -> int:
+        """
+        本文が短い記事を記事ページの本文で補完
         
-        return ""
+        Args:
+            articles: 記事リスト（content を上書き）
+            min_length: この文字数未満の記事を補完対象にする（省略時は ARTICLE_ENRICH_MIN_LENGTH、0 で補完しない）
+            
+        Returns:
+            int: 補完した記事数
+        """
+        if min_length is None:
+            min_length = self.enrich_min_length
+        targets = [article for article in articles if len(article.get('content') or '') < min_length]
+        if not targets:
+            return 0
+        
+        contents = self.extract_contents([article['url'] for article in targets])
+        
+        enriched_count = 0
+        for article in targets:
+            content = contents.get(article['url'], '')
+            if len(content) > len(article.get('content') or ''):
+                article['content'] = content
+                enriched_count += 1
+        
+        self.logger.info(f"本文補完: {enriched_count}/{len(targets)}件")
+        return enriched_count
     
-    def _parse_feed(self, feed_url: str, source_name: str) -> List[Dict[str, Any]]:
+    def _parse_feed(self, feed_url: str, source_name: str, incremental: bool = False) -> List[Dict[str, Any]]:
         """
         単一のRSSフィードをパース
         
         Args:
             feed_url: フィードURL
             source_name: ソース名
+            incremental: 差分収集モード。ソースごとの最新公開日時と既読URLハッシュより
+                古い記事は処理しない
+        
+        db_manager があればモードによらず保存済みのETag / Last-Modifiedで条件付きGETを行う。
+        304 Not Modified の場合は保存済みのフィード本体を解析する（差分収集モードで
+        処理済みの版なら解析せずに空を返す）。
             
         Returns:
             List[Dict]: パースされた記事リスト
         """
+        # 取得・解析の計測値（api_usage に記録）
+        metrics: Dict[str, Any] = {'entries_parsed': 0, 'entries_kept': 0}
+        
         try:
             self.logger.info(f"{source_name} フィードを解析中: {feed_url}")
             
+            incremental = incremental and self.db_manager is not None
+            validators = {}
+            watermark = {'last_published': None, 'seen_hashes': [], 'feed_version': None}
+            if self.db_manager is not None:
+                validators = self.db_manager.get_feed_validators(feed_url)
+            if incremental:
+                watermark = self.db_manager.get_feed_watermark(source_name)
+            
+            # 304 で解析し直せる本体がある場合だけ条件付きGETにする
+            request_headers = {}
+            if validators.get('cached'):
+                if validators.get('etag'):
+                    request_headers['If-None-Match'] = validators['etag']
+                if validators.get('last_modified'):
+                    request_headers['If-Modified-Since'] = validators['last_modified']
+            
             # フィードを取得
-            feed = feedparser.parse(feed_url)
+            fetch_start = time.monotonic()
+            metrics['response_time'] = None
+            response = self.http_fetcher.fetch(feed_url, headers=request_headers)
+            metrics.update({
+                'status_code': response['status_code'],
+                'response_time': response['elapsed'],
+                'bytes': response['bytes'],
+                'wire_bytes': response['wire_bytes'],
+                'connect_time': response['timings']['connect'],
+                'ttfb_time': response['timings']['ttfb'],
+                'transfer_time': response['timings']['transfer']
+            })
+            
+            content = response['content']
+            content_headers = response['headers']
+            
+            if response['status_code'] == 304:
+                feed_version = feed_version_of(validators.get('etag'), validators.get('last_modified'))
+                if incremental and watermark['feed_version'] == feed_version:
+                    self.logger.info(f"{source_name} フィードは前回から更新なし (304)")
+                    return []
+                
+                # 前回の取得結果（他のモードで取得した版を含む）を解析し直す
+                cached = self.db_manager.get_cached_feed(feed_url) if self.db_manager is not None else None
+                if cached is None:
+                    self.logger.warning(f"{source_name} フィードの保存済み本体がありません (304)")
+                    return []
+                content = cached['content']
+                content_headers = {'content-type': cached['content_type']} if cached['content_type'] else {}
+            
+            elif response['status_code'] != 200:
+                self.logger.warning(f"{source_name} フィード取得失敗: HTTP {response['status_code']}")
+                return []
+            
+            else:
+                etag = response['headers'].get('etag')
+                last_modified = response['headers'].get('last-modified')
+                feed_version = feed_version_of(etag, last_modified)
+                if self.db_manager is not None and feed_version is not None:
+                    # 次回の条件付きGET用に検証子と本体を保存（差分収集の状態は _commit_feed_state で保存）
+                    self.db_manager.save_feed_validators(
+                        feed_url, etag=etag, last_modified=last_modified,
+                        content=content, content_type=response['headers'].get('content-type')
+                    )
+            
+            # 取得済みのバイト列をパース
+            parse_start = time.thread_time()
+            feed = feedparser.parse(content, response_headers=content_headers)
+            metrics['parse_cpu_time'] = time.thread_time() - parse_start
+            metrics['entries_parsed'] = len(feed.entries)
             
             if feed.bozo:
                 self.logger.warning(f"{source_name} フィード解析警告: {feed.bozo_exception}")
+                metrics['bozo_error'] = str(feed.bozo_exception)[:500]
             
             articles = []
+            last_published = watermark['last_published']
+            seen_hashes = set(watermark['seen_hashes'])
+            new_hashes = []
+            newest_published = last_published
             
             for entry in feed.entries:
                 try:
@@ -184,6 +322,11 @@ class RSSParser:
                     if not title or not link:
                         continue
                     
+                    # 既読の記事はスコア計算前にスキップ
+                    url_hash = hashlib.md5(link.encode()).hexdigest()
+                    if url_hash in seen_hashes:
+                        continue
+                    
                     # 公開日時を解析
                     publish_date = None
                     if hasattr(entry, 'published_parsed') and entry.published_parsed:
@@ -191,6 +334,15 @@ class RSSParser:
                     elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
                         publish_date = datetime(*entry.updated_parsed[:6])
                     
+                    if last_published and publish_date and publish_date < last_published:
+                        continue
+                    
+                    if incremental:
+                        new_hashes.append(url_hash)
+                        seen_hashes.add(url_hash)
+                        if publish_date and (newest_published is None or publish_date > newest_published):
+                            newest_published = publish_date
+                    
                     # 概要を取得
                     summary = entry.get('summary', '').strip()
                     if 'content' in entry:
@@ -203,12 +355,16 @@ class RSSParser:
                         content = re.sub(r'<[^>]+>', '', content)
                         content = re.sub(r'\s+', ' ', content).strip()
                     
+                    # キーワードを1回だけ照合して判定とスコアに共用
+                    hits, title_hits = self.keyword_matcher.match_title_and_content(title, content)
+                    
                     # 仮想通貨関連かチェック
-                    if not self._is_crypto_related(title, content):
+                    if not self._is_crypto_related(title, content, hits):
                         continue
                     
                     # 重要度スコアを計算
-                    importance_score = self._calculate_importance_score(title, content, source_name)
+                    importance_score = self._calculate_importance_score(title, content, source_name,
+                                                                        hits, title_hits)
                     
                     # 記事データを作成
                     article = {
@@ -218,7 +374,7 @@ class RSSParser:
                         'source': source_name,
                         'publish_date': publish_date,
                         'importance_score': importance_score,
-                        'url_hash': hashlib.md5(link.encode()).hexdigest()
+                        'url_hash': url_hash
                     }
                     
                     articles.append(article)
@@ -227,40 +383,154 @@ class RSSParser:
                     self.logger.warning(f"記事処理エラー ({source_name}): {e}")
                     continue
             
+            if incremental:
+                # 結果が利用されたときに保存する（_commit_feed_state）
+                with self._feed_state_lock:
+                    self._pending_feed_state[source_name] = {
+                        'feed_version': feed_version,
+                        'last_published': newest_published,
+                        'seen_hashes': (new_hashes + watermark['seen_hashes'])[:self.seen_hash_limit]
+                    }
+            
+            metrics['entries_kept'] = len(articles)
             self.logger.info(f"{source_name} から {len(articles)} 件の記事を取得")
             return articles
             
         except Exception as e:
             self.logger.error(f"{source_name} フィード取得エラー: {e}")
+            metrics['error_message'] = str(e)[:500]
+            if 'response_time' in metrics and metrics['response_time'] is None:
+                # 取得に失敗した場合も失敗までの時間を残す
+                metrics['response_time'] = time.monotonic() - fetch_start
             return []
+        
+        finally:
+            if self.db_manager is not None:
+                self.db_manager.record_feed_metrics(source_name, metrics)
     
-    def _is_crypto_related(self, title: str, content: str) -> bool:
+    def _is_crypto_related(self, title: str, content: str,
+                           hits: Optional[Dict[str, Dict[str, set]]] = None) -> bool:
         """
         記事が仮想通貨関連かチェック
         
         Args:
             title: タイトル
             content: 内容
+            hits: 照合済みのキーワード（keyword_matcher.match の結果）
             
         Returns:
             bool: 仮想通貨関連かどうか
         """
-        text = (title + " " + content).lower()
+        if hits is None:
+            hits = self.keyword_matcher.match(title + " " + content)
         
         # 仮想通貨関連キーワードをチェック
-        for keywords in self.crypto_keywords.values():
-            for keyword in keywords:
-                if keyword in text:
-                    return True
+        return bool(hits.get("crypto"))
+    
+    def _parse_feed_throttled(self, feed_url: str, source_name: str,
+                              incremental: bool = False) -> List[Dict[str, Any]]:
+        """
+        ホスト別のアクセス制限を守ってフィードをパース
+        
+        Args:
+            feed_url: フィードURL
+            source_name: ソース名
+            incremental: 差分収集モード
+            
+        Returns:
+            List[Dict]: パースされた記事リスト
+        """
+        with self.host_throttle.slot(feed_url):
+            return self._parse_feed(feed_url, source_name, incremental)
+    
+    def _commit_feed_state(self, source_name: str):
+        """
+        差分収集の状態（処理したフィードの版・最新公開日時・既読ハッシュ）を保存
+        
+        収集期限切れで結果が捨てられたフィードの状態は保存しないよう、
+        結果を呼び出し元へ渡した後に呼ぶ。
+        
+        Args:
+            source_name: ソース名
+        """
+        with self._feed_state_lock:
+            state = self._pending_feed_state.pop(source_name, None)
+        
+        if not state or self.db_manager is None:
+            return
+        
+        self.db_manager.save_feed_watermark(
+            source_name,
+            last_published=state['last_published'],
+            seen_hashes=state['seen_hashes'],
+            feed_version=state['feed_version']
+        )
+    
+    def _iter_feed_results(self, incremental: bool = False):
+        """
+        全フィードを並列に取得し、完了した順に結果を返す
         
-        return False
+        収集期限（RSS_COLLECTION_DEADLINE）を過ぎても完了しないフィードは
+        結果に含めず、警告ログを出して打ち切る。
+        
+        Args:
+            incremental: 差分収集モード
+        
+        Yields:
+            Tuple[str, List[Dict]]: (ソース名, 記事リスト)
+        """
+        if not self.rss_feeds:
+            return
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(self.rss_feeds))),
+            thread_name_prefix="rss-feed"
+        )
+        futures = {
+            executor.submit(self._parse_feed_throttled, feed_url, source_name, incremental): source_name
+            for source_name, feed_url in self.rss_feeds.items()
+        }
+        pending = set(futures)
+        deadline = time.monotonic() + self.collection_deadline
+        
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source_name = futures[future]
+                    try:
+                        articles = future.result()
+                    except Exception as e:
+                        self.logger.error(f"{source_name} 処理エラー: {e}")
+                        continue
+                    
+                    yield source_name, articles
+                    self._commit_feed_state(source_name)
+            
+            if pending:
+                timed_out = sorted(futures[future] for future in pending)
+                self.logger.warning(
+                    f"収集期限 {self.collection_deadline}秒 を超過したフィードをスキップ: {timed_out}"
+                )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
-    def collect_latest_news(self, hours: int = 24) -> List[Dict[str, Any]]:
+    def collect_latest_news(self, hours: int = 24, incremental: bool = False) -> List[Dict[str, Any]]:
         """
         最新ニュースを収集
         
+        フィードは並列に取得し、結果は設定のフィード順に統合する。
+        本文が ARTICLE_ENRICH_MIN_LENGTH 未満の記事は記事ページから本文を補完する。
+        
         Args:
             hours: 取得する時間範囲（時間）
+            incremental: 差分収集モード。差分収集で処理済みのフィード（304）と
+                既に処理済みの記事はスキップするため、定期ポーリングで新着分だけを得る用途向け。
+                どちらのモードでも変更のないフィードは条件付きGETで本体の再取得を省く
             
         Returns:
             List[Dict]: ニュース記事リスト
@@ -268,27 +538,22 @@ class RSSParser:
         all_articles = []
         cutoff_time = datetime.now() - timedelta(hours=hours)
         
-        for source_name, feed_url in self.rss_feeds.items():
-            try:
-                articles = self._parse_feed(feed_url, source_name)
-                
-                # 指定時間内の記事のみフィルタ
-                recent_articles = []
-                for article in articles:
-                    if article['publish_date'] and article['publish_date'] > cutoff_time:
-                        recent_articles.append(article)
-                    elif not article['publish_date']:
-                        # 公開日時が不明な場合も含める
-                        recent_articles.append(article)
-                
-                all_articles.extend(recent_articles)
-                
-                # レート制限のため少し待機
-                time.sleep(1)
-                
-            except Exception as e:
-                self.logger.error(f"{source_name} 処理エラー: {e}")
+        feed_results = dict(self._iter_feed_results(incremental))
+        
+        for source_name in self.rss_feeds:
+            if source_name not in feed_results:
                 continue
+            
+            # 指定時間内の記事のみフィルタ
+            recent_articles = []
+            for article in feed_results[source_name]:
+                if article['publish_date'] and article['publish_date'] > cutoff_time:
+                    recent_articles.append(article)
+                elif not article['publish_date']:
+                    # 公開日時が不明な場合も含める
+                    recent_articles.append(article)
+            
+            all_articles.extend(recent_articles)
         
         # 重要度スコアでソート
         all_articles.sort(key=lambda x: x['importance_score'], reverse=True)
@@ -302,13 +567,109 @@ class RSSParser:
                 seen_urls.add(article['url_hash'])
                 unique_articles.append(article)
         
+        # 本文が短い記事は記事ページから補完（ストーリー判定に本文を使うため先に行う）
+        self.enrich_articles(unique_articles)
+        
+        # 同一ストーリーにストーリーIDを付与（重要度の高い記事が代表になる）
+        self.assign_story_ids(unique_articles)
+        
+        self.trending_engine.observe_many(unique_articles)
+        self.trending_engine.flush()
+        
         self.logger.info(f"合計 {len(unique_articles)} 件の最新ニュースを収集")
         return unique_articles
     
+    def assign_story_ids(self, articles: List[Dict[str, Any]]) -> int:
+        """
+        類似記事インデックスで各記事にストーリーID（story_id）を付与
+        
+        Args:
+            articles: 記事リスト（story_id を追加）
+            
+        Returns:
+            int: ストーリー数
+        """
+        story_ids = set()
+        
+        for article in articles:
+            url_hash = article.get('url_hash') or hashlib.md5(article['url'].encode()).hexdigest()
+            text = article['title'] + " " + (article.get('content') or '')[:500]
+            article['story_id'] = self.story_index.add(url_hash, text)
+            story_ids.add(article['story_id'])
+        
+        if len(story_ids) < len(articles):
+            self.logger.info(f"{len(articles)} 件の記事を {len(story_ids)} 件のストーリーに集約")
+        return len(story_ids)
+    
+    def select_canonical_stories(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        ストーリーごとに代表記事を1件だけ選ぶ
+        
+        代表は重要度スコアが最も高い記事。並び順は各ストーリーが最初に現れた順。
+        
+        Args:
+            articles: 記事リスト
+            
+        Returns:
+            List[Dict]: 代表記事のリスト
+        """
+        if any('story_id' not in article for article in articles):
+            self.assign_story_ids(articles)
+        
+        canonical: Dict[str, Dict[str, Any]] = {}
+        for article in articles:
+            current = canonical.get(article['story_id'])
+            if current is None or (article.get('importance_score') or 0) > (current.get('importance_score') or 0):
+                canonical[article['story_id']] = article
+        
+        return [article for article in articles if canonical.get(article['story_id']) is article]
+    
+    def iter_latest_news(self, hours: int = 24, incremental: bool = False):
+        """
+        最新ニュースをフィードの取得完了順に逐次返す
+        
+        全フィードの完了を待たず、各フィードの結果を重要度順に流す。
+        URLの重複は除き、本文の短い記事を補完してストーリーIDを付与する。
+        
+        Args:
+            hours: 取得する時間範囲（時間）
+            incremental: 差分収集モード
+            
+        Yields:
+            Dict: ニュース記事
+        """
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        seen_urls = set()
+        
+        for source_name, articles in self._iter_feed_results(incremental):
+            recent_articles = []
+            for article in sorted(articles, key=lambda x: x['importance_score'], reverse=True):
+                # 指定時間内（または公開日時が不明）の記事のみ
+                if article['publish_date'] and article['publish_date'] <= cutoff_time:
+                    continue
+                
+                if article['url_hash'] in seen_urls:
+                    continue
+                seen_urls.add(article['url_hash'])
+                recent_articles.append(article)
+            
+            # フィード単位で本文を補完してから流す
+            self.enrich_articles(recent_articles)
+            
+            for article in recent_articles:
+                self.assign_story_ids([article])
+                self.trending_engine.observe(article)
+                yield article
+        
+        self.trending_engine.flush()
+    
     def collect_weekly_news(self, days: int = 7) -> List[Dict[str, Any]]:
         """
         週間ニュースを収集
         
+        フィードから再取得する（フィードには直近の記事しか残っていないため取りこぼしがある）。
+        収集済みのニュースがデータベースにある場合は assemble_weekly_news を使う。
+        
         Args:
             days: 取得する日数
             
@@ -317,6 +678,48 @@ class RSSParser:
         """
         return self.collect_latest_news(hours=days * 24)
     
+    def assemble_weekly_news(self, days: int = 7, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        収集済みのニュースから週間の上位ストーリーを組み立てる（ネットワークアクセスなし）
+        
+        データベースから重要度の高い順に読み出し、ストーリーごとに最初の記事（= 最も重要度の
+        高い記事）を代表として残す。limit 件のストーリーが揃った時点で読み出しを終える。
+        
+        Args:
+            days: 対象の日数
+            limit: 取得するストーリー数
+        
+        Returns:
+            List[Dict]: 代表記事のリスト（重要度の高い順、story_id 付き）
+        """
+        if self.db_manager is None:
+            return []
+        
+        # 定期収集で使うインデックスとは別に、週間分だけでストーリーをまとめる
+        story_index = NearDuplicateIndex(threshold=self.config.STORY_SIMILARITY_THRESHOLD)
+        stories: List[Dict[str, Any]] = []
+        seen_stories = set()
+        
+        try:
+            for row in self.db_manager.iter_recent_news(days=days):
+                text = row['title'] + " " + (row['content'] or '')[:500]
+                story_id = story_index.add(hashlib.md5(row['url'].encode()).hexdigest(), text)
+                if story_id in seen_stories:
+                    continue
+                seen_stories.add(story_id)
+                
+                article = dict(row)
+                article['story_id'] = story_id
+                stories.append(article)
+                if len(stories) >= limit:
+                    break
+        
+        except Exception as e:
+            self.logger.error(f"週間ニュース読み出しエラー: {e}")
+        
+        self.logger.info(f"データベースから週間ニュース {len(stories)}件（ストーリー単位）を取得")
+        return stories
+    
     def get_top_stories(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         トップストーリーを取得
@@ -327,12 +730,13 @@ class RSSParser:
         Returns:
             List[Dict]: トップストーリーリスト
         """
-        articles = self.collect_latest_news(hours=24)
+        # 全件を溜めずに、ストーリーごとの代表記事の上位だけを保持
+        top_stories = TopK(limit)
         
-        # 重要度スコアでソートして上位を返す
-        top_articles = sorted(articles, key=lambda x: x['importance_score'], reverse=True)
+        for article in self.iter_latest_news(hours=24):
+            top_stories.push(article, article['importance_score'], key=article['story_id'])
         
-        return top_articles[:limit]
+        return top_stories.items()
     
     def categorize_news(self, articles: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -355,23 +759,11 @@ class RSSParser:
         }
         
         for article in articles:
-            text = (article['title'] + " " + article['content']).lower()
-            
-            # カテゴリ分類キーワード
-            if any(keyword in text for keyword in ["price", "trading", "market", "chart", "価格", "相場", "取引"]):
-                categorized["market"].append(article)
-            elif any(keyword in text for keyword in ["protocol", "upgrade", "fork", "consensus", "プロトコル", "アップグレード"]):
-                categorized["technology"].append(article)
-            elif any(keyword in text for keyword in ["regulation", "sec", "government", "legal", "規制", "法律", "政府"]):
-                categorized["regulation"].append(article)
-            elif any(keyword in text for keyword in ["adoption", "partnership", "integration", "採用", "導入", "提携"]):
-                categorized["adoption"].append(article)
-            elif any(keyword in text for keyword in ["defi", "yield", "liquidity", "staking", "分散金融"]):
-                categorized["defi"].append(article)
-            elif any(keyword in text for keyword in ["nft", "non-fungible", "collectible", "エヌエフティー"]):
-                categorized["nft"].append(article)
-            else:
-                categorized["general"].append(article)
+            hits = self.keyword_matcher.match(article['title'] + " " + article['content'])
+            
+            # カテゴリ分類キーワード（KEYWORD_TABLES["news_category"] の順で判定）
+            category = self.keyword_matcher.first_category(hits, "news_category") or "general"
+            categorized[category].append(article)
         
         return categorized
     
@@ -379,6 +771,9 @@ class RSSParser:
         """
         トレンドトピックを抽出
         
+        指定した記事の中で多くの記事に含まれる語を返す（トレンド集計の状態は変更しない）。
+        収集中の時間減衰付きトレンドは trending_engine.top() で取得する。
+        
         Args:
             articles: 記事リスト
             limit: 取得するトピック数
@@ -386,18 +781,4 @@ class RSSParser:
         Returns:
             List[str]: トレンドトピックリスト
         """
-        # すべての記事のタイトルと内容を結合
-        all_text = " ".join([article['title'] + " " + article['content'] for article in articles])
-        
-        # 単語頻度を計算（簡易版）
-        words = re.findall(r'\b\w{3,}\b', all_text.lower())
-        word_freq = {}
-        
-        for word in words:
-            if word not in ['the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use']:
-                word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # 頻度順にソート
-        trending = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        
-        return [word[0] for word in trending[:limit]]
\ No newline at end of file
+        return [term for term, _ in self.trending_engine.rank(articles, limit)]
\ No newline at end of file
@@ -0,0 +1,341 @@
+"""
+トレンドトピック集計モジュール
+"""
+
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from src.utils.keyword_matcher import KeywordMatcher
+
+# 英語のストップワード
+STOPWORDS = frozenset([
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was',
+    'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now',
+    'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she',
+    'too', 'use', 'this', 'that', 'with', 'from', 'will', 'have', 'been', 'after',
+    'over', 'into', 'more', 'than', 'said', 'says', 'they', 'their', 'what', 'when',
+    'which', 'while', 'about', 'could', 'would', 'should', 'also', 'just', 'like',
+    'some', 'such', 'were', 'there', 'these', 'those', 'here', 'week', 'year', 'years',
+    'today', 'according', 'amid', 'per', 'may', 'other', 'most', 'first', 'last'
+])
+
+# 通貨エンティティ（シンボル → 表記ゆれ）
+COIN_ENTITIES = {
+    "coin": {
+        "BTC": ["bitcoin", "btc", "ビットコイン"],
+        "ETH": ["ethereum", "イーサリアム"],
+        "XRP": ["xrp", "ripple", "リップル"],
+        "SOL": ["solana", "ソラナ"],
+        "BNB": ["bnb", "binance coin", "バイナンスコイン"],
+        "DOGE": ["dogecoin", "ドージコイン"],
+        "ADA": ["cardano", "カルダノ"],
+        "DOT": ["polkadot", "ポルカドット"],
+        "AVAX": ["avalanche", "アバランチ"],
+        "MATIC": ["polygon", "ポリゴン"],
+        "LINK": ["chainlink", "チェーンリンク"],
+        "USDT": ["tether", "usdt", "テザー"],
+        "USDC": ["usdc"]
+    }
+}
+
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9\-]{2,}")
+JAPANESE_PATTERN = re.compile(r"[぀-ヿ㐀-鿿]")
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+def _get_tokenizer():
+    """janomeのトークナイザーを取得（辞書の読み込みは初回のみ）"""
+    global _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None:
+            from janome.tokenizer import Tokenizer
+            _tokenizer = Tokenizer()
+        return _tokenizer
+
+@lru_cache(maxsize=4096)
+def _japanese_nouns(text: str) -> Tuple[str, ...]:
+    """
+    日本語テキストから名詞を抽出（同じテキストは再解析しない）
+    
+    Args:
+        text: 対象テキスト
+    
+    Returns:
+        Tuple[str, ...]: 名詞（2文字以上。数と助数詞だけのもの・非自立・代名詞は除く）
+    """
+    try:
+        tokenizer = _get_tokenizer()
+    except ImportError:
+        # janomeがない場合は漢字・カタカナの連続をそのまま使う
+        return tuple(re.findall(r"[゠-ヿ㐀-鿿]{2,}", text))
+    
+    # 連続する名詞は複合名詞としてまとめる（ビット+コイン → ビットコイン）
+    nouns = []
+    compound = []
+    for token in tokenizer.tokenize(text):
+        pos = token.part_of_speech.split(',')
+        if pos[0] == '名詞' and pos[1] not in ('非自立', '代名詞'):
+            compound.append(token)
+            continue
+        nouns.append(compound)
+        compound = []
+    nouns.append(compound)
+    
+    results = []
+    for tokens in nouns:
+        surface = "".join(token.surface for token in tokens)
+        if len(surface) >= 2 and not all(token.part_of_speech.split(',')[1] in ('数', '接尾') for token in tokens):
+            results.append(surface)
+    return tuple(results)
+
+class TrendingEngine:
+    """時間減衰付きトレンドトピック集計クラス"""
+    
+    def __init__(self, db_manager=None, half_life_hours: float = 6.0,
+                 window_hours: float = 72.0, max_terms: int = 20000,
+                 seen_limit: int = 10000):
+        """
+        トレンド集計エンジンを初期化
+        
+        Args:
+            db_manager: データベースマネージャー（集計結果の永続化先）
+            half_life_hours: スコアが半減する時間
+            window_hours: この時間以上出現していない語は集計から外す
+            max_terms: 保持する語の上限
+            seen_limit: 重複集計防止のためにメモリに覚えておく記事数（集計済みの記事IDはデータベースにも保存）
+        """
+        self.db_manager = db_manager
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+        self.window_seconds = window_hours * 3600
+        self.max_terms = max_terms
+        self.seen_limit = seen_limit
+        self.logger = logging.getLogger(__name__)
+        
+        self.coin_matcher = KeywordMatcher(COIN_ENTITIES)
+        
+        # 前方減衰: 重み = 件数 * exp(λ (観測時刻 - 基準時刻))。順位は時刻によらず不変
+        self._landmark = time.time()
+        # 語 → [重み, 最終出現時刻, 種別]
+        self._terms: Dict[str, List[Any]] = {}
+        self._dirty = set()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # 未保存の集計済み記事 (記事ID, 集計時刻)
+        self._observed: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+        
+        if db_manager is not None:
+            self._load()
+    
+    def _load(self):
+        """保存済みの集計結果と集計済みの記事IDを読み込む"""
+        now = time.time()
+        for row in self.db_manager.load_trending_terms(since=now - self.window_seconds):
+            weight = row['score'] * math.exp(self.decay_rate * (row['updated_at'] - self._landmark))
+            self._terms[row['term']] = [weight, row['last_seen'], row['kind']]
+        
+        # 別のプロセス・インスタンスで集計済みの記事を再度数えないようにする
+        for item_id in self.db_manager.load_trending_observed(since=now - self.window_seconds)[-self.seen_limit:]:
+            self._seen[item_id] = None
+    
+    def _rescale(self, timestamp: float):
+        """指数が大きくなりすぎないよう基準時刻を進める"""
+        factor = math.exp(-self.decay_rate * (timestamp - self._landmark))
+        for entry in self._terms.values():
+            entry[0] *= factor
+        self._landmark = timestamp
+    
+    def extract_terms(self, text: str) -> Dict[str, str]:
+        """
+        テキストから集計対象の語を抽出
+        
+        Args:
+            text: 対象テキスト
+        
+        Returns:
+            Dict[str, str]: 語 → 種別（word / bigram / ja / coin）
+        """
+        terms: Dict[str, str] = {}
+        
+        # 通貨エンティティ
+        for symbol in self.coin_matcher.categories(self.coin_matcher.match(text), "coin"):
+            terms[symbol] = "coin"
+        
+        # 英単語と2語連続
+        words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+        for word in words:
+            terms.setdefault(word, "word")
+        for first, second in zip(words, words[1:]):
+            terms.setdefault(f"{first} {second}", "bigram")
+        
+        # 日本語の名詞
+        if JAPANESE_PATTERN.search(text):
+            for noun in _japanese_nouns(text):
+                terms.setdefault(noun, "ja")
+        
+        return terms
+    
+    def observe(self, article: Dict[str, Any]) -> bool:
+        """
+        記事を集計に加える（同じ記事は1回だけ）
+        
+        Args:
+            article: 記事データ（title, content, url_hash または url, publish_date）
+        
+        Returns:
+            bool: 新しく集計したかどうか
+        """
+        item_id = article.get('url_hash') or article.get('url') or article.get('title', '')
+        
+        publish_date = article.get('publish_date')
+        now = time.time()
+        timestamp = now
+        if isinstance(publish_date, datetime):
+            timestamp = min(publish_date.timestamp(), now)
+        
+        if now - timestamp > self.window_seconds:
+            return False
+        
+        with self._lock:
+            if item_id in self._seen:
+                return False
+        
+        text = article.get('title', '') + " " + (article.get('content') or '')[:500]
+        terms = self.extract_terms(text)
+        
+        with self._lock:
+            if item_id in self._seen:
+                return False
+            self._seen[item_id] = None
+            self._observed.append((item_id, now))
+            while len(self._seen) > self.seen_limit:
+                self._seen.popitem(last=False)
+            
+            if self.decay_rate * (timestamp - self._landmark) > 50:
+                self._rescale(timestamp)
+            
+            increment = math.exp(self.decay_rate * (timestamp - self._landmark))
+            for term, kind in terms.items():
+                entry = self._terms.get(term)
+                if entry is None:
+                    self._terms[term] = [increment, timestamp, kind]
+                else:
+                    entry[0] += increment
+                    entry[1] = max(entry[1], timestamp)
+                self._dirty.add(term)
+            
+            if len(self._terms) > self.max_terms * 1.2:
+                self._prune(now)
+        
+        return True
+    
+    def observe_many(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        複数の記事を集計に加える
+        
+        Args:
+            articles: 記事リスト
+        
+        Returns:
+            int: 新しく集計した記事数
+        """
+        return sum(1 for article in articles if self.observe(article))
+    
+    def _prune(self, now: float):
+        """期間外の語と、上限を超えた低スコアの語を削除"""
+        expired = [term for term, entry in self._terms.items() if now - entry[1] > self.window_seconds]
+        for term in expired:
+            del self._terms[term]
+        
+        if len(self._terms) > self.max_terms:
+            keep = heapq.nlargest(self.max_terms, self._terms.items(), key=lambda item: item[1][0])
+            self._terms = dict(keep)
+        
+        self._dirty &= set(self._terms)
+    
+    def top(self, k: int = 5, kinds: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        現在のトレンド上位を取得
+        
+        記事の再集計は行わず、保持している語のスコアから上位k件を選ぶ。
+        
+        Args:
+            k: 取得する件数
+            kinds: 対象とする種別（省略時はすべて）
+        
+        Returns:
+            List[Tuple[str, float]]: (語, 現時点の減衰後スコア) のリスト
+        """
+        now = time.time()
+        kinds = set(kinds) if kinds else None
+        
+        with self._lock:
+            candidates = (
+                (term, entry[0]) for term, entry in self._terms.items()
+                if now - entry[1] <= self.window_seconds and (kinds is None or entry[2] in kinds)
+            )
+            top_terms = heapq.nlargest(k, candidates, key=lambda item: item[1])
+        
+        scale = math.exp(-self.decay_rate * (now - self._landmark))
+        return [(term, weight * scale) for term, weight in top_terms]
+    
+    def rank(self, articles: Iterable[Dict[str, Any]], k: int = 5) -> List[Tuple[str, int]]:
+        """
+        指定した記事の中で多く出現する語の上位を取得（集計の状態は変更しない）
+        
+        期間や減衰は適用せず、各語を含む記事数で順位を付ける。
+        
+        Args:
+            articles: 記事リスト
+            k: 取得する件数
+        
+        Returns:
+            List[Tuple[str, int]]: (語, 含まれていた記事数) のリスト
+        """
+        counts: Dict[str, int] = {}
+        for article in articles:
+            text = article.get('title', '') + " " + (article.get('content') or '')[:500]
+            for term in self.extract_terms(text):
+                counts[term] = counts.get(term, 0) + 1
+        
+        return heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+    
+    def flush(self) -> int:
+        """
+        更新された語と集計済みの記事IDをデータベースへ保存
+        
+        Returns:
+            int: 保存した語数
+        """
+        if self.db_manager is None:
+            return 0
+        
+        now = time.time()
+        with self._lock:
+            scale = math.exp(-self.decay_rate * (now - self._landmark))
+            rows = [
+                {
+                    'term': term,
+                    'kind': self._terms[term][2],
+                    'score': self._terms[term][0] * scale,
+                    'last_seen': self._terms[term][1],
+                    'updated_at': now
+                }
+                for term in self._dirty if term in self._terms
+            ]
+            self._dirty.clear()
+            observed = self._observed
+            self._observed = []
+        
+        if rows or observed:
+            self.db_manager.save_trending_terms(rows, observed=observed,
+                                                expire_before=now - self.window_seconds)
+        return len(rows)
@@ -0,0 +1,121 @@
+"""
+削除前データのアーカイブモジュール
+"""
+
+import gzip
+import json
+import os
+import shutil
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+def archive_path(archive_dir: str, table: str, month: str) -> str:
+    """
+    アーカイブファイルのパスを返す（<archive_dir>/<table>/<YYYY-MM>.jsonl.gz）
+    
+    Args:
+        archive_dir: アーカイブの保存先ディレクトリ
+        table: テーブル名
+        month: 年月（YYYY-MM）
+    
+    Returns:
+        str: ファイルパス
+    """
+    return os.path.join(archive_dir, table, f"{month}.jsonl.gz")
+
+def stage_archive(archive_dir: str, table: str, rows: Sequence[Dict[str, Any]],
+                  date_column: str) -> List[Tuple[str, str]]:
+    """
+    行を月ごとの一時ファイル（gzip 圧縮 JSON Lines）に書き出す
+    
+    削除のコミット後に commit_archive で本体へ追記し、削除に失敗した場合は
+    discard_archive で捨てる。これによりアーカイブと削除済みの行が一致する。
+    
+    Args:
+        archive_dir: アーカイブの保存先ディレクトリ
+        table: テーブル名
+        rows: 列名 → 値の辞書のリスト
+        date_column: 振り分けに使う日時列（先頭7文字 = YYYY-MM）
+    
+    Returns:
+        List[Tuple[str, str]]: (一時ファイル, 追記先のアーカイブファイル) のリスト
+    """
+    by_month: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        value = row.get(date_column)
+        month = str(value)[:7] if value else "unknown"
+        by_month[month].append(row)
+    
+    os.makedirs(os.path.join(archive_dir, table), exist_ok=True)
+    staged = []
+    try:
+        for month, month_rows in by_month.items():
+            path = archive_path(archive_dir, table, month)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            staged.append((tmp_path, path))
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                for row in month_rows:
+                    f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+    except Exception:
+        discard_archive(staged)
+        raise
+    
+    return staged
+
+def commit_archive(staged: Sequence[Tuple[str, str]]):
+    """
+    stage_archive で書き出した一時ファイルをアーカイブ本体に追記して削除
+    
+    gzip のメンバーをそのまま連結するため、gzip.open でまとめて読める。
+    
+    Args:
+        staged: stage_archive の戻り値
+    """
+    for tmp_path, path in staged:
+        with open(tmp_path, "rb") as src, open(path, "ab") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(tmp_path)
+
+def discard_archive(staged: Sequence[Tuple[str, str]]):
+    """
+    stage_archive で書き出した一時ファイルを削除
+    
+    Args:
+        staged: stage_archive の戻り値
+    """
+    for tmp_path, _ in staged:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def iter_archive(archive_dir: str, table: str,
+                 months: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    アーカイブ済みの行を順に読み出す
+    
+    Args:
+        archive_dir: アーカイブの保存先ディレクトリ
+        table: テーブル名
+        months: 読み出す年月（YYYY-MM）のリスト（省略時はすべて）
+    
+    Yields:
+        Dict: 列名 → 値
+    """
+    table_dir = os.path.join(archive_dir, table)
+    if not os.path.isdir(table_dir):
+        return
+    
+    if months is None:
+        months = sorted(name[:-len(".jsonl.gz")] for name in os.listdir(table_dir)
+                        if name.endswith(".jsonl.gz"))
+    
+    for month in months:
+        path = archive_path(archive_dir, table, month)
+        if not os.path.exists(path):
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,178 @@
+"""
+データベース接続管理モジュール
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+# 接続ごとに設定するPRAGMA
+CONNECTION_PRAGMAS = [
+    ("synchronous", "NORMAL"),
+    ("cache_size", "-20000"),
+    ("mmap_size", "268435456"),
+    ("temp_store", "MEMORY")
+]
+
+class ConnectionManager:
+    """スレッドごとに接続を再利用するSQLite接続管理クラス"""
+    
+    def __init__(self, db_path: str, busy_timeout: float = 10.0):
+        """
+        接続管理クラスを初期化
+        
+        Args:
+            db_path: データベースファイルのパス
+            busy_timeout: ロック解除を待つ最大時間（秒）
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.logger = logging.getLogger(__name__)
+        
+        self._local = threading.local()
+        # 書き込みはプロセス内で1つずつ（SQLiteの書き込みロック待ちを避ける）
+        self._write_lock = threading.RLock()
+        # スレッド → (スレッド, 接続)。終了したスレッドの接続は次回接続時に閉じる
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._connections_lock = threading.Lock()
+        self._wal_enabled = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        """新しい接続を作成してPRAGMAを設定"""
+        # トランザクションは transaction() で明示的に開始する
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        for name, value in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {name} = {value}")
+        
+        with self._connections_lock:
+            if not self._wal_enabled:
+                # 新規ファイルでは削除後の空きページを incremental_vacuum で返せるようにする
+                # （WALより前に設定する必要がある。既存のデータベースでは VACUUM まで反映されない）
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                # WALはデータベースファイルに保存されるため最初の接続で1回だけ設定
+                mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+                if mode.lower() != "wal":
+                    self.logger.warning(f"WALモードを有効化できません: {mode}")
+                self._wal_enabled = True
+            
+            for ident, (thread, stale_conn) in list(self._connections.items()):
+                if not thread.is_alive():
+                    stale_conn.close()
+                    del self._connections[ident]
+            
+            current = threading.current_thread()
+            self._connections[current.ident] = (current, conn)
+        
+        return conn
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        現在のスレッド用の接続を取得（初回のみ接続）
+        
+        Returns:
+            sqlite3.Connection: 自動コミットモードの接続
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """
+        読み取り用の接続を取得
+        
+        Yields:
+            sqlite3.Connection: 現在のスレッドの接続
+        """
+        yield self.get_connection()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        書き込みトランザクションを実行
+        
+        BEGIN IMMEDIATE で開始し、正常終了でコミット、例外でロールバックする。
+        同じスレッドで入れ子になった場合は外側のトランザクションに含める。
+        
+        Yields:
+            sqlite3.Connection: 現在のスレッドの接続
+        """
+        conn = self.get_connection()
+        
+        with self._write_lock:
+            if self._local.depth:
+                self._local.depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._local.depth -= 1
+                return
+            
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.depth = 1
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._local.depth = 0
+    
+    @contextmanager
+    def write_lock(self):
+        """
+        トランザクションを開始せずに書き込みロックを取得（VACUUM などトランザクション外で実行する処理用）
+        
+        Yields:
+            sqlite3.Connection: 現在のスレッドの接続
+        """
+        conn = self.get_connection()
+        
+        with self._write_lock:
+            if conn.in_transaction:
+                raise sqlite3.OperationalError("トランザクション中は実行できません")
+            yield conn
+    
+    def close(self):
+        """すべてのスレッドの接続を閉じる"""
+        with self._connections_lock:
+            for _, conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+def get_connection_manager(db_path: str) -> ConnectionManager:
+    """
+    データベースファイルごとに共有される接続管理インスタンスを取得
+    
+    Args:
+        db_path: データベースファイルのパス
+    
+    Returns:
+        ConnectionManager: 接続管理インスタンス
+    """
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
@@ -5,10 +5,41 @@
 import sqlite3
 import logging
 import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import re
+import time
+from datetime import date, datetime
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Tuple, Union
 from pathlib import Path
 
+from src.database.archive import commit_archive, discard_archive, stage_archive
+from src.database.connection_manager import get_connection_manager
+from src.database.migrations import migrate
+from src.database.usage_recorder import get_usage_recorder
+
+# 市場データロールアップの解像度と1バケットの秒数（細かい順）
+ROLLUP_RESOLUTIONS = [("1m", 60), ("1h", 3600), ("1d", 86400)]
+
+# 市場データの保持期間（生データは時間、ロールアップは日数。None は無期限）
+MARKET_RAW_RETENTION_HOURS = 48
+ROLLUP_RETENTION_DAYS = {"1m": 7, "1h": 90, "1d": None}
+
+# get_market_trends が返す最大点数の目安
+MAX_TREND_POINTS = 500
+
+# ストリーミング読み出しで1回に fetchmany する行数
+FETCH_BATCH_SIZE = 500
+
+# クリーンアップで1トランザクションに削除する行数と、チャンク間の待ち時間（秒）
+CLEANUP_CHUNK_SIZE = 2000
+CLEANUP_PAUSE_SECONDS = 0.05
+
+# incremental vacuum で1回に解放するページ数
+VACUUM_CHUNK_PAGES = 1000
+
+# 一括挿入で行単位の再試行に切り替えるエラー（値の型・制約違反）
+ROW_ERRORS = (sqlite3.InterfaceError, sqlite3.ProgrammingError, sqlite3.IntegrityError, sqlite3.DataError)
+
 class DatabaseManager:
     """データベース管理クラス"""
     
@@ -25,177 +56,147 @@ class DatabaseManager:
         # データベースディレクトリを作成
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
+        # スレッドごとに再利用するWALモードの接続（同じファイルのインスタンス間で共有）
+        self.connections = get_connection_manager(db_path)
+        
+        # API使用状況はバッファしてバックグラウンドでまとめて書き込む
+        self.usage_recorder = get_usage_recorder(self.connections)
+        
         # データベースとテーブルを初期化
         self._init_database()
     
     def _init_database(self):
-        """データベースとテーブルを初期化"""
+        """データベースとテーブルを初期化（未適用のマイグレーションを適用）"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # ニュースデータテーブル
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS news_data (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        url TEXT UNIQUE NOT NULL,
-                        content TEXT,
-                        source TEXT NOT NULL,
-                        publish_date DATETIME,
-                        collect_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        sentiment_score REAL,
-                        importance_score REAL,
-                        processed BOOLEAN DEFAULT 0
-                    )
-                ''')
-                
-                # 市場データテーブル
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS market_data (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        symbol TEXT NOT NULL,
-                        price REAL NOT NULL,
-                        market_cap REAL,
-                        volume_24h REAL,
-                        price_change_24h REAL,
-                        price_change_percentage_24h REAL,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # 生成記事テーブル
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS generated_articles (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        content TEXT NOT NULL,
-                        article_type TEXT NOT NULL,
-                        category TEXT,
-                        tags TEXT,
-                        word_count INTEGER,
-                        generation_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        published BOOLEAN DEFAULT 0,
-                        wp_post_id INTEGER,
-                        wp_publish_date DATETIME,
-                        source_news_ids TEXT,
-                        metadata TEXT
-                    )
-                ''')
-                
-                # 投稿履歴テーブル
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS publish_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        article_id INTEGER NOT NULL,
-                        wp_post_id INTEGER,
-                        publish_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        status TEXT NOT NULL,
-                        error_message TEXT,
-                        FOREIGN KEY (article_id) REFERENCES generated_articles (id)
-                    )
-                ''')
-                
-                # API使用状況テーブル
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS api_usage (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        api_name TEXT NOT NULL,
-                        endpoint TEXT,
-                        request_count INTEGER DEFAULT 1,
-                        date DATE DEFAULT CURRENT_DATE,
-                        response_time REAL,
-                        status_code INTEGER,
-                        error_message TEXT
-                    )
-                ''')
-                
-                conn.commit()
-                self.logger.info("データベース初期化完了")
+            applied = migrate(self.connections)
+            if applied:
+                self.logger.info(f"データベース初期化完了（マイグレーション {applied}件を適用）")
                 
         except Exception as e:
             self.logger.error(f"データベース初期化エラー: {e}")
             raise
     
-    def save_news_data(self, news_items: List[Dict[str, Any]]) -> int:
+    def bulk_insert(self, table: str, columns: List[str], rows: Iterable[Sequence[Any]],
+                    conflict: Optional[str] = "IGNORE", chunk_size: int = 1000) -> Dict[str, int]:
         """
-        ニュースデータを保存
+        複数行を一括で挿入
+        
+        rows は chunk_size 行ずつ取り出し、チャンクごとに1トランザクションで
+        executemany する。ジェネレーターも受け付けるため全件をメモリに載せる必要はない。
+        チャンク内に型エラーなどで挿入できない行があった場合は、そのチャンクだけ
+        1行ずつ挿入し直して該当行をスキップする。
         
         Args:
-            news_items: ニュースアイテムのリスト
+            table: テーブル名
+            columns: 列名リスト
+            rows: 列順の値のタプルを返すイテラブル
+            conflict: 制約違反時の動作（"IGNORE" / "REPLACE"、None で通常のINSERT）
+            chunk_size: 1トランザクションあたりの行数
+        
+        Returns:
+            Dict[str, int]: inserted（挿入行数）, ignored（挿入されなかった行数）
+        """
+        verb = f"INSERT OR {conflict}" if conflict else "INSERT"
+        sql = (
+            f"{verb} INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        
+        counts = {'inserted': 0, 'ignored': 0}
+        iterator = iter(rows)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            try:
+                with self.connections.transaction() as conn:
+                    # executemany の rowcount は各行の changes() の合計（トリガーによる変更は含まない）
+                    inserted = conn.executemany(sql, chunk).rowcount
+            except ROW_ERRORS as e:
+                self.logger.warning(f"{table} 一括挿入エラー、1行ずつ再試行: {e}")
+                inserted = 0
+                with self.connections.transaction() as conn:
+                    for row in chunk:
+                        try:
+                            inserted += conn.execute(sql, row).rowcount
+                        except ROW_ERRORS as row_error:
+                            self.logger.warning(f"{table} 行の保存エラー: {row_error}")
+            
+            counts['inserted'] += inserted
+            counts['ignored'] += len(chunk) - inserted
+        
+        return counts
+    
+    def save_news_data(self, news_items: Iterable[Dict[str, Any]]) -> int:
+        """
+        ニュースデータを保存（URLが既存のものは無視）
+        
+        Args:
+            news_items: ニュースアイテムのリスト（ジェネレーターも可）
             
         Returns:
             int: 保存されたアイテム数
         """
+        rows = (
+            (
+                item.get('title', ''),
+                item.get('url', ''),
+                item.get('content', ''),
+                item.get('source', ''),
+                item.get('publish_date'),
+                item.get('sentiment_score'),
+                item.get('importance_score')
+            )
+            for item in news_items
+        )
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                saved_count = 0
-                
-                for item in news_items:
-                    try:
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO news_data 
-                            (title, url, content, source, publish_date, sentiment_score, importance_score)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            item.get('title', ''),
-                            item.get('url', ''),
-                            item.get('content', ''),
-                            item.get('source', ''),
-                            item.get('publish_date'),
-                            item.get('sentiment_score'),
-                            item.get('importance_score')
-                        ))
-                        
-                        if cursor.rowcount > 0:
-                            saved_count += 1
-                            
-                    except Exception as e:
-                        self.logger.warning(f"ニュース保存エラー: {e}")
-                        continue
-                
-                conn.commit()
-                self.logger.info(f"ニュースデータ {saved_count}件を保存")
-                return saved_count
+            counts = self.bulk_insert(
+                'news_data',
+                ['title', 'url', 'content', 'source', 'publish_date', 'sentiment_score', 'importance_score'],
+                rows
+            )
+            self.logger.info(f"ニュースデータ {counts['inserted']}件を保存（重複 {counts['ignored']}件）")
+            return counts['inserted']
                 
         except Exception as e:
             self.logger.error(f"ニュースデータ保存エラー: {e}")
             return 0
     
-    def save_market_data(self, market_data: List[Dict[str, Any]]) -> int:
+    def save_market_data(self, market_data: Iterable[Dict[str, Any]]) -> int:
         """
         市場データを保存
         
         Args:
-            market_data: 市場データのリスト
+            market_data: 市場データのリスト（ジェネレーターも可）
             
         Returns:
             int: 保存されたアイテム数
         """
+        rows = (
+            (
+                item.get('symbol', ''),
+                item.get('price', 0),
+                item.get('market_cap', 0),
+                item.get('volume_24h', 0),
+                item.get('price_change_24h', 0),
+                item.get('price_change_percentage_24h', 0)
+            )
+            for item in market_data
+        )
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                saved_count = 0
-                
-                for item in market_data:
-                    cursor.execute('''
-                        INSERT INTO market_data 
-                        (symbol, price, market_cap, volume_24h, price_change_24h, price_change_percentage_24h)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        item.get('symbol', ''),
-                        item.get('price', 0),
-                        item.get('market_cap', 0),
-                        item.get('volume_24h', 0),
-                        item.get('price_change_24h', 0),
-                        item.get('price_change_percentage_24h', 0)
-                    ))
-                    saved_count += 1
-                
-                conn.commit()
-                self.logger.info(f"市場データ {saved_count}件を保存")
-                return saved_count
+            counts = self.bulk_insert(
+                'market_data',
+                ['symbol', 'price', 'market_cap', 'volume_24h', 'price_change_24h',
+                 'price_change_percentage_24h'],
+                rows,
+                conflict=None
+            )
+            self.logger.info(f"市場データ {counts['inserted']}件を保存")
+            return counts['inserted']
                 
         except Exception as e:
             self.logger.error(f"市場データ保存エラー: {e}")
@@ -213,7 +214,7 @@ class DatabaseManager:
             int: 記事ID
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
                 
                 # 記事を保存
@@ -251,7 +252,6 @@ class DatabaseManager:
                         wp_result.get('error_message')
                     ))
                 
-                conn.commit()
                 self.logger.info(f"記事ID {article_id} を保存")
                 return article_id
                 
@@ -259,6 +259,50 @@ class DatabaseManager:
             self.logger.error(f"記事保存エラー: {e}")
             return 0
     
+    def _iter_rows(self, sql: str, params: Sequence[Any] = (),
+                   batch_size: int = FETCH_BATCH_SIZE,
+                   batches: bool = False) -> Iterator[Union[sqlite3.Row, List[sqlite3.Row]]]:
+        """
+        クエリ結果を fetchmany で少しずつ読み出す
+        
+        行は sqlite3.Row（列名・位置の両方で参照でき、dict(row) で辞書に変換できる）。
+        全件をリストに展開しないため、件数が多くてもメモリ使用量は batch_size 件分で済む。
+        
+        Args:
+            sql: SELECT 文
+            params: パラメータ
+            batch_size: 1回に読み出す行数
+            batches: True なら行ではなく batch_size 件ずつのリストを返す
+        
+        Yields:
+            sqlite3.Row または List[sqlite3.Row]
+        """
+        with self.connections.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            try:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    if batches:
+                        yield rows
+                    else:
+                        yield from rows
+            finally:
+                cursor.close()
+    
+    @staticmethod
+    def _recent_news_query(days: int, limit: Optional[int]) -> Tuple[str, Tuple]:
+        """最近のニュースを取得するクエリ（limit=None は無制限）"""
+        return '''
+            SELECT * FROM news_data 
+            WHERE collect_date >= datetime('now', ?)
+            ORDER BY importance_score DESC, collect_date DESC
+            LIMIT ?
+        ''', (f"-{int(days)} days", -1 if limit is None else limit)
+    
     def get_recent_news(self, days: int = 7, limit: int = 100) -> List[Dict[str, Any]]:
         """
         最近のニュースを取得
@@ -271,131 +315,692 @@ class DatabaseManager:
             List[Dict]: ニュースリスト
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            return [dict(row) for row in self.iter_recent_news(days, limit)]
+                
+        except Exception as e:
+            self.logger.error(f"ニュース取得エラー: {e}")
+            return []
+    
+    def iter_recent_news(self, days: int = 7, limit: Optional[int] = None,
+                         batch_size: int = FETCH_BATCH_SIZE,
+                         batches: bool = False) -> Iterator[Union[sqlite3.Row, List[sqlite3.Row]]]:
+        """
+        最近のニュースを重要度順に1件ずつ読み出す（get_recent_news のストリーミング版）
+        
+        Args:
+            days: 取得する日数
+            limit: 取得する最大件数（None は無制限）
+            batch_size: 1回に読み出す行数
+            batches: True なら batch_size 件ずつのリストを返す
+        
+        Yields:
+            sqlite3.Row: news_data の行（batches=True の場合はそのリスト）
+        
+        Raises:
+            sqlite3.Error: 読み出しエラー
+        """
+        sql, params = self._recent_news_query(days, limit)
+        return self._iter_rows(sql, params, batch_size, batches)
+    
+    def search_news(self, query: str, since: Optional[datetime] = None,
+                    limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        ニュースを全文検索（BM25の関連度順、タイトルの一致を重視）
+        
+        空白区切りの語をすべて含む記事を返す。各語はフレーズとして扱うため
+        FTS5の演算子は解釈しない。3文字未満の語は trigram インデックスで引けないため
+        LIKE で絞り込む。
+        
+        Args:
+            query: 検索語（空白区切り）
+            since: この日時以降に公開（公開日時が不明なら収集）された記事のみ
+            limit: 取得する最大件数
+        
+        Returns:
+            List[Dict]: ニュースリスト（relevance: 関連度。大きいほど関連が高い）
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        
+        try:
+            with self.connections.connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    SELECT * FROM news_data 
-                    WHERE collect_date >= datetime('now', '-{} days')
-                    ORDER BY importance_score DESC, collect_date DESC
-                    LIMIT ?
-                '''.format(days), (limit,))
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'")
+                fts_enabled = cursor.fetchone() is not None
                 
-                columns = [desc[0] for desc in cursor.description]
-                results = []
+                match_terms = [term for term in terms if len(term) >= 3] if fts_enabled else []
+                like_terms = [term for term in terms if term not in match_terms]
+                
+                conditions = []
+                params: List[Any] = []
+                for term in like_terms:
+                    pattern = "%" + re.sub(r"([\\%_])", r"\\\1", term) + "%"
+                    conditions.append("(n.title LIKE ? ESCAPE '\\' OR n.content LIKE ? ESCAPE '\\')")
+                    params.extend([pattern, pattern])
                 
-                for row in cursor.fetchall():
-                    row_dict = dict(zip(columns, row))
-                    results.append(row_dict)
+                if since:
+                    conditions.append("COALESCE(n.publish_date, n.collect_date) >= ?")
+                    params.append(since.isoformat(sep=' '))
                 
-                return results
+                if match_terms:
+                    match_query = " ".join('"' + term.replace('"', '""') + '"' for term in match_terms)
+                    where = " AND ".join(["news_fts MATCH ?"] + conditions)
+                    cursor.execute(f'''
+                        SELECT n.*, -bm25(news_fts, 10.0, 1.0) AS relevance
+                        FROM news_fts
+                        JOIN news_data n ON n.id = news_fts.rowid
+                        WHERE {where}
+                        ORDER BY bm25(news_fts, 10.0, 1.0)
+                        LIMIT ?
+                    ''', [match_query] + params + [limit])
+                else:
+                    cursor.execute(f'''
+                        SELECT n.*, 0.0 AS relevance
+                        FROM news_data n
+                        WHERE {" AND ".join(conditions)}
+                        ORDER BY n.importance_score DESC, n.collect_date DESC
+                        LIMIT ?
+                    ''', params + [limit])
                 
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
         except Exception as e:
-            self.logger.error(f"ニュース取得エラー: {e}")
+            self.logger.error(f"ニュース検索エラー: {e}")
             return []
     
-    def get_market_trends(self, symbol: str, hours: int = 24) -> List[Dict[str, Any]]:
+    def get_market_trends(self, symbol: str, hours: int = 24,
+                          resolution: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         市場トレンドを取得
         
+        生データの保持期間（MARKET_RAW_RETENTION_HOURS）以内は生データの行をそのまま返す。
+        それより長い期間は点数が MAX_TREND_POINTS 以下になるロールアップを使う
+        （約20日までは1時間足、それ以上は日足）。
+        
         Args:
             symbol: 通貨シンボル
             hours: 取得する時間数
+            resolution: 解像度の指定（"1m" / "1h" / "1d"、"raw" で生データ）
             
         Returns:
-            List[Dict]: 市場データリスト
+            List[Dict]: 市場データリスト（新しい順）。生データは market_data の全列。
+                ロールアップの場合は列が異なり、symbol/resolution/open/high/low/close/volume/market_cap/samples と、
+                close を price、バケット開始時刻を timestamp として含む（id・price_change_* 列はない）
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT * FROM market_data 
-                    WHERE symbol = ? AND timestamp >= datetime('now', '-{} hours')
-                    ORDER BY timestamp DESC
-                '''.format(hours), (symbol,))
-                
-                columns = [desc[0] for desc in cursor.description]
-                results = []
-                
-                for row in cursor.fetchall():
-                    row_dict = dict(zip(columns, row))
-                    results.append(row_dict)
-                
-                return results
+            return [dict(row) for row in self.iter_market_trends(symbol, hours, resolution)]
                 
         except Exception as e:
             self.logger.error(f"市場データ取得エラー: {e}")
             return []
     
+    def iter_market_trends(self, symbol: str, hours: int = 24, resolution: Optional[str] = None,
+                           batch_size: int = FETCH_BATCH_SIZE,
+                           batches: bool = False) -> Iterator[Union[sqlite3.Row, List[sqlite3.Row]]]:
+        """
+        市場トレンドを新しい順に1件ずつ読み出す（get_market_trends のストリーミング版）
+        
+        Args:
+            symbol: 通貨シンボル
+            hours: 取得する時間数
+            resolution: 解像度の指定（省略時は select_trend_resolution、"raw" で生データ）
+            batch_size: 1回に読み出す行数
+            batches: True なら batch_size 件ずつのリストを返す
+        
+        Yields:
+            sqlite3.Row: get_market_trends と同じ列の行（batches=True の場合はそのリスト）
+        
+        Raises:
+            sqlite3.Error: 読み出しエラー
+        """
+        if resolution is None:
+            resolution = self.select_trend_resolution(hours)
+        
+        if resolution == "raw":
+            sql = '''
+                SELECT * FROM market_data 
+                WHERE symbol = ? AND timestamp >= datetime('now', ?)
+                ORDER BY timestamp DESC
+            '''
+            params = (symbol, f"-{int(hours)} hours")
+        else:
+            sql = '''
+                SELECT symbol, resolution, bucket AS timestamp, close AS price,
+                       open, high, low, close, volume, market_cap, samples
+                FROM market_rollups
+                WHERE symbol = ? AND resolution = ? AND bucket >= datetime('now', ?)
+                ORDER BY bucket DESC
+            '''
+            params = (symbol, resolution, f"-{int(hours)} hours")
+        
+        return self._iter_rows(sql, params, batch_size, batches)
+    
+    def get_market_history(self, symbols: Iterable[str], hours: int = 168) -> Dict[str, Dict[str, Any]]:
+        """
+        通貨ごとの期間中の値動きを集計（ロールアップを新しい順に読み、全件は保持しない）
+        
+        Args:
+            symbols: 通貨シンボル
+            hours: 対象の時間数
+        
+        Returns:
+            Dict: シンボル → open/high/low/close/change_percentage/start/end/points
+                （期間中のデータがない通貨は含まない）
+        """
+        history = {}
+        
+        # OHLC 列が必要なため、生データが返る短い期間でも最も細かいロールアップを使う
+        resolution = self.select_trend_resolution(hours)
+        if resolution == "raw":
+            resolution = ROLLUP_RESOLUTIONS[0][0]
+        
+        try:
+            for symbol in symbols:
+                summary = None
+                for row in self.iter_market_trends(symbol, hours, resolution):
+                    if summary is None:
+                        summary = {
+                            'close': row['close'], 'high': row['high'], 'low': row['low'],
+                            'end': row['timestamp'], 'points': 0
+                        }
+                    summary['open'] = row['open']
+                    summary['start'] = row['timestamp']
+                    summary['high'] = max(summary['high'], row['high'])
+                    summary['low'] = min(summary['low'], row['low'])
+                    summary['points'] += 1
+                
+                if summary is None:
+                    continue
+                summary['change_percentage'] = (
+                    (summary['close'] - summary['open']) / summary['open'] * 100
+                    if summary['open'] else None
+                )
+                history[symbol] = summary
+        
+        except Exception as e:
+            self.logger.error(f"市場履歴取得エラー: {e}")
+        
+        return history
+    
+    @staticmethod
+    def select_trend_resolution(hours: int) -> str:
+        """
+        期間に対して使う解像度を選択
+        
+        生データが残っている期間は生データ、それより長い期間は点数が MAX_TREND_POINTS 以下の
+        うち最も細かいロールアップ。
+        
+        Args:
+            hours: 期間（時間）
+        
+        Returns:
+            str: 解像度（"raw" / "1m" / "1h" / "1d"）
+        """
+        if hours <= MARKET_RAW_RETENTION_HOURS:
+            return "raw"
+        
+        window = hours * 3600
+        for resolution, bucket_seconds in ROLLUP_RESOLUTIONS:
+            retention_days = ROLLUP_RETENTION_DAYS[resolution]
+            if window / bucket_seconds > MAX_TREND_POINTS:
+                continue
+            if retention_days is not None and window > retention_days * 86400:
+                continue
+            return resolution
+        return ROLLUP_RESOLUTIONS[-1][0]
+    
     def record_api_usage(self, api_name: str, endpoint: str = None, 
                         response_time: float = None, status_code: int = None,
-                        error_message: str = None):
+                        error_message: str = None, response_bytes: int = None):
         """
         API使用状況を記録
         
+        書き込みはバッファされ、同じ日・API・エンドポイント・ステータスの呼び出しは
+        1行（request_count 件、レイテンシの合計・最大、バイト数の合計）にまとめて保存される。
+        
         Args:
             api_name: API名
             endpoint: エンドポイント
             response_time: レスポンス時間
             status_code: ステータスコード
             error_message: エラーメッセージ
+            response_bytes: レスポンスのバイト数
+        """
+        try:
+            self.usage_recorder.record(api_name, endpoint, response_time, status_code,
+                                       error_message, response_bytes)
+                
+        except Exception as e:
+            self.logger.error(f"API使用状況記録エラー: {e}")
+    
+    def flush_api_usage(self) -> int:
+        """
+        バッファ中のAPI使用状況とフィード計測を書き込む
+        
+        Returns:
+            int: 書き込んだ件数
+        """
+        return self.usage_recorder.flush()
+    
+    def record_feed_metrics(self, source: str, metrics: Dict[str, Any]):
+        """
+        フィード1回分の取得・解析の計測値を api_usage に記録
+        
+        取得ワーカーで書き込み待ちが発生しないよう、api_usage と同じくバッファに
+        ためてバックグラウンドでまとめて書き込む（即時に必要なら flush_api_usage）。
+        
+        Args:
+            source: ソース名（endpoint 列に保存）
+            metrics: status_code, response_time, error_message と FEED_METRIC_COLUMNS・FEED_TIMING_COLUMNS の各値
+        """
+        try:
+            self.usage_recorder.record_feed(source, metrics)
+        
+        except Exception as e:
+            self.logger.error(f"フィード計測記録エラー: {e}")
+    
+    def get_feed_cost_summary(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        フィードごとのコストを集計（採用記事1件あたりのコストが高い順）
+        
+        Args:
+            days: 集計する日数
+        
+        Returns:
+            List[Dict]: ソースごとの取得回数・平均時間・転送量・解析件数・採用件数など
+                （avg_connect_time は新しく張った接続のみの平均、bytes_per_kept_entry は受信バイト数基準）
+        """
+        # バッファ中の計測値も集計に含める
+        self.flush_api_usage()
+        
+        try:
+            with self.connections.connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT
+                        endpoint AS source,
+                        COUNT(*) AS runs,
+                        SUM(CASE WHEN status_code = 304 THEN 1 ELSE 0 END) AS not_modified,
+                        SUM(CASE WHEN error_message IS NOT NULL THEN 1 ELSE 0 END) AS errors,
+                        SUM(CASE WHEN bozo_error IS NOT NULL THEN 1 ELSE 0 END) AS bozo_errors,
+                        AVG(response_time) AS avg_response_time,
+                        AVG(connect_time) AS avg_connect_time,
+                        SUM(CASE WHEN connect_time IS NOT NULL THEN 1 ELSE 0 END) AS new_connections,
+                        AVG(ttfb_time) AS avg_ttfb_time,
+                        AVG(transfer_time) AS avg_transfer_time,
+                        AVG(parse_cpu_time) AS avg_parse_cpu_time,
+                        SUM(bytes) AS total_bytes,
+                        SUM(wire_bytes) AS total_wire_bytes,
+                        SUM(entries_parsed) AS entries_parsed,
+                        SUM(entries_kept) AS entries_kept,
+                        (SUM(COALESCE(response_time, 0)) + SUM(COALESCE(parse_cpu_time, 0)))
+                            / MAX(SUM(COALESCE(entries_kept, 0)), 1) AS seconds_per_kept_entry,
+                        SUM(COALESCE(wire_bytes, bytes, 0)) / MAX(SUM(COALESCE(entries_kept, 0)), 1) AS bytes_per_kept_entry
+                    FROM api_usage
+                    WHERE api_name = 'rss' AND date >= date('now', ?)
+                    GROUP BY endpoint
+                    ORDER BY seconds_per_kept_entry DESC, errors DESC
+                ''', (f"-{days} days",))
+                
+                columns = [description[0] for description in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        except Exception as e:
+            self.logger.error(f"フィードコスト集計エラー: {e}")
+            return []
+    
+    def get_feed_validators(self, feed_url: str) -> Dict[str, Optional[str]]:
+        """
+        フィードの検証子（ETag / Last-Modified）を取得
+        
+        Args:
+            feed_url: フィードURL
+            
+        Returns:
+            Dict: etag と last_modified（未保存の場合は None）、
+                cached（304 のときに解析し直せる本体が保存済みか）
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.connection() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
-                    INSERT INTO api_usage 
-                    (api_name, endpoint, response_time, status_code, error_message)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (api_name, endpoint, response_time, status_code, error_message))
+                    SELECT etag, last_modified, body IS NOT NULL FROM feed_cache
+                    WHERE feed_url = ?
+                ''', (feed_url,))
                 
-                conn.commit()
+                row = cursor.fetchone()
+                if row:
+                    return {'etag': row[0], 'last_modified': row[1], 'cached': bool(row[2])}
                 
         except Exception as e:
-            self.logger.error(f"API使用状況記録エラー: {e}")
+            self.logger.error(f"フィード検証子取得エラー: {e}")
+        
+        return {'etag': None, 'last_modified': None, 'cached': False}
     
-    def get_daily_stats(self) -> Dict[str, Any]:
+    def get_cached_feed(self, feed_url: str) -> Optional[Dict[str, Any]]:
         """
-        日次統計を取得
+        検証子と一緒に保存したフィード本体を取得（304 Not Modified の応答で使う）
         
+        Args:
+            feed_url: フィードURL
+            
         Returns:
-            Dict: 統計データ
+            Optional[Dict]: content（バイト列）と content_type（未保存の場合は None）
+        """
+        try:
+            with self.connections.connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT body, content_type FROM feed_cache
+                    WHERE feed_url = ? AND body IS NOT NULL
+                ''', (feed_url,))
+                
+                row = cursor.fetchone()
+                if row:
+                    return {'content': bytes(row[0]), 'content_type': row[1]}
+                
+        except Exception as e:
+            self.logger.error(f"フィード本体取得エラー: {e}")
+        
+        return None
+    
+    def save_feed_validators(self, feed_url: str, etag: Optional[str] = None,
+                             last_modified: Optional[str] = None,
+                             content: Optional[bytes] = None, content_type: Optional[str] = None):
+        """
+        フィードの検証子（ETag / Last-Modified）と本体を保存
+        
+        Args:
+            feed_url: フィードURL
+            etag: ETagヘッダー値
+            last_modified: Last-Modifiedヘッダー値
+            content: 検証子に対応するフィード本体
+            content_type: Content-Typeヘッダー値
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
                 
-                stats = {}
+                cursor.execute('''
+                    INSERT INTO feed_cache (feed_url, etag, last_modified, body, content_type, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(feed_url) DO UPDATE SET
+                        etag = excluded.etag,
+                        last_modified = excluded.last_modified,
+                        body = excluded.body,
+                        content_type = excluded.content_type,
+                        updated_at = excluded.updated_at
+                ''', (feed_url, etag, last_modified,
+                      sqlite3.Binary(content) if content is not None else None, content_type))
+                
+        except Exception as e:
+            self.logger.error(f"フィード検証子保存エラー: {e}")
+    
+    def get_feed_watermark(self, source: str) -> Dict[str, Any]:
+        """
+        ソースの差分収集状態を取得
+        
+        Args:
+            source: ソース名
+            
+        Returns:
+            Dict: last_published（datetime または None）、seen_hashes（新しい順のリスト）、
+                feed_version（最後に処理したフィードの版。不明なら None）
+        """
+        try:
+            with self.connections.connection() as conn:
+                cursor = conn.cursor()
                 
-                # 今日収集したニュース数
                 cursor.execute('''
-                    SELECT COUNT(*) FROM news_data 
-                    WHERE date(collect_date) = date('now')
-                ''')
-                stats['news_collected_today'] = cursor.fetchone()[0]
+                    SELECT last_published, seen_hashes, feed_version FROM feed_watermarks
+                    WHERE source = ?
+                ''', (source,))
+                
+                row = cursor.fetchone()
+                if row:
+                    return {
+                        'last_published': datetime.fromisoformat(row[0]) if row[0] else None,
+                        'seen_hashes': json.loads(row[1]) if row[1] else [],
+                        'feed_version': row[2]
+                    }
+                
+        except Exception as e:
+            self.logger.error(f"差分収集状態取得エラー: {e}")
+        
+        return {'last_published': None, 'seen_hashes': [], 'feed_version': None}
+    
+    def save_feed_watermark(self, source: str, last_published: Optional[datetime] = None,
+                            seen_hashes: Optional[List[str]] = None,
+                            feed_version: Optional[str] = None):
+        """
+        ソースの差分収集状態を保存
+        
+        Args:
+            source: ソース名
+            last_published: 処理済み記事の最新公開日時
+            seen_hashes: 最近処理したURLハッシュ（新しい順）
+            feed_version: 処理したフィードの版（ETag / Last-Modified）
+        """
+        try:
+            with self.connections.transaction() as conn:
+                cursor = conn.cursor()
                 
-                # 今日生成した記事数
                 cursor.execute('''
-                    SELECT COUNT(*) FROM generated_articles 
-                    WHERE date(generation_date) = date('now')
-                ''')
-                stats['articles_generated_today'] = cursor.fetchone()[0]
+                    INSERT INTO feed_watermarks (source, last_published, seen_hashes, feed_version, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(source) DO UPDATE SET
+                        last_published = excluded.last_published,
+                        seen_hashes = excluded.seen_hashes,
+                        feed_version = excluded.feed_version,
+                        updated_at = excluded.updated_at
+                ''', (
+                    source,
+                    last_published.isoformat(sep=' ') if last_published else None,
+                    json.dumps(seen_hashes or []),
+                    feed_version
+                ))
+                
+        except Exception as e:
+            self.logger.error(f"差分収集状態保存エラー: {e}")
+    
+    def load_trending_terms(self, since: float) -> List[Dict[str, Any]]:
+        """
+        トレンド語の集計結果を取得
+        
+        Args:
+            since: この時刻（UNIX秒）以降に出現した語のみ取得
+            
+        Returns:
+            List[Dict]: term, kind, score, last_seen, updated_at のリスト
+        """
+        try:
+            with self.connections.connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT term, kind, score, last_seen, updated_at FROM trending_terms
+                    WHERE last_seen >= ?
+                ''', (since,))
+                
+                columns = [description[0] for description in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            self.logger.error(f"トレンド語取得エラー: {e}")
+            return []
+    
+    def load_trending_observed(self, since: float) -> List[str]:
+        """
+        トレンド集計済みの記事IDを取得
+        
+        Args:
+            since: この時刻（UNIX秒）以降に集計した記事のみ取得
+            
+        Returns:
+            List[str]: 記事ID（集計した順）
+        """
+        try:
+            with self.connections.connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT item_id FROM trending_observed
+                    WHERE observed_at >= ?
+                    ORDER BY observed_at
+                ''', (since,))
+                
+                return [row[0] for row in cursor.fetchall()]
+                
+        except Exception as e:
+            self.logger.error(f"トレンド集計済み記事取得エラー: {e}")
+            return []
+    
+    def save_trending_terms(self, terms: List[Dict[str, Any]],
+                            observed: Optional[List[Tuple[str, float]]] = None,
+                            expire_before: Optional[float] = None):
+        """
+        トレンド語の集計結果と、集計済みの記事IDを同じトランザクションで保存
+        
+        Args:
+            terms: term, kind, score, last_seen, updated_at のリスト
+            observed: 新しく集計した (記事ID, 集計時刻) のリスト
+            expire_before: この時刻（UNIX秒）より前に集計した記事IDは削除する
+        """
+        try:
+            with self.connections.transaction() as conn:
+                cursor = conn.cursor()
+                
+                cursor.executemany('''
+                    INSERT INTO trending_terms (term, kind, score, last_seen, updated_at)
+                    VALUES (:term, :kind, :score, :last_seen, :updated_at)
+                    ON CONFLICT(term) DO UPDATE SET
+                        kind = excluded.kind,
+                        score = excluded.score,
+                        last_seen = excluded.last_seen,
+                        updated_at = excluded.updated_at
+                ''', terms)
+                
+                if observed:
+                    cursor.executemany('''
+                        INSERT OR IGNORE INTO trending_observed (item_id, observed_at)
+                        VALUES (?, ?)
+                    ''', observed)
+                
+                if expire_before is not None:
+                    cursor.execute('''
+                        DELETE FROM trending_observed WHERE observed_at < ?
+                    ''', (expire_before,))
+                
+        except Exception as e:
+            self.logger.error(f"トレンド語保存エラー: {e}")
+    
+    def save_artifact(self, kind: str, payload: Any, name: Optional[str] = None) -> Optional[int]:
+        """
+        受け渡しデータを保存（追記のみ。既存の行は書き換えない）
+        
+        Args:
+            kind: 種類（"collected_news" / "article_candidates" / "generated_article" / "publish_history" など）
+            payload: JSONに変換できるデータ
+            name: 表示用の名前（記事タイトルなど）
+        
+        Returns:
+            Optional[int]: 保存した行のID（失敗時は None）
+        """
+        try:
+            with self.connections.transaction() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    INSERT INTO artifacts (kind, name, payload)
+                    VALUES (?, ?, ?)
+                ''', (kind, name, json.dumps(payload, ensure_ascii=False, default=str)))
+                
+                return cursor.lastrowid
+        
+        except Exception as e:
+            self.logger.error(f"受け渡しデータ保存エラー: {e}")
+            return None
+    
+    def get_latest_artifact(self, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        種類ごとの最新の受け渡しデータを取得
+        
+        Args:
+            kind: 種類
+        
+        Returns:
+            Optional[Dict]: id, kind, name, created_at, payload（見つからなければ None）
+        """
+        try:
+            return next(self.iter_artifacts(kind, limit=1), None)
+        
+        except Exception as e:
+            self.logger.error(f"受け渡しデータ取得エラー: {e}")
+            return None
+    
+    def iter_artifacts(self, kind: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        受け渡しデータを新しい順に読み出す
+        
+        Args:
+            kind: 種類
+            limit: 取得する最大件数（None は無制限）
+        
+        Yields:
+            Dict: id, kind, name, created_at, payload（JSONを展開したデータ）
+        
+        Raises:
+            sqlite3.Error: 読み出しエラー
+        """
+        rows = self._iter_rows('''
+            SELECT id, kind, name, created_at, payload FROM artifacts
+            WHERE kind = ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (kind, -1 if limit is None else limit))
+        
+        for row in rows:
+            artifact = dict(row)
+            artifact['payload'] = json.loads(artifact['payload'])
+            yield artifact
+    
+    def get_daily_stats(self) -> Dict[str, Any]:
+        """
+        日次統計を取得
+        
+        Returns:
+            Dict: 統計データ
+        """
+        # バッファ中のAPI使用状況も集計に含める
+        self.flush_api_usage()
+        
+        try:
+            with self.connections.connection() as conn:
+                cursor = conn.cursor()
                 
-                # 今日の投稿数
+                # トリガーで集計済みの daily_stats を主キーで引く
                 cursor.execute('''
-                    SELECT COUNT(*) FROM publish_history 
-                    WHERE date(publish_date) = date('now') AND status = 'success'
+                    SELECT news_collected, articles_generated, articles_published
+                    FROM daily_stats WHERE day = date('now')
                 ''')
-                stats['articles_published_today'] = cursor.fetchone()[0]
+                row = cursor.fetchone() or (0, 0, 0)
+                
+                stats = {
+                    'news_collected_today': row[0],
+                    'articles_generated_today': row[1],
+                    'articles_published_today': row[2]
+                }
                 
                 # API使用状況
                 cursor.execute('''
-                    SELECT api_name, SUM(request_count) as total_requests
-                    FROM api_usage 
-                    WHERE date = date('now')
-                    GROUP BY api_name
+                    SELECT api_name, requests FROM daily_api_stats
+                    WHERE day = date('now')
                 ''')
                 stats['api_usage_today'] = dict(cursor.fetchall())
                 
@@ -405,37 +1010,255 @@ class DatabaseManager:
             self.logger.error(f"統計取得エラー: {e}")
             return {}
     
-    def cleanup_old_data(self, days: int = 30):
+    def get_stats_range(self, start: Union[str, date], end: Union[str, date]) -> List[Dict[str, Any]]:
         """
-        古いデータをクリーンアップ
+        期間の日次統計を取得
         
         Args:
-            days: 保持する日数
+            start: 開始日（YYYY-MM-DD または date）
+            end: 終了日（この日を含む）
+        
+        Returns:
+            List[Dict]: 日付の古い順。各要素は date, news_collected, articles_generated,
+                articles_published, api_usage（API名 → リクエスト数）。記録のない日は含まない
         """
+        self.flush_api_usage()
+        
+        start_day = start.strftime('%Y-%m-%d') if isinstance(start, date) else str(start)[:10]
+        end_day = end.strftime('%Y-%m-%d') if isinstance(end, date) else str(end)[:10]
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.connection() as conn:
                 cursor = conn.cursor()
                 
-                # 古いニュースデータを削除
-                cursor.execute('''
-                    DELETE FROM news_data 
-                    WHERE collect_date < datetime('now', '-{} days')
-                '''.format(days))
+                days: Dict[str, Dict[str, Any]] = {}
                 
-                # 古い市場データを削除
                 cursor.execute('''
-                    DELETE FROM market_data 
-                    WHERE timestamp < datetime('now', '-{} days')
-                '''.format(days))
+                    SELECT day, news_collected, articles_generated, articles_published
+                    FROM daily_stats WHERE day BETWEEN ? AND ?
+                ''', (start_day, end_day))
+                for day, news_collected, articles_generated, articles_published in cursor.fetchall():
+                    days[day] = {
+                        'date': day,
+                        'news_collected': news_collected,
+                        'articles_generated': articles_generated,
+                        'articles_published': articles_published,
+                        'api_usage': {}
+                    }
                 
-                # 古いAPI使用状況を削除
                 cursor.execute('''
-                    DELETE FROM api_usage 
-                    WHERE date < date('now', '-{} days')
-                '''.format(days))
+                    SELECT day, api_name, requests FROM daily_api_stats
+                    WHERE day BETWEEN ? AND ?
+                ''', (start_day, end_day))
+                for day, api_name, requests in cursor.fetchall():
+                    days.setdefault(day, {
+                        'date': day,
+                        'news_collected': 0,
+                        'articles_generated': 0,
+                        'articles_published': 0,
+                        'api_usage': {}
+                    })['api_usage'][api_name] = requests
+                
+                return [days[day] for day in sorted(days)]
+        
+        except Exception as e:
+            self.logger.error(f"期間統計取得エラー: {e}")
+            return []
+    
+    def _delete_in_chunks(self, table: str, key_columns: Sequence[str], where: str,
+                          params: Sequence[Any], date_column: str,
+                          archive_dir: Optional[str] = None,
+                          chunk_size: int = CLEANUP_CHUNK_SIZE,
+                          pause: float = CLEANUP_PAUSE_SECONDS) -> int:
+        """
+        条件に合う行を chunk_size 件ずつ別トランザクションで削除
+        
+        チャンクの間は書き込みロックを解放して pause 秒待ち、収集などの書き込みを先に通す。
+        archive_dir を指定した場合は、削除する行を書き込みロックの外で一時ファイルに書き出し、
+        削除のコミット後にアーカイブへ追記する（削除に失敗した行はアーカイブに残らない）。
+        
+        Args:
+            table: テーブル名
+            key_columns: 行を特定する主キー列
+            where: 削除対象の条件（WHERE 句）
+            params: 条件のパラメータ
+            date_column: アーカイブの月分けに使う日時列
+            archive_dir: アーカイブの保存先（None ならアーカイブしない）
+            chunk_size: 1トランザクションで削除する行数
+            pause: チャンク間の待ち時間（秒）
+        
+        Returns:
+            int: 削除した行数
+        """
+        select_sql = f"SELECT {'*' if archive_dir else ', '.join(key_columns)} FROM {table} WHERE {where} LIMIT ?"
+        delete_sql = f"DELETE FROM {table} WHERE " + " AND ".join(f"{column} = ?" for column in key_columns)
+        deleted = 0
+        
+        while True:
+            if archive_dir:
+                with self.connections.connection() as conn:
+                    cursor = conn.execute(select_sql, (*params, chunk_size))
+                    names = [description[0] for description in cursor.description]
+                    rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+                if not rows:
+                    break
+                
+                staged = stage_archive(archive_dir, table, rows, date_column)
+                try:
+                    with self.connections.transaction() as conn:
+                        conn.executemany(delete_sql, [tuple(row[column] for column in key_columns) for row in rows])
+                except Exception:
+                    discard_archive(staged)
+                    raise
+                
+                try:
+                    commit_archive(staged)
+                except OSError:
+                    self.logger.error(f"アーカイブへの追記に失敗（削除済みの行は一時ファイルに残っています）: "
+                                      f"{[tmp_path for tmp_path, _ in staged]}")
+                    raise
+            else:
+                with self.connections.transaction() as conn:
+                    rows = conn.execute(select_sql, (*params, chunk_size)).fetchall()
+                    if not rows:
+                        break
+                    conn.executemany(delete_sql, [tuple(row) for row in rows])
+            
+            deleted += len(rows)
+            if len(rows) < chunk_size:
+                break
+            time.sleep(pause)
+        
+        return deleted
+    
+    def incremental_vacuum(self, pages: int = VACUUM_CHUNK_PAGES,
+                           pause: float = CLEANUP_PAUSE_SECONDS) -> int:
+        """
+        削除で空いたページをファイルから切り詰めてOSに返す
+        
+        auto_vacuum が INCREMENTAL でない既存のデータベースでは何もしない
+        （切り替えは enable_incremental_vacuum で一度だけ明示的に行う）。
+        
+        Args:
+            pages: 1回に解放するページ数
+            pause: 解放の間の待ち時間（秒）
+        
+        Returns:
+            int: 解放したページ数
+        """
+        freed = 0
+        
+        try:
+            with self.connections.connection() as conn:
+                # 0: NONE, 1: FULL, 2: INCREMENTAL
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    self.logger.info("auto_vacuum が INCREMENTAL でないため空きページの解放をスキップ"
+                                     "（python3 main.py --enable-incremental-vacuum で切り替え）")
+                    return 0
+            
+            while True:
+                with self.connections.write_lock() as conn:
+                    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    if not free_pages:
+                        break
+                    # execute では1ページしか進まないため、完了まで実行される executescript を使う
+                    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+                    freed += min(free_pages, pages)
+                
+                if free_pages <= pages:
+                    break
+                time.sleep(pause)
+            
+            if freed:
+                self.logger.info(f"空きページ {freed}件を解放")
+        
+        except Exception as e:
+            self.logger.error(f"incremental vacuum エラー: {e}")
+        
+        return freed
+    
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        既存のデータベースを auto_vacuum = INCREMENTAL に切り替える（一度だけ実行する保守作業）
+        
+        VACUUM でデータベース全体を書き直すため、完了まで他の書き込みは待たされる。
+        新しく作成したデータベースは最初から INCREMENTAL のため不要。
+        
+        Returns:
+            bool: 切り替えたかどうか（すでに INCREMENTAL の場合は False）
+        """
+        with self.connections.write_lock() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            
+            self.logger.info("auto_vacuum を INCREMENTAL に切り替えるため VACUUM を実行")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+    
+    def cleanup_old_data(self, days: int = 30, market_raw_hours: int = MARKET_RAW_RETENTION_HOURS,
+                         rollup_retention_days: Optional[Dict[str, Optional[int]]] = None,
+                         archive_dir: Optional[str] = None,
+                         chunk_size: int = CLEANUP_CHUNK_SIZE,
+                         vacuum: bool = True) -> Dict[str, int]:
+        """
+        古いデータをクリーンアップ
+        
+        市場データは段階的に保持する。生データは market_raw_hours 時間だけ残し、
+        ロールアップは解像度ごとの保持期間（None は無期限）で削除する。
+        削除は chunk_size 件ずつ短いトランザクションで行い、最後に空きページを解放する。
+        
+        Args:
+            days: ニュース・API使用状況を保持する日数
+            market_raw_hours: 市場データの生データを保持する時間
+            rollup_retention_days: 解像度 → 保持日数（省略時は ROLLUP_RETENTION_DAYS）
+            archive_dir: 削除前に行を月別の gzip JSON Lines に書き出すディレクトリ（None なら書き出さない）
+            chunk_size: 1トランザクションで削除する行数
+            vacuum: 削除後に incremental vacuum を実行するか
+        
+        Returns:
+            Dict: テーブル名 → 削除した行数
+        """
+        retention = dict(ROLLUP_RETENTION_DAYS)
+        retention.update(rollup_retention_days or {})
+        
+        # (テーブル, 主キー, 条件, パラメータ, 日時列)
+        targets = [
+            # 古いニュースデータ
+            ("news_data", ["id"], "collect_date < datetime('now', ?)",
+             (f"-{int(days)} days",), "collect_date"),
+            # 古い市場データ（ロールアップに集計済み）
+            ("market_data", ["id"], "timestamp < datetime('now', ?)",
+             (f"-{int(market_raw_hours)} hours",), "timestamp"),
+        ]
+        # 保持期間を過ぎたロールアップ
+        for resolution, retention_days in retention.items():
+            if retention_days is None:
+                continue
+            targets.append((
+                "market_rollups", ["symbol", "resolution", "bucket"],
+                "resolution = ? AND bucket < datetime('now', ?)",
+                (resolution, f"-{int(retention_days)} days"), "bucket"
+            ))
+        # 古いAPI使用状況
+        targets.append(("api_usage", ["id"], "date < date('now', ?)",
+                        (f"-{int(days)} days",), "date"))
+        
+        deleted: Dict[str, int] = {}
+        
+        try:
+            for table, key_columns, where, params, date_column in targets:
+                deleted[table] = deleted.get(table, 0) + self._delete_in_chunks(
+                    table, key_columns, where, params, date_column,
+                    archive_dir=archive_dir, chunk_size=chunk_size
+                )
                 
-                conn.commit()
-                self.logger.info(f"{days}日以前のデータをクリーンアップ")
+            self.logger.info(f"{days}日以前のデータをクリーンアップ: {deleted}")
                 
         except Exception as e:
-            self.logger.error(f"データクリーンアップエラー: {e}")
\ No newline at end of file
+            self.logger.error(f"データクリーンアップエラー: {e}")
+        
+        if vacuum:
+            self.incremental_vacuum()
+        
+        return deleted
\ No newline at end of file
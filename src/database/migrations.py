@@ -0,0 +1,483 @@
+"""
+データベースマイグレーションモジュール
+"""
+
+import logging
+import sqlite3
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# フィード取得の計測用に api_usage へ追加する列
+FEED_METRIC_COLUMNS = [
+    ("bytes", "INTEGER"),
+    ("dns_time", "REAL"),
+    ("connect_time", "REAL"),
+    ("transfer_time", "REAL"),
+    ("parse_cpu_time", "REAL"),
+    ("entries_parsed", "INTEGER"),
+    ("entries_kept", "INTEGER"),
+    ("bozo_error", "TEXT")
+]
+
+# フィード計測の追加列（ttfb_time: ヘッダー受信までの時間、wire_bytes: 圧縮されたままの受信バイト数）
+# connect_time は新しく張った接続の確立時間（名前解決を含む）。dns_time は記録しない
+FEED_TIMING_COLUMNS = [
+    ("ttfb_time", "REAL"),
+    ("wire_bytes", "INTEGER")
+]
+
+# 範囲検索・集計・削除で使うインデックス
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_news_data_collect_date ON news_data (collect_date)",
+    "CREATE INDEX IF NOT EXISTS idx_news_data_publish_date ON news_data (publish_date)",
+    "CREATE INDEX IF NOT EXISTS idx_market_data_symbol_timestamp ON market_data (symbol, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_market_data_timestamp ON market_data (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_generated_articles_generation_date ON generated_articles (generation_date)",
+    "CREATE INDEX IF NOT EXISTS idx_publish_history_status_date ON publish_history (status, publish_date)",
+    "CREATE INDEX IF NOT EXISTS idx_api_usage_date_name ON api_usage (date, api_name)",
+    "CREATE INDEX IF NOT EXISTS idx_api_usage_name_date ON api_usage (api_name, date)"
+]
+
+def add_column_if_missing(cursor, table: str, column: str, definition: str) -> bool:
+    """
+    列がなければ追加
+    
+    Args:
+        cursor: カーソル
+        table: テーブル名
+        column: 列名
+        definition: 型と制約（例: "INTEGER DEFAULT 0"）
+    
+    Returns:
+        bool: 列を追加したかどうか
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column in {row[1] for row in cursor.fetchall()}:
+        return False
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+def _create_base_tables(cursor):
+    """ニュース・市場データ・記事・投稿履歴・API使用状況のテーブル"""
+    # ニュースデータテーブル
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS news_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            url TEXT UNIQUE NOT NULL,
+            content TEXT,
+            source TEXT NOT NULL,
+            publish_date DATETIME,
+            collect_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            sentiment_score REAL,
+            importance_score REAL,
+            processed BOOLEAN DEFAULT 0
+        )
+    ''')
+    
+    # 市場データテーブル
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS market_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL,
+            volume_24h REAL,
+            price_change_24h REAL,
+            price_change_percentage_24h REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # 生成記事テーブル
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS generated_articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            article_type TEXT NOT NULL,
+            category TEXT,
+            tags TEXT,
+            word_count INTEGER,
+            generation_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            published BOOLEAN DEFAULT 0,
+            wp_post_id INTEGER,
+            wp_publish_date DATETIME,
+            source_news_ids TEXT,
+            metadata TEXT
+        )
+    ''')
+    
+    # 投稿履歴テーブル
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS publish_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER NOT NULL,
+            wp_post_id INTEGER,
+            publish_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            status TEXT NOT NULL,
+            error_message TEXT,
+            FOREIGN KEY (article_id) REFERENCES generated_articles (id)
+        )
+    ''')
+    
+    # API使用状況テーブル
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS api_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            api_name TEXT NOT NULL,
+            endpoint TEXT,
+            request_count INTEGER DEFAULT 1,
+            date DATE DEFAULT CURRENT_DATE,
+            response_time REAL,
+            status_code INTEGER,
+            error_message TEXT
+        )
+    ''')
+
+def _create_feed_state_tables(cursor):
+    """条件付きGETと差分収集の状態テーブル"""
+    # フィードキャッシュテーブル（条件付きGET用）
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feed_cache (
+            feed_url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # フィードごとの差分収集状態
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feed_watermarks (
+            source TEXT PRIMARY KEY,
+            last_published DATETIME,
+            seen_hashes TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _create_trending_terms(cursor):
+    """トレンド集計テーブル"""
+    # トレンド語の減衰スコア（score は updated_at 時点の値、時刻はUNIX秒）
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trending_terms (
+            term TEXT PRIMARY KEY,
+            kind TEXT,
+            score REAL,
+            last_seen REAL,
+            updated_at REAL
+        )
+    ''')
+
+def _add_feed_metric_columns(cursor):
+    """api_usage にフィード計測用の列を追加"""
+    for column, column_type in FEED_METRIC_COLUMNS:
+        add_column_if_missing(cursor, "api_usage", column, column_type)
+
+def _create_indexes(cursor):
+    """検索・集計・クリーンアップ用のインデックス"""
+    for index_sql in INDEXES:
+        cursor.execute(index_sql)
+
+def _fts_tokenizer(cursor) -> str:
+    """使用できるFTS5トークナイザーを返す（日本語を部分一致で引ける trigram を優先）"""
+    for tokenizer in ("trigram", "unicode61 remove_diacritics 2"):
+        try:
+            cursor.execute(f"CREATE VIRTUAL TABLE temp.fts_probe USING fts5(body, tokenize='{tokenizer}')")
+            cursor.execute("DROP TABLE temp.fts_probe")
+            return tokenizer
+        except sqlite3.OperationalError:
+            continue
+    return ""
+
+def _create_news_fts(cursor):
+    """ニュースの全文検索インデックス（news_data と同期する外部コンテンツFTS5テーブル）"""
+    tokenizer = _fts_tokenizer(cursor)
+    if not tokenizer:
+        # FTS5が使えない環境では search_news は LIKE 検索で動作する
+        logger.warning("FTS5が利用できないため全文検索インデックスを作成しません")
+        return
+    
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title,
+            content,
+            content='news_data',
+            content_rowid='id',
+            tokenize='{tokenizer}'
+        )
+    ''')
+    
+    # news_data の変更をインデックスに反映
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news_data BEGIN
+            INSERT INTO news_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news_data BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, content ON news_data BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO news_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    
+    # 既存のニュースをインデックスに登録
+    cursor.execute("INSERT INTO news_fts (news_fts) VALUES ('rebuild')")
+
+# 市場データのロールアップ解像度 → バケット開始時刻の書式
+ROLLUP_BUCKET_FORMATS = {
+    "1m": "%Y-%m-%d %H:%M:00",
+    "1h": "%Y-%m-%d %H:00:00",
+    "1d": "%Y-%m-%d 00:00:00"
+}
+
+def _rollup_upsert_sql(resolution: str, row: str) -> str:
+    """市場データ1行をロールアップに反映するUPSERT文（row は new または m）"""
+    bucket_format = ROLLUP_BUCKET_FORMATS[resolution]
+    values = f"""
+            {row}.symbol, '{resolution}', strftime('{bucket_format}', {row}.timestamp),
+            {row}.price, {row}.price, {row}.price, {row}.price,
+            {row}.volume_24h, {row}.market_cap, 1, {row}.timestamp, {row}.timestamp"""
+    source = f"VALUES ({values})" if row == "new" else f"SELECT {values} FROM market_data m WHERE true ORDER BY m.timestamp, m.id"
+    return f'''
+        INSERT INTO market_rollups (
+            symbol, resolution, bucket, open, high, low, close,
+            volume, market_cap, samples, open_time, close_time
+        )
+        {source}
+        ON CONFLICT (symbol, resolution, bucket) DO UPDATE SET
+            open = CASE WHEN excluded.open_time < open_time THEN excluded.open ELSE open END,
+            high = MAX(high, excluded.high),
+            low = MIN(low, excluded.low),
+            close = CASE WHEN excluded.close_time >= close_time THEN excluded.close ELSE close END,
+            volume = CASE WHEN excluded.close_time >= close_time THEN excluded.volume ELSE volume END,
+            market_cap = CASE WHEN excluded.close_time >= close_time THEN excluded.market_cap ELSE market_cap END,
+            samples = samples + 1,
+            open_time = MIN(open_time, excluded.open_time),
+            close_time = MAX(close_time, excluded.close_time)
+    '''
+
+def _create_market_rollups(cursor):
+    """市場データの1分・1時間・1日ロールアップ（market_data への挿入時に更新）"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS market_rollups (
+            symbol TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            bucket DATETIME NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume REAL,
+            market_cap REAL,
+            samples INTEGER NOT NULL,
+            open_time DATETIME,
+            close_time DATETIME,
+            PRIMARY KEY (symbol, resolution, bucket)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_market_rollups_resolution_bucket ON market_rollups (resolution, bucket)"
+    )
+    
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS market_rollups_insert AFTER INSERT ON market_data BEGIN
+            {"; ".join(_rollup_upsert_sql(resolution, "new") for resolution in ROLLUP_BUCKET_FORMATS)};
+        END
+    ''')
+    
+    # 既存の市場データを集計
+    for resolution in ROLLUP_BUCKET_FORMATS:
+        cursor.execute(_rollup_upsert_sql(resolution, "m"))
+
+def _add_usage_latency_columns(cursor):
+    """api_usage に集計済みレイテンシの列を追加（request_count 件分の合計と最大）"""
+    add_column_if_missing(cursor, "api_usage", "latency_total", "REAL")
+    add_column_if_missing(cursor, "api_usage", "latency_max", "REAL")
+
+# 日次統計の列 → (数える元テーブル, 日時列, 数える status（None はすべて）)
+DAILY_STAT_SOURCES = {
+    "news_collected": ("news_data", "collect_date", None),
+    "articles_generated": ("generated_articles", "generation_date", None),
+    "articles_published": ("publish_history", "publish_date", "success")
+}
+
+def _create_daily_stats(cursor):
+    """日次統計テーブル（各テーブルへの挿入時にトリガーで加算。削除では減らさない）"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            day DATE PRIMARY KEY,
+            news_collected INTEGER NOT NULL DEFAULT 0,
+            articles_generated INTEGER NOT NULL DEFAULT 0,
+            articles_published INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_api_stats (
+            day DATE NOT NULL,
+            api_name TEXT NOT NULL,
+            requests INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, api_name)
+        ) WITHOUT ROWID
+    ''')
+    
+    for column, (table, date_column, status) in DAILY_STAT_SOURCES.items():
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS daily_stats_{table} AFTER INSERT ON {table}
+            {f"WHEN new.status = '{status}'" if status else ""}
+            BEGIN
+                INSERT INTO daily_stats (day, {column}) VALUES (date(new.{date_column}), 1)
+                ON CONFLICT (day) DO UPDATE SET {column} = {column} + excluded.{column};
+            END
+        ''')
+        
+        # 既存のデータを集計
+        cursor.execute(f'''
+            INSERT INTO daily_stats (day, {column})
+            SELECT date({date_column}), COUNT(*) FROM {table}
+            WHERE {f"status = '{status}'" if status else "true"}
+            GROUP BY date({date_column})
+            ON CONFLICT (day) DO UPDATE SET {column} = excluded.{column}
+        ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS daily_stats_api_usage AFTER INSERT ON api_usage BEGIN
+            INSERT INTO daily_api_stats (day, api_name, requests)
+            VALUES (date(new.date), new.api_name, COALESCE(new.request_count, 1))
+            ON CONFLICT (day, api_name) DO UPDATE SET requests = requests + excluded.requests;
+        END
+    ''')
+    cursor.execute('''
+        INSERT INTO daily_api_stats (day, api_name, requests)
+        SELECT date(date), api_name, SUM(COALESCE(request_count, 1)) FROM api_usage
+        WHERE true
+        GROUP BY date(date), api_name
+        ON CONFLICT (day, api_name) DO UPDATE SET requests = excluded.requests
+    ''')
+
+def _create_artifacts(cursor):
+    """CLIの各段階の受け渡しデータ（収集ニュース・候補・生成記事・投稿履歴）を保存するテーブル"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS artifacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            name TEXT,
+            payload TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # 種類ごとの最新・新しい順の取得用
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_kind_id ON artifacts (kind, id)")
+
+def _create_rate_limit_buckets(cursor):
+    """APIごとのトークンバケット（プロセス間で共有するレート制限の状態）"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            blocked_until REAL NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+
+def _create_trending_observed(cursor):
+    """トレンド集計済みの記事（プロセスをまたいだ重複集計の防止用）"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trending_observed (
+            item_id TEXT PRIMARY KEY,
+            observed_at REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trending_observed_at ON trending_observed (observed_at)")
+
+def _add_feed_timing_columns(cursor):
+    """api_usage にヘッダー受信時間と受信バイト数の列を追加"""
+    for column, column_type in FEED_TIMING_COLUMNS:
+        add_column_if_missing(cursor, "api_usage", column, column_type)
+    
+    # これまで connect_time にはヘッダー受信までの時間を記録していたため移す
+    cursor.execute('''
+        UPDATE api_usage SET ttfb_time = connect_time, connect_time = NULL
+        WHERE api_name = 'rss' AND connect_time IS NOT NULL AND ttfb_time IS NULL
+    ''')
+
+def _add_feed_cache_body(cursor):
+    """feed_cache に前回のフィード本体、feed_watermarks に差分収集で処理済みの版を追加"""
+    # 304 のときに前回の本体を解析し直すため、検証子と一緒に保存する
+    add_column_if_missing(cursor, "feed_cache", "body", "BLOB")
+    add_column_if_missing(cursor, "feed_cache", "content_type", "TEXT")
+    # 差分収集で最後に処理したフィードの版（ETag / Last-Modified）
+    add_column_if_missing(cursor, "feed_watermarks", "feed_version", "TEXT")
+
+# マイグレーション（順番に適用。番号 = リストの位置 + 1 = 適用後の user_version）
+# 既存のステップは変更せず、変更は末尾に追加する
+MIGRATIONS: List[Tuple[str, Callable]] = [
+    ("基本テーブル作成", _create_base_tables),
+    ("フィード状態テーブル作成", _create_feed_state_tables),
+    ("トレンド集計テーブル作成", _create_trending_terms),
+    ("api_usage にフィード計測列を追加", _add_feed_metric_columns),
+    ("インデックス作成", _create_indexes),
+    ("ニュース全文検索インデックス作成", _create_news_fts),
+    ("市場データロールアップ作成", _create_market_rollups),
+    ("api_usage に集計レイテンシ列を追加", _add_usage_latency_columns),
+    ("日次統計テーブル作成", _create_daily_stats),
+    ("受け渡しデータテーブル作成", _create_artifacts),
+    ("レート制限テーブル作成", _create_rate_limit_buckets),
+    ("トレンド集計済み記事テーブル作成", _create_trending_observed),
+    ("api_usage にフィード受信計測列を追加", _add_feed_timing_columns),
+    ("フィードキャッシュに本体列を追加", _add_feed_cache_body)
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_schema_version(conn) -> int:
+    """
+    データベースのスキーマバージョンを取得
+    
+    Args:
+        conn: データベース接続
+    
+    Returns:
+        int: PRAGMA user_version の値
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(connections) -> int:
+    """
+    未適用のマイグレーションを順に適用
+    
+    最新のデータベースではバージョン確認のみでDDLは実行しない。
+    各ステップは1トランザクションで適用し、user_version も同時に更新する。
+    
+    Args:
+        connections: ConnectionManager インスタンス
+    
+    Returns:
+        int: 適用したマイグレーション数
+    """
+    if get_schema_version(connections.get_connection()) >= SCHEMA_VERSION:
+        return 0
+    
+    applied = 0
+    for version, (description, step) in enumerate(MIGRATIONS, start=1):
+        with connections.transaction() as conn:
+            # 他のプロセスが先に適用した場合に備えてロック取得後に再確認
+            if get_schema_version(conn) >= version:
+                continue
+            
+            step(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+        
+        logger.info(f"マイグレーション {version} を適用: {description}")
+        applied += 1
+    
+    return applied
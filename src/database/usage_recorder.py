@@ -0,0 +1,227 @@
+"""
+API使用状況の書き込みバッファモジュール
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from src.database.migrations import FEED_METRIC_COLUMNS, FEED_TIMING_COLUMNS
+
+# 集計して書き込む列（api_usage）
+USAGE_COLUMNS = [
+    "api_name", "endpoint", "date", "status_code", "request_count",
+    "response_time", "latency_total", "latency_max", "bytes", "error_message"
+]
+
+# フィード計測として1回の取得ごとに1行で書き込む列（api_usage、api_name = 'rss'）
+FEED_COLUMNS = ["api_name", "endpoint", "date", "status_code", "response_time", "error_message"] + [
+    column for column, _ in FEED_METRIC_COLUMNS + FEED_TIMING_COLUMNS
+]
+
+class UsageRecorder:
+    """API使用状況をまとめて書き込むバッファ付き記録クラス"""
+    
+    def __init__(self, connections, flush_interval: float = 5.0,
+                 batch_size: int = 200, max_buffer: int = 10000):
+        """
+        記録クラスを初期化
+        
+        Args:
+            connections: ConnectionManager インスタンス
+            flush_interval: 書き込み間隔（秒）
+            batch_size: この件数たまったら間隔を待たずに書き込む
+            max_buffer: メモリに保持する最大件数（超えた分は古いものから捨てる）
+        """
+        self.connections = connections
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        
+        # 書き込めなかった場合もここに残る（上限付きリングバッファ）
+        self._buffer: deque = deque(maxlen=max_buffer)
+        # フィード計測の行（集計せずにそのまま書き込む）
+        self._feed_buffer: deque = deque(maxlen=max_buffer)
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+    
+    def _ensure_started(self):
+        """初回の記録時にバックグラウンドの書き込みスレッドを開始"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="usage-recorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def record(self, api_name: str, endpoint: str = None, response_time: float = None,
+               status_code: int = None, error_message: str = None, response_bytes: int = None):
+        """
+        API呼び出しを1件記録（書き込みはバックグラウンドで行う）
+        
+        Args:
+            api_name: API名
+            endpoint: エンドポイント
+            response_time: レスポンス時間（秒）
+            status_code: ステータスコード
+            error_message: エラーメッセージ
+            response_bytes: レスポンスのバイト数
+        """
+        date = datetime.now(timezone.utc).date().isoformat()
+        entry = (api_name, endpoint, date, status_code, response_time, response_bytes, error_message)
+        
+        with self._buffer_lock:
+            self._ensure_started()
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.set()
+    
+    def record_feed(self, source: str, metrics: Dict[str, Any]):
+        """
+        フィード1回分の取得・解析の計測値を記録（書き込みはバックグラウンドで行う）
+        
+        Args:
+            source: ソース名（endpoint 列に保存）
+            metrics: status_code, response_time, error_message と FEED_METRIC_COLUMNS・FEED_TIMING_COLUMNS の各値
+        """
+        values = dict(metrics, api_name="rss", endpoint=source,
+                      date=datetime.now(timezone.utc).date().isoformat())
+        row = tuple(values.get(column) for column in FEED_COLUMNS)
+        
+        with self._buffer_lock:
+            self._ensure_started()
+            if len(self._feed_buffer) == self._feed_buffer.maxlen:
+                self.dropped += 1
+            self._feed_buffer.append(row)
+            if len(self._feed_buffer) >= self.batch_size:
+                self._wakeup.set()
+    
+    @staticmethod
+    def _requeue(buffer: deque, entries: list) -> int:
+        """書き込めなかった分をバッファに戻す（新しく記録されたものを優先し、入りきらない古いものを捨てる）"""
+        newer = list(buffer)
+        buffer.clear()
+        overflow = min(len(entries), max(0, len(entries) + len(newer) - buffer.maxlen))
+        buffer.extend(entries[overflow:])
+        buffer.extend(newer)
+        return overflow
+    
+    def _run(self):
+        """一定間隔、または件数がたまった時点で書き込む"""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    @staticmethod
+    def _aggregate(entries) -> Dict[Tuple, Dict]:
+        """同じ日・API・エンドポイント・ステータスの呼び出しを1行にまとめる"""
+        rows: Dict[Tuple, Dict] = {}
+        for api_name, endpoint, date, status_code, response_time, response_bytes, error_message in entries:
+            key = (api_name, endpoint, date, status_code)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    'request_count': 0, 'timed_count': 0, 'latency_total': None,
+                    'latency_max': None, 'bytes': None, 'error_message': None
+                }
+            row['request_count'] += 1
+            if response_time is not None:
+                row['timed_count'] += 1
+                row['latency_total'] = (row['latency_total'] or 0.0) + response_time
+                row['latency_max'] = max(row['latency_max'] or 0.0, response_time)
+            if response_bytes is not None:
+                row['bytes'] = (row['bytes'] or 0) + response_bytes
+            if error_message:
+                row['error_message'] = error_message
+        return rows
+    
+    def flush(self) -> int:
+        """
+        バッファの内容を集計して書き込む
+        
+        データベースがロック中などで書き込めない場合は、バッファに戻して次回に再試行する。
+        
+        Returns:
+            int: 書き込んだ件数（API呼び出しとフィード計測の合計）
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                entries = list(self._buffer)
+                self._buffer.clear()
+                feed_rows = list(self._feed_buffer)
+                self._feed_buffer.clear()
+            
+            if not entries and not feed_rows:
+                return 0
+            
+            rows = [
+                (
+                    api_name, endpoint, date, status_code, row['request_count'],
+                    row['latency_total'] / row['timed_count'] if row['timed_count'] else None,
+                    row['latency_total'], row['latency_max'], row['bytes'], row['error_message']
+                )
+                for (api_name, endpoint, date, status_code), row in self._aggregate(entries).items()
+            ]
+            
+            try:
+                with self.connections.transaction() as conn:
+                    if rows:
+                        conn.executemany(f'''
+                            INSERT INTO api_usage ({", ".join(USAGE_COLUMNS)})
+                            VALUES ({", ".join("?" for _ in USAGE_COLUMNS)})
+                        ''', rows)
+                    if feed_rows:
+                        conn.executemany(f'''
+                            INSERT INTO api_usage ({", ".join(FEED_COLUMNS)})
+                            VALUES ({", ".join("?" for _ in FEED_COLUMNS)})
+                        ''', feed_rows)
+            except sqlite3.Error as e:
+                self.logger.warning(f"API使用状況の書き込みを延期: {e}")
+                with self._buffer_lock:
+                    self.dropped += self._requeue(self._buffer, entries)
+                    self.dropped += self._requeue(self._feed_buffer, feed_rows)
+                return 0
+            
+            return len(entries) + len(feed_rows)
+    
+    def close(self):
+        """書き込みスレッドを止め、残りを書き込む"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        if self.dropped:
+            self.logger.warning(f"API使用状況 {self.dropped}件を記録できませんでした")
+
+_recorders: Dict[str, UsageRecorder] = {}
+_recorders_lock = threading.Lock()
+
+def get_usage_recorder(connections) -> UsageRecorder:
+    """
+    データベースファイルごとに共有される記録インスタンスを取得
+    
+    Args:
+        connections: ConnectionManager インスタンス
+    
+    Returns:
+        UsageRecorder: 記録インスタンス
+    """
+    key = os.path.abspath(connections.db_path)
+    with _recorders_lock:
+        recorder = _recorders.get(key)
+        if recorder is None:
+            recorder = UsageRecorder(connections)
+            _recorders[key] = recorder
+        return recorder
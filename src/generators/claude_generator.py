@@ -7,6 +7,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
 
+from src.utils.keyword_matcher import get_keyword_matcher
+
 class ClaudeGenerator:
     """Claude環境用記事生成クラス"""
     
@@ -24,6 +26,9 @@ class ClaudeGenerator:
         self.min_length = config.ARTICLE_MIN_LENGTH
         self.max_length = config.ARTICLE_MAX_LENGTH
         
+        # カテゴリ・タグ判定用の共有キーワードマッチャー
+        self.keyword_matcher = get_keyword_matcher()
+        
     def generate_weekly_summary(self, news_data: List[Dict[str, Any]], 
                               market_data: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
@@ -309,8 +314,9 @@ class ClaudeGenerator:
         article_content += "<p><strong>【重要な免責事項】</strong><br>本記事は情報提供を目的としており、投資助言ではありません。</p>"
         
         # カテゴリとタグを判定
-        category = self._determine_article_category(news_item)
-        tags = self._generate_tags(news_item, category)
+        hits = self._match_keywords(news_item)
+        category = self._determine_article_category(news_item, hits)
+        tags = self._generate_tags(news_item, category, hits)
         
         # 文字数をカウント
         word_count = len(article_content.replace(' ', '').replace('\n', '').replace('<', '').replace('>', ''))
@@ -376,67 +382,55 @@ class ClaudeGenerator:
         
         return summary
     
-    def _determine_article_category(self, news_item: Dict[str, Any]) -> str:
+    def _match_keywords(self, news_item: Dict[str, Any]) -> Dict[str, Dict[str, set]]:
+        """
+        ニュースアイテムのタイトルと内容をキーワード表と照合（カテゴリ・タグ判定で共用）
+        
+        Args:
+            news_item: ニュースアイテム
+            
+        Returns:
+            Dict: keyword_matcher.match の結果
+        """
+        return self.keyword_matcher.match(news_item.get('title', '') + ' ' + news_item.get('content', ''))
+    
+    def _determine_article_category(self, news_item: Dict[str, Any],
+                                    hits: Optional[Dict[str, Dict[str, set]]] = None) -> str:
         """
         記事のカテゴリを判定
         
         Args:
             news_item: ニュースアイテム
+            hits: 照合済みのキーワード（keyword_matcher.match の結果）
             
         Returns:
             str: カテゴリ名
         """
-        text = (news_item.get('title', '') + ' ' + news_item.get('content', '')).lower()
-        
-        # カテゴリ判定ロジック
-        if any(keyword in text for keyword in ['price', 'trading', 'market', 'chart', '価格', '相場', '取引']):
-            return '市場・価格'
-        elif any(keyword in text for keyword in ['regulation', 'sec', 'government', 'legal', '規制', '法律']):
-            return '規制・政策'
-        elif any(keyword in text for keyword in ['bitcoin', 'btc', 'ビットコイン']):
-            return 'ビットコイン'
-        elif any(keyword in text for keyword in ['ethereum', 'eth', 'イーサリアム']):
-            return 'イーサリアム'
-        elif any(keyword in text for keyword in ['defi', 'yield', 'liquidity', '分散金融']):
-            return 'DeFi'
-        elif any(keyword in text for keyword in ['nft', 'non-fungible', 'エヌエフティー']):
-            return 'NFT'
-        elif any(keyword in text for keyword in ['adoption', 'partnership', '採用', '提携']):
-            return '普及・採用'
-        else:
-            return '仮想通貨ニュース'
+        if hits is None:
+            hits = self._match_keywords(news_item)
+        
+        # カテゴリ判定ロジック（KEYWORD_TABLES["article_category"] の順で判定）
+        return self.keyword_matcher.first_category(hits, 'article_category') or '仮想通貨ニュース'
     
-    def _generate_tags(self, news_item: Dict[str, Any], category: str) -> List[str]:
+    def _generate_tags(self, news_item: Dict[str, Any], category: str,
+                       hits: Optional[Dict[str, Dict[str, set]]] = None) -> List[str]:
         """
         記事のタグを生成
         
         Args:
             news_item: ニュースアイテム
             category: カテゴリ
+            hits: 照合済みのキーワード（keyword_matcher.match の結果）
             
         Returns:
             List[str]: タグリスト
         """
-        text = (news_item.get('title', '') + ' ' + news_item.get('content', '')).lower()
+        if hits is None:
+            hits = self._match_keywords(news_item)
         tags = ['仮想通貨', '暗号資産']
         
         # 基本タグ
-        if 'bitcoin' in text or 'btc' in text or 'ビットコイン' in text:
-            tags.append('ビットコイン')
-        if 'ethereum' in text or 'eth' in text or 'イーサリアム' in text:
-            tags.append('イーサリアム')
-        if 'binance' in text or 'bnb' in text:
-            tags.append('バイナンス')
-        if 'defi' in text or '分散金融' in text:
-            tags.append('DeFi')
-        if 'nft' in text:
-            tags.append('NFT')
-        if 'regulation' in text or '規制' in text:
-            tags.append('規制')
-        if 'trading' in text or '取引' in text:
-            tags.append('取引')
-        if 'mining' in text or 'マイニング' in text:
-            tags.append('マイニング')
+        tags.extend(self.keyword_matcher.categories(hits, 'tag'))
         
         # カテゴリベースのタグ
         if category not in tags:
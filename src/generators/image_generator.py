@@ -11,6 +11,8 @@ from datetime import datetime
 import os
 import json
 
+from src.utils.rate_limiter import get_rate_limiter, parse_retry_after
+
 class ImageGenerator:
     """OpenAI DALL-E画像生成クラス"""
     
@@ -25,6 +27,9 @@ class ImageGenerator:
         self.logger = logging.getLogger(__name__)
         self.api_key = config.OPENAI_API_KEY
         
+        # OpenAI APIのレート制限（OPENAI_RATE_LIMIT、全プロセスで共有）
+        self.rate_limiter = get_rate_limiter(config)
+        
         # 画像保存ディレクトリ
         self.image_dir = "generated_images"
         os.makedirs(self.image_dir, exist_ok=True)
@@ -161,6 +166,7 @@ class ImageGenerator:
                 "style": style
             }
             
+            self.rate_limiter.acquire("openai")
             response = requests.post(
                 self.dalle_url,
                 headers=self.headers,
@@ -171,6 +177,11 @@ class ImageGenerator:
             if response.status_code == 200:
                 result = response.json()
                 return result['data'][0]
+            elif response.status_code == 429:
+                # 指定された時間は他のプロセスも含めてリクエストを止める
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.block("openai", retry_after if retry_after is not None else 60)
+                self.logger.error(f"DALL-E API レート制限: {response.text}")
             else:
                 self.logger.error(f"DALL-E API エラー: {response.status_code} - {response.text}")
                 
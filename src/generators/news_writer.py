@@ -8,6 +8,9 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import re
 
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.utils.rate_limiter import get_rate_limiter
+
 class NewsWriter:
     """ニュース記事生成クラス"""
     
@@ -24,10 +27,16 @@ class NewsWriter:
         # OpenAI APIキーを設定
         openai.api_key = config.OPENAI_API_KEY
         
+        # OpenAI APIのレート制限（OPENAI_RATE_LIMIT、全プロセスで共有）
+        self.rate_limiter = get_rate_limiter(config)
+        
         # 記事生成設定
         self.min_length = 500  # 速報記事は短め
         self.max_length = 800
         
+        # カテゴリ・タグ判定用の共有キーワードマッチャー
+        self.keyword_matcher = get_keyword_matcher()
+        
     def _create_news_prompt(self, news_item: Dict[str, Any]) -> str:
         """
         ニュース記事用のプロンプトを作成
@@ -75,67 +84,55 @@ class NewsWriter:
         
         return prompt
     
-    def _determine_article_category(self, news_item: Dict[str, Any]) -> str:
+    def _match_keywords(self, news_item: Dict[str, Any]) -> Dict[str, Dict[str, set]]:
+        """
+        ニュースアイテムのタイトルと内容をキーワード表と照合（カテゴリ・タグ判定で共用）
+        
+        Args:
+            news_item: ニュースアイテム
+            
+        Returns:
+            Dict: keyword_matcher.match の結果
+        """
+        return self.keyword_matcher.match(news_item.get('title', '') + ' ' + news_item.get('content', ''))
+    
+    def _determine_article_category(self, news_item: Dict[str, Any],
+                                    hits: Optional[Dict[str, Dict[str, set]]] = None) -> str:
         """
         記事のカテゴリを判定
         
         Args:
             news_item: ニュースアイテム
+            hits: 照合済みのキーワード（keyword_matcher.match の結果）
             
         Returns:
             str: カテゴリ名
         """
-        text = (news_item.get('title', '') + ' ' + news_item.get('content', '')).lower()
-        
-        # カテゴリ判定ロジック
-        if any(keyword in text for keyword in ['price', 'trading', 'market', 'chart', '価格', '相場', '取引']):
-            return '市場・価格'
-        elif any(keyword in text for keyword in ['regulation', 'sec', 'government', 'legal', '規制', '法律']):
-            return '規制・政策'
-        elif any(keyword in text for keyword in ['bitcoin', 'btc', 'ビットコイン']):
-            return 'ビットコイン'
-        elif any(keyword in text for keyword in ['ethereum', 'eth', 'イーサリアム']):
-            return 'イーサリアム'
-        elif any(keyword in text for keyword in ['defi', 'yield', 'liquidity', '分散金融']):
-            return 'DeFi'
-        elif any(keyword in text for keyword in ['nft', 'non-fungible', 'エヌエフティー']):
-            return 'NFT'
-        elif any(keyword in text for keyword in ['adoption', 'partnership', '採用', '提携']):
-            return '普及・採用'
-        else:
-            return '仮想通貨ニュース'
+        if hits is None:
+            hits = self._match_keywords(news_item)
+        
+        # カテゴリ判定ロジック（KEYWORD_TABLES["article_category"] の順で判定）
+        return self.keyword_matcher.first_category(hits, 'article_category') or '仮想通貨ニュース'
     
-    def _generate_tags(self, news_item: Dict[str, Any], category: str) -> List[str]:
+    def _generate_tags(self, news_item: Dict[str, Any], category: str,
+                       hits: Optional[Dict[str, Dict[str, set]]] = None) -> List[str]:
         """
         記事のタグを生成
         
         Args:
             news_item: ニュースアイテム
             category: カテゴリ
+            hits: 照合済みのキーワード（keyword_matcher.match の結果）
             
         Returns:
             List[str]: タグリスト
         """
-        text = (news_item.get('title', '') + ' ' + news_item.get('content', '')).lower()
+        if hits is None:
+            hits = self._match_keywords(news_item)
         tags = ['仮想通貨', '暗号資産']
         
         # 基本タグ
-        if 'bitcoin' in text or 'btc' in text or 'ビットコイン' in text:
-            tags.append('ビットコイン')
-        if 'ethereum' in text or 'eth' in text or 'イーサリアム' in text:
-            tags.append('イーサリアム')
-        if 'binance' in text or 'bnb' in text:
-            tags.append('バイナンス')
-        if 'defi' in text or '分散金融' in text:
-            tags.append('DeFi')
-        if 'nft' in text:
-            tags.append('NFT')
-        if 'regulation' in text or '規制' in text:
-            tags.append('規制')
-        if 'trading' in text or '取引' in text:
-            tags.append('取引')
-        if 'mining' in text or 'マイニング' in text:
-            tags.append('マイニング')
+        tags.extend(self.keyword_matcher.categories(hits, 'tag'))
         
         # カテゴリベースのタグ
         if category not in tags:
@@ -171,8 +168,9 @@ class NewsWriter:
             
             if article:
                 # カテゴリとタグを設定
-                category = self._determine_article_category(news_item)
-                tags = self._generate_tags(news_item, category)
+                hits = self._match_keywords(news_item)
+                category = self._determine_article_category(news_item, hits)
+                tags = self._generate_tags(news_item, category, hits)
                 
                 article.update({
                     'article_type': 'news',
@@ -208,6 +206,7 @@ class NewsWriter:
         try:
             self.logger.info("OpenAI APIでニュース記事生成を開始")
             
+            self.rate_limiter.acquire("openai")
             response = openai.ChatCompletion.create(
                 model="gpt-4",
                 messages=[
@@ -327,6 +326,7 @@ class NewsWriter:
 タイトルと本文を出力してください。
             """
             
+            self.rate_limiter.acquire("openai")
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",  # 速報なので高速なモデルを使用
                 messages=[
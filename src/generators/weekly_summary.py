@@ -8,6 +8,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
 
+from src.utils.rate_limiter import get_rate_limiter
+
 class WeeklySummaryGenerator:
     """週刊サマリー生成クラス"""
     
@@ -24,6 +26,9 @@ class WeeklySummaryGenerator:
         # OpenAI APIキーを設定
         openai.api_key = config.OPENAI_API_KEY
         
+        # OpenAI APIのレート制限（OPENAI_RATE_LIMIT、全プロセスで共有）
+        self.rate_limiter = get_rate_limiter(config)
+        
         # 記事生成設定
         self.min_length = config.ARTICLE_MIN_LENGTH
         self.max_length = config.ARTICLE_MAX_LENGTH
@@ -139,6 +144,7 @@ class WeeklySummaryGenerator:
         try:
             self.logger.info("OpenAI APIで記事生成を開始")
             
+            self.rate_limiter.acquire("openai")
             response = openai.ChatCompletion.create(
                 model="gpt-4",
                 messages=[
@@ -3,10 +3,15 @@
 """
 
 import os
-from dotenv import load_dotenv
 from typing import List, Dict, Any
 import logging
 
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    # python-dotenv がない環境（標準ライブラリのみで動くスクリプト）では環境変数だけを使う
+    load_dotenv = None
+
 class Config:
     """設定管理クラス"""
     
@@ -17,7 +22,8 @@ class Config:
         Args:
             env_file: 環境変数ファイルのパス
         """
-        load_dotenv(env_file)
+        if load_dotenv is not None:
+            load_dotenv(env_file)
         self._setup_logging()
         
     def _setup_logging(self):
@@ -71,6 +77,19 @@ class Config:
     def DB_PATH(self) -> str:
         return os.getenv("DB_PATH", "data/crypto_media.db")
     
+    @property
+    def DATA_RETENTION_DAYS(self) -> int:
+        return int(os.getenv("DATA_RETENTION_DAYS", "30"))
+    
+    @property
+    def MARKET_RAW_RETENTION_HOURS(self) -> int:
+        return int(os.getenv("MARKET_RAW_RETENTION_HOURS", "48"))
+    
+    @property
+    def ARCHIVE_DIR(self) -> str:
+        # 空の場合は削除前のアーカイブを行わない
+        return os.getenv("ARCHIVE_DIR", "")
+    
     # Schedule settings
     @property
     def WEEKLY_SUMMARY_DAY(self) -> str:
@@ -84,6 +103,14 @@ class Config:
     def DAILY_NEWS_TIME(self) -> str:
         return os.getenv("DAILY_NEWS_TIME", "10:00")
     
+    @property
+    def NEWS_POLL_INTERVAL_MINUTES(self) -> int:
+        return int(os.getenv("NEWS_POLL_INTERVAL_MINUTES", "15"))
+    
+    @property
+    def MARKET_SNAPSHOT_INTERVAL_MINUTES(self) -> int:
+        return int(os.getenv("MARKET_SNAPSHOT_INTERVAL_MINUTES", "60"))
+    
     # Content generation settings
     @property
     def MAX_ARTICLES_PER_DAY(self) -> int:
@@ -106,6 +133,16 @@ class Config:
     def OPENAI_RATE_LIMIT(self) -> int:
         return int(os.getenv("OPENAI_RATE_LIMIT", "20"))
     
+    @property
+    def MARKET_DATA_DEADLINE(self) -> float:
+        # 市場データAPIを並列に呼ぶ際の全体の待ち時間（秒）
+        return float(os.getenv("MARKET_DATA_DEADLINE", "20"))
+    
+    @property
+    def RESPONSE_CACHE_DIR(self) -> str:
+        # 空の場合はAPIレスポンスをメモリにのみキャッシュする
+        return os.getenv("RESPONSE_CACHE_DIR", "")
+    
     # Logging
     @property
     def LOG_LEVEL(self) -> str:
@@ -125,6 +162,78 @@ class Config:
             "coinbureau": os.getenv("RSS_FEEDS_COINBUREAU", "https://www.coinbureau.com/feed/")
         }
     
+    # RSS collection settings
+    @property
+    def RSS_MAX_WORKERS(self) -> int:
+        return int(os.getenv("RSS_MAX_WORKERS", "8"))
+    
+    @property
+    def RSS_PER_HOST_CONCURRENCY(self) -> int:
+        return int(os.getenv("RSS_PER_HOST_CONCURRENCY", "1"))
+    
+    @property
+    def RSS_HOST_DELAY(self) -> float:
+        return float(os.getenv("RSS_HOST_DELAY", "1.0"))
+    
+    @property
+    def RSS_COLLECTION_DEADLINE(self) -> float:
+        return float(os.getenv("RSS_COLLECTION_DEADLINE", "60"))
+    
+    @property
+    def RSS_SEEN_HASH_LIMIT(self) -> int:
+        return int(os.getenv("RSS_SEEN_HASH_LIMIT", "500"))
+    
+    @property
+    def STORY_SIMILARITY_THRESHOLD(self) -> float:
+        return float(os.getenv("STORY_SIMILARITY_THRESHOLD", "0.5"))
+    
+    @property
+    def TREND_HALF_LIFE_HOURS(self) -> float:
+        return float(os.getenv("TREND_HALF_LIFE_HOURS", "6"))
+    
+    @property
+    def TREND_WINDOW_HOURS(self) -> float:
+        return float(os.getenv("TREND_WINDOW_HOURS", "72"))
+    
+    # HTTP fetch settings
+    @property
+    def HTTP_CONNECT_TIMEOUT(self) -> float:
+        return float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    
+    @property
+    def HTTP_READ_TIMEOUT(self) -> float:
+        return float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+    
+    @property
+    def HTTP_MAX_BYTES(self) -> int:
+        return int(os.getenv("HTTP_MAX_BYTES", str(5 * 1024 * 1024)))
+    
+    @property
+    def HTTP_POOL_SIZE(self) -> int:
+        return int(os.getenv("HTTP_POOL_SIZE", "10"))
+    
+    # Article body extraction settings
+    @property
+    def ARTICLE_EXTRACT_WORKERS(self) -> int:
+        return int(os.getenv("ARTICLE_EXTRACT_WORKERS", "16"))
+    
+    @property
+    def ARTICLE_PER_DOMAIN_CONCURRENCY(self) -> int:
+        return int(os.getenv("ARTICLE_PER_DOMAIN_CONCURRENCY", "2"))
+    
+    @property
+    def ARTICLE_DOMAIN_DELAY(self) -> float:
+        return float(os.getenv("ARTICLE_DOMAIN_DELAY", "0.5"))
+    
+    @property
+    def ARTICLE_EXTRACT_DEADLINE(self) -> float:
+        return float(os.getenv("ARTICLE_EXTRACT_DEADLINE", "120"))
+    
+    @property
+    def ARTICLE_ENRICH_MIN_LENGTH(self) -> int:
+        # フィードの本文がこの文字数未満の記事は記事ページから本文を補完する（0 で無効）
+        return int(os.getenv("ARTICLE_ENRICH_MIN_LENGTH", "200"))
+    
     # Language settings
     @property
     def CONTENT_LANGUAGE(self) -> str:
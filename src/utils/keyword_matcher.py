@@ -0,0 +1,198 @@
+"""
+キーワードマッチングモジュール
+"""
+
+from functools import lru_cache
+from typing import List, Dict, Set, Optional, Tuple
+
+# 名前空間 → カテゴリ → キーワード。カテゴリの並び順が判定の優先順位になる
+KEYWORD_TABLES: Dict[str, Dict[str, List[str]]] = {
+    # 仮想通貨関連判定・重要度スコア用
+    "crypto": {
+        "bitcoin": ["bitcoin", "btc", "ビットコイン"],
+        "ethereum": ["ethereum", "eth", "イーサリアム", "イーサ"],
+        "crypto": ["crypto", "cryptocurrency", "仮想通貨", "暗号資産", "デジタル通貨"],
+        "blockchain": ["blockchain", "ブロックチェーン"],
+        "defi": ["defi", "decentralized finance", "分散金融"],
+        "nft": ["nft", "non-fungible token", "エヌエフティー"],
+        "mining": ["mining", "マイニング", "採掘"],
+        "trading": ["trading", "取引", "トレード"],
+        "exchange": ["exchange", "取引所"],
+        "wallet": ["wallet", "ウォレット"]
+    },
+    # タイトルの重要キーワード
+    "title_alert": {
+        "alert": [
+            "breaking", "urgent", "alert", "crash", "surge", "pump",
+            "速報", "緊急", "急騰", "暴落", "高騰"
+        ]
+    },
+    # 除外キーワード
+    "exclude": {
+        "exclude": [
+            "advertisement", "sponsored", "ad:", "pr:",
+            "広告", "スポンサー", "提供"
+        ]
+    },
+    # RSSParser.categorize_news のカテゴリ
+    "news_category": {
+        "market": ["price", "trading", "market", "chart", "価格", "相場", "取引"],
+        "technology": ["protocol", "upgrade", "fork", "consensus", "プロトコル", "アップグレード"],
+        "regulation": ["regulation", "sec", "government", "legal", "規制", "法律", "政府"],
+        "adoption": ["adoption", "partnership", "integration", "採用", "導入", "提携"],
+        "defi": ["defi", "yield", "liquidity", "staking", "分散金融"],
+        "nft": ["nft", "non-fungible", "collectible", "エヌエフティー"]
+    },
+    # 記事生成時のカテゴリ
+    "article_category": {
+        "市場・価格": ["price", "trading", "market", "chart", "価格", "相場", "取引"],
+        "規制・政策": ["regulation", "sec", "government", "legal", "規制", "法律"],
+        "ビットコイン": ["bitcoin", "btc", "ビットコイン"],
+        "イーサリアム": ["ethereum", "eth", "イーサリアム"],
+        "DeFi": ["defi", "yield", "liquidity", "分散金融"],
+        "NFT": ["nft", "non-fungible", "エヌエフティー"],
+        "普及・採用": ["adoption", "partnership", "採用", "提携"]
+    },
+    # 記事生成時のタグ
+    "tag": {
+        "ビットコイン": ["bitcoin", "btc", "ビットコイン"],
+        "イーサリアム": ["ethereum", "eth", "イーサリアム"],
+        "バイナンス": ["binance", "bnb"],
+        "DeFi": ["defi", "分散金融"],
+        "NFT": ["nft"],
+        "規制": ["regulation", "規制"],
+        "取引": ["trading", "取引"],
+        "マイニング": ["mining", "マイニング"]
+    }
+}
+
+class KeywordMatcher:
+    """複数のキーワード表を重複を除いたキーワード索引でまとめて照合するクラス"""
+    
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]):
+        """
+        キーワードマッチャーを初期化
+        
+        Args:
+            tables: 名前空間 → カテゴリ → キーワードリスト
+        """
+        self.tables = tables
+        
+        # キーワード → (名前空間, カテゴリ) のリスト
+        self._owners: Dict[str, List[tuple]] = {}
+        for namespace, categories in tables.items():
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    self._owners.setdefault(keyword.lower(), []).append((namespace, category))
+        
+        # 重複を除いたキーワード索引。ASCIIのみのテキストでは日本語キーワードを照合しない
+        self._ascii_keywords = [keyword for keyword in self._owners if keyword.isascii()]
+        self._all_keywords = self._ascii_keywords + [
+            keyword for keyword in self._owners if not keyword.isascii()
+        ]
+    
+    def find_keywords(self, text: str) -> Set[str]:
+        """
+        テキストに含まれるキーワードを返す
+        
+        重複を除いたキーワードごとに部分文字列検索を1回行う（ASCIIのみのテキストでは
+        日本語キーワードを検索しない）。
+        
+        Args:
+            text: 対象テキスト（内部で小文字化）
+        
+        Returns:
+            Set[str]: 含まれていたキーワード
+        """
+        text = text.lower()
+        keywords = self._ascii_keywords if text.isascii() else self._all_keywords
+        return {keyword for keyword in keywords if keyword in text}
+    
+    def match(self, text: str) -> Dict[str, Dict[str, Set[str]]]:
+        """
+        テキストに含まれるキーワードを探し、一致したカテゴリとキーワードを返す
+        
+        小文字化したテキストに対し、重複を除いたキーワードごとに部分文字列検索を1回行う。
+        
+        Args:
+            text: 対象テキスト
+        
+        Returns:
+            Dict: 名前空間 → カテゴリ → 一致したキーワード集合
+        """
+        hits: Dict[str, Dict[str, Set[str]]] = {}
+        for keyword in self.find_keywords(text):
+            for namespace, category in self._owners[keyword]:
+                hits.setdefault(namespace, {}).setdefault(category, set()).add(keyword)
+        return hits
+    
+    def match_title_and_content(self, title: str, content: str
+                                ) -> Tuple[Dict[str, Dict[str, Set[str]]], Dict[str, Dict[str, Set[str]]]]:
+        """
+        「タイトル + 空白 + 本文」に含まれるキーワードを探し、全体とタイトル部分の一致をまとめて返す
+        
+        小文字化したテキストに対し、重複を除いたキーワードごとに str.find を1回行う。
+        各キーワードの最初の出現位置がタイトル内に収まっていればタイトルにも含まれる
+        （タイトル内に出現があれば、それより前の出現もタイトル内にあるため）。
+        
+        Args:
+            title: タイトル
+            content: 本文
+        
+        Returns:
+            Tuple: (match(title + " " + content) の結果, match(title) の結果)
+        """
+        title = title.lower()
+        text = title + " " + content.lower()
+        keywords = self._ascii_keywords if text.isascii() else self._all_keywords
+        
+        hits: Dict[str, Dict[str, Set[str]]] = {}
+        title_hits: Dict[str, Dict[str, Set[str]]] = {}
+        for keyword in keywords:
+            position = text.find(keyword)
+            if position < 0:
+                continue
+            in_title = position + len(keyword) <= len(title)
+            for namespace, category in self._owners[keyword]:
+                hits.setdefault(namespace, {}).setdefault(category, set()).add(keyword)
+                if in_title:
+                    title_hits.setdefault(namespace, {}).setdefault(category, set()).add(keyword)
+        return hits, title_hits
+    
+    def categories(self, hits: Dict[str, Dict[str, Set[str]]], namespace: str) -> List[str]:
+        """
+        名前空間内で一致したカテゴリを表の順に返す
+        
+        Args:
+            hits: match() の結果
+            namespace: 名前空間
+        
+        Returns:
+            List[str]: 一致したカテゴリ
+        """
+        matched = hits.get(namespace, {})
+        return [category for category in self.tables[namespace] if category in matched]
+    
+    def first_category(self, hits: Dict[str, Dict[str, Set[str]]], namespace: str) -> Optional[str]:
+        """
+        名前空間内で最も優先度の高い一致カテゴリを返す
+        
+        Args:
+            hits: match() の結果
+            namespace: 名前空間
+        
+        Returns:
+            Optional[str]: カテゴリ（一致なしの場合は None）
+        """
+        categories = self.categories(hits, namespace)
+        return categories[0] if categories else None
+
+@lru_cache(maxsize=None)
+def get_keyword_matcher() -> KeywordMatcher:
+    """
+    共有のキーワードマッチャーを取得（初回のみ構築）
+    
+    Returns:
+        KeywordMatcher: KEYWORD_TABLES から構築したマッチャー
+    """
+    return KeywordMatcher(KEYWORD_TABLES)
@@ -0,0 +1,227 @@
+"""
+レート制限モジュール
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from src.database.connection_manager import get_connection_manager
+from src.database.migrations import migrate
+
+# まとめて使えるトークン数（上限の何秒分か）。小さいほど等間隔に近くなる
+BURST_SECONDS = 1.0
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After ヘッダーを待ち秒数に変換
+    
+    Args:
+        value: ヘッダーの値（秒数またはHTTP日付）
+    
+    Returns:
+        Optional[float]: 待ち秒数（解釈できない場合は None）
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimiter:
+    """APIごとのトークンバケットによるレート制限クラス"""
+    
+    def __init__(self, default_rate: float, rates: Optional[Dict[str, float]] = None,
+                 connections=None, burst_seconds: float = BURST_SECONDS):
+        """
+        レート制限を初期化
+        
+        Args:
+            default_rate: API名ごとの1分あたりの上限（rates にないAPIに適用。0以下は無制限）
+            rates: API名 → 1分あたりの上限
+            connections: 状態を共有する ConnectionManager（None ならプロセス内のみ）
+            burst_seconds: まとめて使えるトークン数（上限の何秒分か）
+        """
+        self.default_rate = default_rate
+        self.rates = dict(rates or {})
+        self.connections = connections
+        self.burst_seconds = burst_seconds
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        # API名 → (トークン数, 更新時刻, 待機終了時刻)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+    
+    def _rate(self, name: str) -> float:
+        """1秒あたりの補充トークン数"""
+        return self.rates.get(name, self.default_rate) / 60.0
+    
+    def _update(self, name: str, apply: Callable):
+        """
+        バケットの状態を読み、apply(状態, 現在時刻) → (新しい状態, 戻り値) で更新
+        
+        共有ストアでは BEGIN IMMEDIATE の中で読み書きするため、複数プロセスでも1つずつ処理される。
+        """
+        if self.connections is None:
+            with self._lock:
+                state, result = apply(self._buckets.get(name), time.time())
+                self._buckets[name] = state
+                return result
+        
+        with self.connections.transaction() as conn:
+            row = conn.execute('''
+                SELECT tokens, updated_at, blocked_until FROM rate_limit_buckets WHERE name = ?
+            ''', (name,)).fetchone()
+            state, result = apply(row, time.time())
+            conn.execute('''
+                INSERT INTO rate_limit_buckets (name, tokens, updated_at, blocked_until)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    updated_at = excluded.updated_at,
+                    blocked_until = excluded.blocked_until
+            ''', (name, *state))
+            return result
+    
+    def _refill(self, name: str, state: Optional[Tuple], now: float) -> Tuple[float, float]:
+        """経過時間分のトークンを補充して (トークン数, 待機終了時刻) を返す"""
+        rate = self._rate(name)
+        capacity = max(1.0, rate * self.burst_seconds)
+        if state is None:
+            return capacity, 0.0
+        
+        tokens, updated_at, blocked_until = state
+        return min(capacity, tokens + max(0.0, now - updated_at) * rate), blocked_until
+    
+    def try_acquire(self, name: str) -> float:
+        """
+        トークンを1つ取得（待たない）
+        
+        Args:
+            name: API名
+        
+        Returns:
+            float: 0 なら取得済み。正の値は取得できるまでの待ち秒数（トークンは消費しない）
+        """
+        rate = self._rate(name)
+        if rate <= 0:
+            return 0.0
+        
+        def apply(state, now):
+            tokens, blocked_until = self._refill(name, state, now)
+            if blocked_until > now:
+                return (tokens, now, blocked_until), blocked_until - now
+            if tokens >= 1:
+                return (tokens - 1, now, blocked_until), 0.0
+            return (tokens, now, blocked_until), (1 - tokens) / rate
+        
+        return self._update(name, apply)
+    
+    def acquire(self, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        トークンを1つ取得（取得できるまで必要な時間だけ待つ）
+        
+        Args:
+            name: API名
+            timeout: 待ち時間の上限（秒、None は無制限）
+        
+        Returns:
+            bool: 取得できたかどうか
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(name)
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < wait:
+                    return False
+            time.sleep(wait)
+    
+    async def acquire_async(self, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        トークンを1つ取得（asyncio 版。待つ間イベントループを止めない）
+        
+        Args:
+            name: API名
+            timeout: 待ち時間の上限（秒、None は無制限）
+        
+        Returns:
+            bool: 取得できたかどうか
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # 共有ストアではデータベースのロックを待つことがあるため、別スレッドで取得する
+            wait = await asyncio.to_thread(self.try_acquire, name)
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < wait:
+                    return False
+            await asyncio.sleep(wait)
+    
+    def block(self, name: str, seconds: float):
+        """
+        429 などで指定された時間、全プロセスでAPIの呼び出しを止める
+        
+        Args:
+            name: API名
+            seconds: 待機する秒数（Retry-After）
+        """
+        def apply(state, now):
+            _, blocked_until = self._refill(name, state, now)
+            return (0.0, now, max(blocked_until, now + seconds)), None
+        
+        self._update(name, apply)
+        self.logger.warning(f"{name} へのリクエストを {seconds:.0f}秒 停止")
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(config) -> RateLimiter:
+    """
+    データベースファイルごとに共有されるレート制限インスタンスを取得
+    
+    API_RATE_LIMIT を各APIの上限、OPENAI_RATE_LIMIT を "openai" の上限とする。
+    データベースを使えない場合はプロセス内だけで制限する。
+    
+    Args:
+        config: 設定オブジェクト
+    
+    Returns:
+        RateLimiter: レート制限インスタンス
+    """
+    key = os.path.abspath(config.DB_PATH)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rates = {"openai": config.OPENAI_RATE_LIMIT}
+            try:
+                Path(config.DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+                connections = get_connection_manager(config.DB_PATH)
+                migrate(connections)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"レート制限の状態を共有できません（プロセス内のみで制限）: {e}")
+                connections = None
+            limiter = RateLimiter(config.API_RATE_LIMIT, rates, connections)
+            _limiters[key] = limiter
+        return limiter
@@ -0,0 +1,196 @@
+"""
+APIレスポンスキャッシュモジュール
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+class ResponseCache:
+    """TTL付きLRUキャッシュ（期限切れ直後は古い値を返しつつ裏で更新する）"""
+    
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None):
+        """
+        キャッシュを初期化
+        
+        Args:
+            max_entries: メモリに保持する最大件数（超えたら最も古く使われたものから捨てる）
+            disk_dir: ディスクにも保存するディレクトリ（None ならメモリのみ）
+        """
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.logger = logging.getLogger(__name__)
+        
+        # キー → (値, 保存時刻, TTL)
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # キーごとの取得ロック（同じキーの同時取得は1回にまとめる）
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._refreshing = set()
+        
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+    
+    def _disk_path(self, key: str) -> str:
+        """キーに対応するディスク上のファイルパス"""
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+    
+    def _load(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """メモリ、なければディスクからエントリを読む"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        
+        if not self.disk_dir:
+            return None
+        
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get("key") != key:
+            return None
+        
+        entry = (stored["value"], stored["stored_at"], stored["ttl"])
+        self._remember(key, entry)
+        return entry
+    
+    def _remember(self, key: str, entry: Tuple[Any, float, float]):
+        """メモリに保存し、上限を超えた分を古く使われた順に捨てる"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _store(self, key: str, value: Any, ttl: float):
+        """メモリとディスクに保存"""
+        entry = (value, time.time(), ttl)
+        self._remember(key, entry)
+        
+        if not self.disk_dir:
+            return
+        
+        path = self._disk_path(key)
+        # 他のプロセスと同時に書いても壊れないよう、一時ファイルに書いてから置き換える
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "value": value, "stored_at": entry[1], "ttl": ttl},
+                          f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"キャッシュのディスク保存エラー: {e}")
+    
+    def _fetch(self, key: str, fetch: Callable[[], Any],
+               ttl: Union[float, Callable[[Any], float]]) -> Any:
+        """取得して保存（空の結果・失敗は保存しない）"""
+        value = fetch()
+        if value:
+            self._store(key, value, ttl(value) if callable(ttl) else ttl)
+        return value
+    
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any],
+                               ttl: Union[float, Callable[[Any], float]]):
+        """期限切れのエントリを裏で更新（同じキーの更新は同時に1つだけ）"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            try:
+                self._fetch(key, fetch, ttl)
+            except Exception as e:
+                self.logger.warning(f"キャッシュ更新エラー（{key}）: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=refresh, name="cache-refresh", daemon=True).start()
+    
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any],
+                     ttl: Union[float, Callable[[Any], float]], stale_ttl: float = 0) -> Any:
+        """
+        キャッシュから取得（なければ fetch で取得して保存）
+        
+        保存から ttl 秒以内はそのまま返す。その後 stale_ttl 秒間は古い値を返しつつ裏で更新する。
+        それも過ぎていれば取得を待つ。空の結果（None・空リストなど）は保存しない。
+        
+        Args:
+            key: キャッシュキー
+            fetch: 値を取得する関数
+            ttl: 有効期間（秒）。値から有効期間を決める関数も可
+            stale_ttl: 期限切れ後も古い値を返す期間（秒）
+        
+        Returns:
+            Any: 値のコピー（呼び出し側で変更してもキャッシュに影響しない）
+        """
+        entry = self._load(key)
+        if entry is not None:
+            value, stored_at, entry_ttl = entry
+            age = time.time() - stored_at
+            if age < entry_ttl:
+                return copy.deepcopy(value)
+            if age < entry_ttl + stale_ttl:
+                self._refresh_in_background(key, fetch, ttl)
+                return copy.deepcopy(value)
+        
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+        
+        with fetch_lock:
+            # 待っている間に他のスレッドが取得済みならそれを使う
+            entry = self._load(key)
+            if entry is not None and time.time() - entry[1] < entry[2]:
+                return copy.deepcopy(entry[0])
+            return copy.deepcopy(self._fetch(key, fetch, ttl))
+    
+    def invalidate(self, key: Optional[str] = None):
+        """
+        キャッシュを削除
+        
+        Args:
+            key: 削除するキー（None ならメモリ上のすべて）
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        
+        if key is not None and self.disk_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+def get_response_cache(disk_dir: Optional[str] = None) -> ResponseCache:
+    """
+    プロセス内で共有されるキャッシュを取得（ディスクのディレクトリごとに1つ）
+    
+    Args:
+        disk_dir: ディスクにも保存するディレクトリ（None ならメモリのみ）
+    
+    Returns:
+        ResponseCache: キャッシュインスタンス
+    """
+    key = os.path.abspath(disk_dir) if disk_dir else ""
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResponseCache(disk_dir=disk_dir)
+            _caches[key] = cache
+        return cache
@@ -0,0 +1,86 @@
+"""
+上位K件保持モジュール
+"""
+
+import heapq
+from typing import Any, Hashable, List, Optional
+
+class TopK:
+    """スコア上位K件だけを保持する有界ヒープクラス"""
+    
+    def __init__(self, k: int):
+        """
+        上位K件ヒープを初期化
+        
+        Args:
+            k: 保持する件数
+        """
+        self.k = max(0, k)
+        self._sequence = 0
+        # (スコア, -追加順, キー, アイテム)。同点なら後から来たものが先に落ちる
+        self._heap: List[tuple] = []
+        # キー → 有効なエントリの (スコア, -追加順)
+        self._live = {}
+    
+    def __len__(self) -> int:
+        return len(self._live)
+    
+    def _is_stale(self, entry: tuple) -> bool:
+        """同じキーのより良いアイテムで置き換え済みのエントリか"""
+        return self._live.get(entry[2]) != (entry[0], entry[1])
+    
+    def _drop_stale_top(self):
+        """ヒープ先頭の無効なエントリを取り除く"""
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+    
+    def push(self, item: Any, score: float, key: Optional[Hashable] = None) -> bool:
+        """
+        アイテムを追加
+        
+        Args:
+            item: アイテム
+            score: スコア
+            key: 重複判定キー。同じキーはスコアの高い1件だけ残す（省略時は重複なし）
+        
+        Returns:
+            bool: 上位K件に入ったかどうか
+        """
+        if self.k == 0:
+            return False
+        
+        self._sequence += 1
+        if key is None:
+            key = ("__item__", self._sequence)
+        
+        current = self._live.get(key)
+        if current is not None and current[0] >= score:
+            return False
+        
+        if current is None and len(self._live) >= self.k:
+            self._drop_stale_top()
+            if score <= self._heap[0][0]:
+                return False
+        
+        entry = (score, -self._sequence, key, item)
+        self._live[key] = (entry[0], entry[1])
+        heapq.heappush(self._heap, entry)
+        
+        # 件数超過分をスコアの低い順に捨てる
+        while len(self._live) > self.k:
+            self._drop_stale_top()
+            evicted = heapq.heappop(self._heap)
+            del self._live[evicted[2]]
+        
+        return True
+    
+    def items(self) -> List[Any]:
+        """
+        保持しているアイテムをスコアの高い順に返す
+        
+        Returns:
+            List: アイテムリスト（同点は追加順）
+        """
+        live_entries = [entry for entry in self._heap if not self._is_stale(entry)]
+        live_entries.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        return [entry[3] for entry in live_entries]
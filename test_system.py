@@ -5,7 +5,9 @@
 
 import sys
 import os
+import re
 import logging
+import tempfile
 from datetime import datetime
 
 # プロジェクトのルートディレクトリをPythonパスに追加
@@ -69,6 +71,383 @@ def test_database():
         print(f"❌ データベースエラー: {e}")
         return False
 
+def test_query_plans():
+    """クエリプランテスト（主要クエリが全件スキャンにならないこと）"""
+    print("\n🔍 クエリプランテスト中...")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_manager = DatabaseManager(os.path.join(temp_dir, "plan_test.db"))
+            conn = db_manager.connections.get_connection()
+            
+            # 各メソッドが実行するSQLを記録してプランを確認する
+            statements = []
+            conn.set_trace_callback(statements.append)
+            db_manager.get_recent_news()
+            db_manager.get_market_trends("BTC")
+            db_manager.get_daily_stats()
+            db_manager.cleanup_old_data()
+            conn.set_trace_callback(None)
+            
+            queries = [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "DELETE"))]
+            full_scans = []
+            for sql in queries:
+                for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+                    detail = row[-1]
+                    if re.fullmatch(r"SCAN \w+", detail):
+                        full_scans.append(f"{detail}: {' '.join(sql.split())}")
+            db_manager.connections.close()
+            
+            if full_scans:
+                print("❌ 全件スキャンになるクエリがあります")
+                for scan in full_scans:
+                    print(f"   {scan}")
+                return False
+            
+            print(f"✅ {len(queries)}件のクエリがインデックスを使用")
+            return True
+            
+    except Exception as e:
+        print(f"❌ クエリプランエラー: {e}")
+        return False
+
+def test_keyword_matcher():
+    """キーワード照合テスト（重要度スコアが照合の共通化前のループと一致すること）"""
+    print("\n🔍 キーワード照合テスト中...")
+    try:
+        from src.utils.keyword_matcher import KEYWORD_TABLES
+        
+        rss_parser = RSSParser(Config())
+        
+        def legacy_score(title, content, source):
+            # 共通化前の _calculate_importance_score と同じ計算
+            score = 0.0
+            text_lower = (title + " " + content).lower()
+            for category, keywords in KEYWORD_TABLES["crypto"].items():
+                for keyword in keywords:
+                    if keyword in text_lower:
+                        score += 10 if category in ["bitcoin", "ethereum"] else 5
+            title_lower = title.lower()
+            for keyword in KEYWORD_TABLES["title_alert"]["alert"]:
+                if keyword in title_lower:
+                    score += 15
+            score *= {"coindesk": 1.2, "cointelegraph": 1.1, "decrypt": 1.0, "coinbureau": 0.9}.get(source, 1.0)
+            for exclude_word in KEYWORD_TABLES["exclude"]["exclude"]:
+                if exclude_word in text_lower:
+                    score *= 0.5
+                    break
+            return min(score, 100.0)
+        
+        samples = [
+            ("BREAKING: Bitcoin surges past $100k", "BTC and ETH rally on exchange inflows", "coindesk"),
+            ("Weekly market wrap", "Traders watch the crash risk in DeFi lending", "cointelegraph"),
+            ("ビットコイン急騰、速報", "イーサリアムも上昇。取引所の出来高が増加", "decrypt"),
+            ("Sponsored: new wallet launch", "An NFT wallet for mining rewards", "coinbureau"),
+            # 本文だけにある重要キーワードはタイトルのボーナスに数えない
+            ("Crypto market update", "alert: blockchain trading halted", "unknown"),
+            ("", "", "coindesk")
+        ]
+        
+        mismatches = []
+        for title, content, source in samples:
+            expected = legacy_score(title, content, source)
+            actual = rss_parser._calculate_importance_score(title, content, source)
+            if abs(expected - actual) > 1e-9:
+                mismatches.append(f"{title!r}: {actual} != {expected}")
+        
+        if mismatches:
+            print("❌ 重要度スコアが従来の計算と一致しません")
+            for mismatch in mismatches:
+                print(f"   {mismatch}")
+            return False
+        
+        print(f"✅ {len(samples)}件の重要度スコアが従来の計算と一致")
+        return True
+        
+    except Exception as e:
+        print(f"❌ キーワード照合エラー: {e}")
+        return False
+
+
+def test_near_duplicate_index():
+    """類似記事インデックステスト（言い換えた同一ストーリーがまとまり、別の話題は分かれること）"""
+    print("\n🔍 類似記事インデックステスト中...")
+    try:
+        from src.collectors.near_duplicate import NearDuplicateIndex
+        
+        index = NearDuplicateIndex(max_items=3)
+        original = index.add("a", "SEC approves spot Bitcoin ETF applications from BlackRock and Fidelity")
+        reworded = index.add("b", "SEC Approves Spot Bitcoin ETF Applications From BlackRock, Fidelity!")
+        unrelated = index.add("c", "Ethereum developers schedule the Dencun upgrade for mainnet in March")
+        again = index.add("a", "completely different text")
+        
+        checks = [
+            ("記号・大文字小文字の違いは同一ストーリー", original == "a" and reworded == "a"),
+            ("別の話題は新しいストーリー", unrelated == "c"),
+            ("登録済みの記事は同じストーリーIDを返す", again == "a"),
+            ("空のテキストは自身のID", index.add("empty", "  ") == "empty")
+        ]
+        
+        # 上限を超えたら古い記事から削除する
+        index.add("d", "Solana network suffers a five hour outage after validator bug")
+        index.add("e", "Ripple wins partial victory in court case against the SEC")
+        checks.append(("上限を超えた古い記事を削除", index.story_of("a") is None and index.story_of("e") == "e"))
+        
+        failed = [name for name, passed in checks if not passed]
+        if failed:
+            print(f"❌ 類似記事インデックスの動作が不正: {failed}")
+            return False
+        
+        print(f"✅ {len(checks)}件の確認に成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 類似記事インデックスエラー: {e}")
+        return False
+
+
+def test_top_k():
+    """上位K件ヒープテスト（全件ソートと同じ結果になること）"""
+    print("\n🔍 上位K件ヒープテスト中...")
+    try:
+        import random
+        from src.utils.top_k import TopK
+        
+        rng = random.Random(0)
+        for _ in range(200):
+            k = rng.randint(0, 6)
+            top = TopK(k)
+            best = {}
+            order = {}
+            for sequence in range(rng.randint(0, 40)):
+                key = rng.randint(0, 15)
+                score = rng.randint(0, 10)
+                top.push((key, score), score, key=key)
+                # 同じキーはスコアの高い1件、同点は先に来たものを残す
+                if key not in best or score > best[key]:
+                    best[key] = score
+                    order[key] = sequence
+            
+            expected = sorted(best, key=lambda key: (-best[key], order[key]))[:k]
+            actual = top.items()
+            if [key for key, _ in actual] != expected or len(top) != len(expected):
+                print(f"❌ 上位K件が全件ソートと一致しません (k={k}): {actual} != {expected}")
+                return False
+        
+        print("✅ 200通りの入力で全件ソートと一致")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 上位K件ヒープエラー: {e}")
+        return False
+
+
+def test_bulk_insert():
+    """一括挿入テスト（挿入数・重複数の集計と不正な行のスキップ）"""
+    print("\n🔍 一括挿入テスト中...")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_manager = DatabaseManager(os.path.join(temp_dir, "bulk_test.db"))
+            columns = ['title', 'url', 'source']
+            
+            first = db_manager.bulk_insert('news_data', columns, [
+                ("A", "https://example.com/a", "test"),
+                ("B", "https://example.com/b", "test"),
+                ("A again", "https://example.com/a", "test")
+            ], chunk_size=2)
+            # 既存のURL・チャンク内の不正な行（値の数が合わない）を含むジェネレーター
+            second = db_manager.bulk_insert('news_data', columns, (row for row in [
+                ("B again", "https://example.com/b", "test"),
+                ("C", "https://example.com/c"),
+                ("D", "https://example.com/d", "test")
+            ]), chunk_size=2)
+            
+            conn = db_manager.connections.get_connection()
+            urls = [row[0] for row in conn.execute("SELECT url FROM news_data ORDER BY url")]
+            db_manager.connections.close()
+            
+            expected_urls = ["https://example.com/a", "https://example.com/b", "https://example.com/d"]
+            if (first != {'inserted': 2, 'ignored': 1} or second != {'inserted': 1, 'ignored': 2}
+                    or urls != expected_urls):
+                print(f"❌ 一括挿入の結果が不正: {first}, {second}, {urls}")
+                return False
+            
+            print("✅ 挿入数・重複数と保存内容が一致")
+            return True
+            
+    except Exception as e:
+        print(f"❌ 一括挿入エラー: {e}")
+        return False
+
+
+def test_migrations():
+    """マイグレーションテスト（導入前のスキーマのデータベースを最新に更新できること）"""
+    print("\n🔍 マイグレーションテスト中...")
+    try:
+        import sqlite3
+        from src.database.migrations import MIGRATIONS, SCHEMA_VERSION, get_schema_version, migrate
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "baseline.db")
+            
+            # マイグレーション導入前のデータベース（基本テーブルのみ、user_version = 0）
+            conn = sqlite3.connect(db_path)
+            MIGRATIONS[0][1](conn.cursor())
+            conn.execute('''
+                INSERT INTO news_data (title, url, content, source)
+                VALUES ('Bitcoin ETF approved', 'https://example.com/etf', 'SEC approves ETF', 'test')
+            ''')
+            conn.execute("INSERT INTO api_usage (api_name, response_time) VALUES ('rss', 0.5)")
+            conn.commit()
+            conn.close()
+            
+            db_manager = DatabaseManager(db_path)
+            conn = db_manager.connections.get_connection()
+            version = get_schema_version(conn)
+            news_urls = [row[0] for row in conn.execute("SELECT url FROM news_data")]
+            usage_columns = {row[1] for row in conn.execute("PRAGMA table_info(api_usage)")}
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            found = [news['url'] for news in db_manager.search_news("approves")]
+            reapplied = migrate(db_manager.connections)
+            db_manager.connections.close()
+            
+            checks = [
+                (f"user_version が {SCHEMA_VERSION}", version == SCHEMA_VERSION),
+                ("既存の行を保持", news_urls == ["https://example.com/etf"]),
+                ("既存のニュースを検索できる", found == ["https://example.com/etf"]),
+                ("追加列を作成", {"bytes", "ttfb_time", "wire_bytes"} <= usage_columns),
+                ("追加テーブルを作成", {"feed_cache", "rate_limit_buckets", "trending_observed"} <= tables),
+                ("最新のデータベースでは何も適用しない", reapplied == 0)
+            ]
+            failed = [name for name, passed in checks if not passed]
+            if failed:
+                print(f"❌ マイグレーション結果が不正: {failed}")
+                return False
+            
+            print(f"✅ 導入前のスキーマから {SCHEMA_VERSION} 段階のマイグレーションを適用")
+            return True
+            
+    except Exception as e:
+        print(f"❌ マイグレーションエラー: {e}")
+        return False
+
+
+def test_rate_limiter():
+    """レート制限テスト（Retry-After の解釈と、プロセス間で共有されるトークンバケット）"""
+    print("\n🔍 レート制限テスト中...")
+    try:
+        import asyncio
+        from email.utils import format_datetime
+        from datetime import timedelta, timezone
+        from src.utils.rate_limiter import RateLimiter, parse_retry_after
+        
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        date_wait = parse_retry_after(retry_at)
+        checks = [
+            ("秒数の Retry-After", parse_retry_after(" 120 ") == 120.0),
+            ("負の秒数は 0", parse_retry_after("-5") == 0.0),
+            ("HTTP日付の Retry-After", date_wait is not None and 28 <= date_wait <= 30),
+            ("解釈できない値は None", parse_retry_after("soon") is None and parse_retry_after(None) is None)
+        ]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_manager = DatabaseManager(os.path.join(temp_dir, "rate_limit_test.db"))
+            # 同じデータベースを使う2つのインスタンス（別プロセスに相当）
+            first = RateLimiter(60, {"unlimited": 0}, db_manager.connections)
+            second = RateLimiter(60, {"unlimited": 0}, db_manager.connections)
+            
+            checks.append(("最初のトークンは待たずに取得", first.try_acquire("api") == 0))
+            wait = second.try_acquire("api")
+            checks.append(("使い切ったバケットは他のインスタンスでも待つ", 0 < wait <= 1))
+            checks.append(("期限内に取得できなければ False", first.acquire("api", timeout=0.01) is False))
+            checks.append(("待ち時間後に取得", asyncio.run(second.acquire_async("api", timeout=2)) is True))
+            
+            first.block("blocked", 30)
+            wait = second.try_acquire("blocked")
+            checks.append(("429 の待機を共有", 29 <= wait <= 30))
+            checks.append(("上限 0 は無制限", all(first.try_acquire("unlimited") == 0 for _ in range(5))))
+            db_manager.connections.close()
+        
+        failed = [name for name, passed in checks if not passed]
+        if failed:
+            print(f"❌ レート制限の動作が不正: {failed}")
+            return False
+        
+        print(f"✅ {len(checks)}件の確認に成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ レート制限エラー: {e}")
+        return False
+
+
+def test_response_cache():
+    """レスポンスキャッシュテスト（期限切れ直後の古い値の返却と、同時取得の集約）"""
+    print("\n🔍 レスポンスキャッシュテスト中...")
+    try:
+        import threading
+        import time
+        from src.utils.response_cache import ResponseCache
+        
+        calls = []
+        
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"version": len(calls)}
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResponseCache(disk_dir=temp_dir)
+            
+            # 同じキーの同時取得は1回にまとめる
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(cache.get_or_fetch("key", fetch, 0.5, 5)))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            checks = [("同時取得は1回", len(calls) == 1 and results == [{"version": 1}] * 5)]
+            
+            results[0]["version"] = 99
+            checks.append(("返した値の変更はキャッシュに影響しない",
+                           cache.get_or_fetch("key", fetch, 0.5, 5) == {"version": 1} and len(calls) == 1))
+            
+            # 有効期間後は古い値をすぐ返し、裏で更新する
+            time.sleep(0.6)
+            started = time.monotonic()
+            stale = cache.get_or_fetch("key", fetch, 0.5, 5)
+            checks.append(("期限切れ直後は待たずに古い値", stale == {"version": 1} and time.monotonic() - started < 0.1))
+            deadline = time.monotonic() + 5
+            while "key" in cache._refreshing and time.monotonic() < deadline:
+                time.sleep(0.05)
+            checks.append(("裏で更新した値を返す", cache.get_or_fetch("key", fetch, 0.5, 5) == {"version": 2}))
+            
+            # 空の結果は保存しない
+            empty_calls = []
+            for _ in range(2):
+                cache.get_or_fetch("empty", lambda: empty_calls.append(1) or [], 60)
+            checks.append(("空の結果は保存しない", len(empty_calls) == 2))
+            
+            # ディスクに保存した値は別のインスタンスからも読める
+            checks.append(("ディスクから読み込み",
+                           ResponseCache(disk_dir=temp_dir).get_or_fetch("key", fetch, 0.5, 5) == {"version": 2}
+                           and len(calls) == 2))
+        
+        failed = [name for name, passed in checks if not passed]
+        if failed:
+            print(f"❌ レスポンスキャッシュの動作が不正: {failed}")
+            return False
+        
+        print(f"✅ {len(checks)}件の確認に成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ レスポンスキャッシュエラー: {e}")
+        return False
+
+
 def test_api_clients():
     """APIクライアントテスト"""
     print("\n📊 APIクライアントテスト中...")
@@ -225,6 +604,14 @@ def main():
     # 各テストを実行
     test_results.append(("設定テスト", test_config()))
     test_results.append(("データベーステスト", test_database()))
+    test_results.append(("クエリプランテスト", test_query_plans()))
+    test_results.append(("キーワード照合テスト", test_keyword_matcher()))
+    test_results.append(("類似記事インデックステスト", test_near_duplicate_index()))
+    test_results.append(("上位K件ヒープテスト", test_top_k()))
+    test_results.append(("一括挿入テスト", test_bulk_insert()))
+    test_results.append(("マイグレーションテスト", test_migrations()))
+    test_results.append(("レート制限テスト", test_rate_limiter()))
+    test_results.append(("レスポンスキャッシュテスト", test_response_cache()))
     test_results.append(("APIクライアントテスト", test_api_clients()))
     test_results.append(("RSSパーサーテスト", test_rss_parser()))
     test_results.append(("コンテンツ生成テスト", test_content_generation()))